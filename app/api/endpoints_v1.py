@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.entities.core_job.router import router as jobs_router
 from app.entities.core_organization.router import router as organization_router
 from app.entities.core_user.router import router as users_router
 from app.entities.go_property.router import router as go_property_router
@@ -42,6 +43,13 @@ router_v1.include_router(
     tags=["Organizations"],
 )
 
+# Job routes
+router_v1.include_router(
+    jobs_router,
+    prefix="/jobs",
+    tags=["Jobs"],
+)
+
 # Platforms routes
 router_v1.include_router(
     platform_router,
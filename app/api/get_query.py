@@ -5,7 +5,7 @@ from fastapi import Depends, HTTPException, Query, status
 from pydantic import UUID4
 
 from app.config import settings
-from app.core.pagination import PageParamsFromQuery
+from app.core.pagination import PAGE_CURSOR_MAXLEN, PageParamsFromQuery
 from app.db.constants import (
     DB_STR_16BIT_MAXLEN_INPUT,
     DB_STR_TINYTEXT_MAXLEN_INPUT,
@@ -201,9 +201,11 @@ class CommonUserQueryParams(PageParamsFromQuery, UserIdQueryParams):
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         user_id: Annotated[str | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         UserIdQueryParams.__init__(self, user_id)
 
 
@@ -223,10 +225,12 @@ class CommonOrganizationPlatformQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         organization_id: Annotated[str | None, Query()] = None,
         is_active: Annotated[bool | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         OrganizationIdQueryParams.__init__(self, organization_id)
         IsActiveQueryParams.__init__(self, is_active)
 
@@ -249,10 +253,12 @@ class CommonUserOrganizationQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         user_id: Annotated[str | None, Query()] = None,
         organization_id: Annotated[str | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         UserIdQueryParams.__init__(self, user_id)
         OrganizationIdQueryParams.__init__(self, organization_id)
 
@@ -273,10 +279,12 @@ class CommonWebsiteQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         website_id: Annotated[str | None, Query()] = None,
         is_active: Annotated[bool | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         WebsiteIdQueryParams.__init__(self, website_id)
         IsActiveQueryParams.__init__(self, is_active)
 
@@ -297,10 +305,12 @@ class CommonOrganizationWebsiteQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         organization_id: Annotated[str | None, Query()] = None,
         website_id: Annotated[str | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         OrganizationIdQueryParams.__init__(self, organization_id)
         WebsiteIdQueryParams.__init__(self, website_id)
 
@@ -323,10 +333,12 @@ class CommonWebsitePageQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         website_id: Annotated[str | None, Query()] = None,
         is_active: Annotated[bool | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         WebsiteIdQueryParams.__init__(self, website_id)
         IsActiveQueryParams.__init__(self, is_active)
 
@@ -350,11 +362,13 @@ class CommonWebsitePageSpeedInsightsQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         website_id: Annotated[str | None, Query()] = None,
         page_id: Annotated[str | None, Query()] = None,
         strategy: Annotated[list[str] | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         WebsiteIdQueryParams.__init__(self, website_id)
         WebsitePageIdQueryParams.__init__(self, page_id)
         DeviceStrategyQueryParams.__init__(self, strategy)
@@ -380,10 +394,12 @@ class CommonWebsiteKeywordCorpusQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         website_id: Annotated[str | None, Query()] = None,
         page_id: Annotated[str | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         WebsiteIdQueryParams.__init__(self, website_id)
         WebsitePageIdQueryParams.__init__(self, page_id)
 
@@ -410,12 +426,14 @@ class CommonGoPropertyQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         user_id: Annotated[str | None, Query()] = None,
         organization_id: Annotated[str | None, Query()] = None,
         website_id: Annotated[str | None, Query()] = None,
         ga4_id: Annotated[str | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         UserIdQueryParams.__init__(self, user_id)
         OrganizationIdQueryParams.__init__(self, organization_id)
         WebsiteIdQueryParams.__init__(self, website_id)
@@ -449,6 +467,8 @@ class CommonOrganizationTrackingLinkQueryParams(
                 le=settings.api.query_limit_rows_max,
             ),
         ] = settings.api.query_limit_rows_default,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
         organization_id: Annotated[str | None, Query()] = None,
         scheme: Annotated[
             str | None, Query(max_length=DB_STR_16BIT_MAXLEN_INPUT)
@@ -479,7 +499,7 @@ class CommonOrganizationTrackingLinkQueryParams(
         ] = None,
         is_active: Annotated[bool | None, Query()] = None,
     ):
-        PageParamsFromQuery.__init__(self, page, size)
+        PageParamsFromQuery.__init__(self, page, size, include_total, cursor)
         OrganizationIdQueryParams.__init__(self, organization_id)
         TrackingLinkSchemeQueryParams.__init__(self, scheme)
         TrackingLinkDomainQueryParams.__init__(self, domain)
@@ -6,8 +6,15 @@ from typer import Typer
 
 from app.cli.coro import cli_coro
 from app.config import settings
+from app.core.geoip import build_ip_range_index, read_ip_range_rows
 from app.core.logger import logger
-from app.db.commands import build_database, check_db_connected, create_init_data
+from app.db.commands import (
+    backfill_user_auth_id_hash,
+    backfill_website_page_url_hash,
+    build_database,
+    check_db_connected,
+    create_init_data,
+)
 
 app = Typer()
 
@@ -42,6 +49,38 @@ async def seed() -> None:
         logger.warning(f"Error adding initial DB data: {e}")
 
 
+@app.command()
+@cli_coro()
+async def backfill_auth_id_hash() -> None:
+    try:
+        logger.info("Backfill User auth_id Blind Index")
+        count = await backfill_user_auth_id_hash()
+        logger.info(f"Users Updated C[{count}]")
+    except Exception as e:
+        logger.warning(f"Error backfilling user auth_id blind index: {e}")
+
+
+@app.command()
+@cli_coro()
+async def backfill_page_url_hash() -> None:
+    try:
+        logger.info("Backfill Website Page url_hash")
+        count = await backfill_website_page_url_hash()
+        logger.info(f"Website Pages Updated C[{count}]")
+    except Exception as e:
+        logger.warning(f"Error backfilling website page url_hash: {e}")
+
+
+@app.command()
+def build_ip_index(csv_path: str, index_path: str) -> None:
+    try:
+        logger.info(f"Build IP Range Index from {csv_path}")
+        count = build_ip_range_index(read_ip_range_rows(csv_path), index_path)
+        logger.info(f"Ranges Indexed C[{count}] in {index_path}")
+    except Exception as e:
+        logger.warning(f"Error building IP range index: {e}")
+
+
 @app.command()
 def make_schema_graph() -> None:
     try:
@@ -0,0 +1,54 @@
+import asyncio
+import signal
+
+from typer import Option, Typer
+
+from app.cli.coro import cli_coro
+from app.core.logger import logger
+from app.tasks import background  # noqa: F401 registers the job handlers
+from app.tasks.worker import JobWorker
+
+app = Typer()
+
+
+@app.command()
+@cli_coro()
+async def run(
+    concurrency: int = Option(None, help="Jobs run at the same time"),
+    lease_seconds: float = Option(None, help="Seconds a claimed job is leased"),
+    poll_interval: float = Option(None, help="Seconds between polls when idle"),
+) -> None:
+    try:
+        worker = JobWorker(
+            concurrency=concurrency,
+            lease_seconds=lease_seconds,
+            poll_interval=poll_interval,
+        )
+        loop = asyncio.get_running_loop()
+        for ss in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(ss, worker.stop)
+        await worker.run()
+    except Exception as e:
+        logger.warning(f"Error running job worker: {e}")
+
+
+@app.command()
+@cli_coro()
+async def drain(
+    concurrency: int = Option(None, help="Jobs run at the same time"),
+) -> None:
+    try:
+        logger.info("Run Due Jobs")
+        count = await JobWorker(concurrency=concurrency).drain()
+        logger.info(f"Jobs Run C[{count}]")
+    except Exception as e:
+        logger.warning(f"Error running jobs: {e}")
+
+
+if __name__ == "__main__":
+    try:
+        app()
+    except KeyboardInterrupt:
+        logger.warning("CLI Interrupted")
+    except Exception as e:
+        logger.warning(f"Error running CLI: {e}")
@@ -55,6 +55,21 @@ class ApiSettings(BaseSettings):
         environ.get("API_QUERY_LIMIT_ROWS_DEFAULT", 100)
     )
     query_limit_rows_max: int = int(environ.get("API_QUERY_LIMIT_ROWS_MAX", 10000))
+    import_max_row_length: int = int(environ.get("API_IMPORT_MAX_ROW_LENGTH", 8192))
+    import_max_errors: int = int(environ.get("API_IMPORT_MAX_ERRORS", 1000))
+    # API Caches
+    user_cache_ttl: int = int(environ.get("API_USER_CACHE_TTL", 60))
+    user_cache_maxsize: int = int(environ.get("API_USER_CACHE_MAXSIZE", 10000))
+    access_graph_cache_ttl: int = int(environ.get("API_ACCESS_GRAPH_CACHE_TTL", 300))
+    access_graph_cache_maxsize: int = int(
+        environ.get("API_ACCESS_GRAPH_CACHE_MAXSIZE", 10000)
+    )
+    # Job Queue
+    job_worker_concurrency: int = int(environ.get("API_JOB_WORKER_CONCURRENCY", 4))
+    job_lease_seconds: float = float(environ.get("API_JOB_LEASE_SECONDS", 60))
+    job_poll_interval: float = float(environ.get("API_JOB_POLL_INTERVAL", 1))
+    job_max_attempts: int = int(environ.get("API_JOB_MAX_ATTEMPTS", 3))
+    job_retry_backoff: float = float(environ.get("API_JOB_RETRY_BACKOFF", 5))
     allowed_mime_types: list[str] = [
         "webp",
         "gif",
@@ -9,8 +9,33 @@ load_dotenv()
 class CloudKeySettings(BaseSettings):
     # IP Info
     ipinfo: str | None = environ.get("CLOUDKEY_IPINFO", None)
+    ipinfo_timeout: float = float(environ.get("CLOUDKEY_IPINFO_TIMEOUT", 5))
+    ipinfo_cache_maxsize: int = int(environ.get("CLOUDKEY_IPINFO_CACHE_MAXSIZE", 10000))
+    ipinfo_cache_ttl: int = int(environ.get("CLOUDKEY_IPINFO_CACHE_TTL", 86400))
+    ipinfo_negative_cache_ttl: int = int(
+        environ.get("CLOUDKEY_IPINFO_NEGATIVE_CACHE_TTL", 300)
+    )
+    # a local ip range index looked up before ipinfo.io
+    ip_range_index: str | None = environ.get("CLOUDKEY_IP_RANGE_INDEX", None)
     # Google Cloud
     googleapi: str | None = environ.get("CLOUDKEY_GOOGLE_API", None)
+    # PageSpeed Insights
+    psi_url: str = environ.get(
+        "CLOUDKEY_PSI_URL",
+        "https://www.googleapis.com/pagespeedonline/v5/runPagespeed",
+    )
+    psi_concurrency: int = int(environ.get("CLOUDKEY_PSI_CONCURRENCY", 4))
+    psi_timeout: float = float(environ.get("CLOUDKEY_PSI_TIMEOUT", 60))
+    psi_max_retries: int = int(environ.get("CLOUDKEY_PSI_MAX_RETRIES", 3))
+    psi_backoff: float = float(environ.get("CLOUDKEY_PSI_BACKOFF", 1))
+    psi_batch_workers: int = int(environ.get("CLOUDKEY_PSI_BATCH_WORKERS", 4))
+    psi_batch_write_size: int = int(environ.get("CLOUDKEY_PSI_BATCH_WRITE_SIZE", 50))
+    # Sitemaps
+    sitemap_timeout: float = float(environ.get("CLOUDKEY_SITEMAP_TIMEOUT", 30))
+    sitemap_max_bytes: int = int(
+        environ.get("CLOUDKEY_SITEMAP_MAX_BYTES", 50 * 1024 * 1024)
+    )
+    sitemap_max_depth: int = int(environ.get("CLOUDKEY_SITEMAP_MAX_DEPTH", 3))
 
     # pydantic settings config
     model_config = SettingsConfigDict(
@@ -15,6 +15,28 @@ TEST_URI_ASYNC: str = "sqlite+aiosqlite:///./test.db"
 class DatabaseSettings(BaseSettings):
     uri: Union[str, URL] = environ.get("DATABASE_URI", "")
     uri_async: Union[str, URL] = environ.get("DATABASE_URI_ASYNC", "")
+    replica_uris_async: Union[str, list[str]] = environ.get(
+        "DATABASE_REPLICA_URIS_ASYNC", ""
+    )
+    replica_lag_tolerance: float = float(
+        environ.get("DATABASE_REPLICA_LAG_TOLERANCE", 5)
+    )
+    echo: bool = environ.get("API_MODE", "development") == "development"
+    pool_size: int = int(environ.get("DATABASE_POOL_SIZE", 5))
+    pool_max_overflow: int = int(environ.get("DATABASE_POOL_MAX_OVERFLOW", 10))
+    pool_timeout: float = float(environ.get("DATABASE_POOL_TIMEOUT", 30))
+    pool_recycle: int = int(environ.get("DATABASE_POOL_RECYCLE", 3600))
+    pool_pre_ping: bool = bool(environ.get("DATABASE_POOL_PRE_PING", True))
+    pool_warmup: int = int(environ.get("DATABASE_POOL_WARMUP", 5))
+    pool_slow_checkout_ms: float = float(
+        environ.get("DATABASE_POOL_SLOW_CHECKOUT_MS", 100)
+    )
+    statement_cache_size: int = int(environ.get("DATABASE_STATEMENT_CACHE_SIZE", 500))
+    unit_of_work: bool = bool(environ.get("DATABASE_UNIT_OF_WORK", True))
+    bulk_chunk_size: int = int(environ.get("DATABASE_BULK_CHUNK_SIZE", 500))
+    no_refresh_tables: Union[str, list[str]] = environ.get(
+        "DATABASE_NO_REFRESH_TABLES", ""
+    )
 
     # pydantic settings config
     model_config = SettingsConfigDict(
@@ -46,3 +68,13 @@ class DatabaseSettings(BaseSettings):
             if len(v) > 0:
                 return v
         raise ValueError("DATABASE_URI_ASYNC not set")
+
+    @field_validator("replica_uris_async", "no_refresh_tables", mode="before")
+    def assemble_str_list(
+        cls, v: Union[str, list[str]] | None, info: ValidationInfo
+    ) -> list[str]:
+        if isinstance(v, str):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        if isinstance(v, list):
+            return v
+        return []
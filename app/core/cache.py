@@ -0,0 +1,119 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+from cachetools import TLRUCache, TTLCache
+from pydantic import BaseModel
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    maxsize: int = 0
+    ttl: float | None = None
+
+
+class CacheMonitor(Generic[K, V]):
+    """Count hits, misses and evictions of a `cachetools` time aware cache.
+
+    Evictions include entries dropped because the cache is full and entries
+    removed after they expired.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def popitem(self) -> tuple[K, V]:
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time: float | None = None) -> list[tuple[K, V]]:
+        expired = super().expire(time)
+        self.evictions += len(expired)
+        return expired
+
+    def lookup(self, key: K) -> V | None:
+        """Return the cached value for the key, recording a hit or a miss."""
+        value: V | None = self.get(key, None)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=self.currsize,
+            maxsize=self.maxsize,
+            ttl=getattr(self, "ttl", None),
+        )
+
+
+class MonitoredTTLCache(CacheMonitor[K, V], TTLCache):
+    """A bounded cache where every entry lives for the same time-to-live."""
+
+    def __init__(self, maxsize: int, ttl: float, **kwargs: Any) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl, **kwargs)
+
+
+class MonitoredTLRUCache(CacheMonitor[K, V], TLRUCache):
+    """A bounded cache where each entry expires at the time returned by `ttu`.
+
+    The `ttu(key, value, now)` function receives the current `timer()` value and
+    returns the time the entry expires at.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttu: Callable[[K, V, float], float],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(maxsize=maxsize, ttu=ttu, **kwargs)
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesce concurrent async calls that share the same key.
+
+    The first caller for a key runs the call, every caller that arrives while it
+    is in flight awaits the same result instead of running it again.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Future[V]] = {}
+
+    def in_flight(self, key: K) -> bool:
+        return key in self._calls
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        call: asyncio.Future[V] | None = self._calls.get(key)
+        if call is not None:
+            return await asyncio.shield(call)
+        call = asyncio.ensure_future(fn())
+        self._calls[key] = call
+        try:
+            return await asyncio.shield(call)
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+
+__all__: list[str] = [
+    "CacheMonitor",
+    "CacheStats",
+    "MonitoredTLRUCache",
+    "MonitoredTTLCache",
+    "SingleFlight",
+]
@@ -1,19 +1,37 @@
 import abc
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
 from typing import Any, Generic, TypeVar, Union
 
 from pydantic import UUID4
-from sqlalchemy import Select, and_
+from sqlalchemy import ColumnElement, Insert, Select, and_, true
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import insert as sql_insert
 from sqlalchemy import select as sql_select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
 
+from app.config import settings
+from app.core.loader import EntityLoader, get_entity_loader
 from app.core.schema import BaseSchema
 from app.db.base import Base
+from app.db.session import after_commit, is_unit_of_work
 from app.utilities import get_uuid
 
 SCHEMA_CREATE = TypeVar("SCHEMA_CREATE", bound=BaseSchema)
 SCHEMA_READ = TypeVar("SCHEMA_READ", bound=BaseSchema)
 SCHEMA_UPDATE = TypeVar("SCHEMA_UPDATE", bound=BaseSchema)
 TABLE = TypeVar("TABLE", bound=Base)
+T = TypeVar("T")
+
+# columns an upsert never overwrites on an existing row
+UPSERT_IMMUTABLE_COLUMNS: tuple[str, ...] = ("id", "created_at")
+
+
+def chunked(values: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
+    for i in range(0, len(values), max(chunk_size, 1)):
+        yield values[i : i + chunk_size]
 
 
 class BaseRepository(
@@ -23,11 +41,30 @@ class BaseRepository(
     def __init__(self, session: AsyncSession, *args: Any, **kwargs: Any) -> None:
         self._db: AsyncSession = session
 
+    @property
+    def _loader(self) -> EntityLoader | None:
+        return get_entity_loader(self._db)
+
     @property
     @abc.abstractmethod
     def _table(self) -> Generic[TABLE]:  # pragma: no cover
         pass
 
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        """The unique columns that identify an existing row in `upsert_many`."""
+        return ("id",)
+
+    async def _commit(self) -> None:
+        """Commit the writes, or only flush them inside a unit of work."""
+        if is_unit_of_work(self._db):
+            await self._db.flush()
+        else:
+            await self._db.commit()
+
+    def _after_commit(self, callback: Callable[[], Any]) -> None:
+        after_commit(self._db, callback)
+
     def gen_uuid(self) -> UUID4:
         return get_uuid()
 
@@ -51,10 +88,119 @@ class BaseRepository(
         self._db.begin()
         entry: Any = self._table(id=self.gen_uuid(), **schema.model_dump())
         self._db.add(entry)
-        await self._db.commit()
-        await self._db.refresh(entry)
+        await self._commit()
+        if self._loader is not None:
+            self._loader.prime(entry)
         return entry
 
+    async def create_many(
+        self,
+        schemas: Sequence[Union[SCHEMA_CREATE, Any]],
+        chunk_size: int | None = None,
+    ) -> list[TABLE]:
+        """Create entries in one transaction, flushing a chunk of rows at a time.
+
+        Each chunk is inserted with a single batched statement, the entries are
+        not refreshed from the database after the commit.
+        """
+        self._db.begin()
+        entries: list[Any] = []
+        for chunk in chunked(schemas, chunk_size or settings.db.bulk_chunk_size):
+            chunk_entries: list[Any] = [
+                self._table(id=self.gen_uuid(), **schema.model_dump())
+                for schema in chunk
+            ]
+            self._db.add_all(chunk_entries)
+            await self._db.flush()
+            entries.extend(chunk_entries)
+        await self._commit()
+        if self._loader is not None:
+            for entry in entries:
+                self._loader.prime(entry)
+        return entries
+
+    def _upsert_statement(self, columns: Sequence[str]) -> Insert:
+        dialect_name: str = self._db.bind.dialect.name
+        table: Any = self._table.__table__
+        update_columns: list[str] = [
+            column
+            for column in (*columns, "updated_at")
+            if column not in self._natural_key
+            and column not in UPSERT_IMMUTABLE_COLUMNS
+            and column in table.columns
+        ]
+        if dialect_name in ("mysql", "mariadb"):
+            mysql_stmt = mysql_insert(table)
+            return mysql_stmt.on_duplicate_key_update(
+                {column: mysql_stmt.inserted[column] for column in update_columns}
+            )
+        if dialect_name == "sqlite":
+            sqlite_stmt = sqlite_insert(table)
+            return sqlite_stmt.on_conflict_do_update(
+                index_elements=list(self._natural_key),
+                set_={
+                    column: sqlite_stmt.excluded[column] for column in update_columns
+                },
+            )
+        raise NotImplementedError(
+            "Upsert is not supported for the {} dialect".format(dialect_name)
+        )
+
+    def _insert_rows(
+        self, schemas: Sequence[Union[SCHEMA_CREATE, Any]]
+    ) -> list[dict[str, Any]]:
+        table_columns: Any = self._table.__table__.columns
+        return [
+            {
+                "id": self.gen_uuid(),
+                **{k: v for k, v in schema.model_dump().items() if k in table_columns},
+            }
+            for schema in schemas
+        ]
+
+    async def insert_many(
+        self,
+        schemas: Sequence[Union[SCHEMA_CREATE, Any]],
+        chunk_size: int | None = None,
+    ) -> int:
+        """Insert entries with a batched `INSERT` statement per chunk.
+
+        Unlike `create_many` no entity is added to the session, so large imports
+        do not grow its identity map. Returns the number of rows inserted.
+        """
+        if len(schemas) == 0:
+            return 0
+        self._db.begin()
+        rows: list[dict[str, Any]] = self._insert_rows(schemas)
+        stmt: Insert = sql_insert(self._table.__table__)
+        for chunk in chunked(rows, chunk_size or settings.db.bulk_chunk_size):
+            await self._db.execute(stmt, list(chunk))
+        await self._commit()
+        return len(rows)
+
+    async def upsert_many(
+        self,
+        schemas: Sequence[Union[SCHEMA_CREATE, Any]],
+        chunk_size: int | None = None,
+    ) -> int:
+        """Insert entries, or update the existing rows with the same natural key.
+
+        Rows are written in one transaction with a batched `INSERT ... ON
+        CONFLICT` (sqlite) or `INSERT ... ON DUPLICATE KEY UPDATE` (mysql)
+        statement per chunk. Returns the number of rows written.
+        """
+        if len(schemas) == 0:
+            return 0
+        self._db.begin()
+        rows: list[dict[str, Any]] = self._insert_rows(schemas)
+        stmt: Insert = self._upsert_statement(list(rows[0].keys()))
+        for chunk in chunked(rows, chunk_size or settings.db.bulk_chunk_size):
+            await self._db.execute(stmt, list(chunk))
+        await self._commit()
+        if self._loader is not None:
+            self._loader.clear()
+        return len(rows)
+
     async def read_by(self, field_name: str, field_value: Any) -> TABLE | None:
         self._db.begin()
         check_val: Any = getattr(self._table, field_name)
@@ -65,6 +211,8 @@ class BaseRepository(
         return entry
 
     async def read(self, entry_id: UUID4) -> TABLE | None:
+        if self._loader is not None:
+            return await self._loader.load(self._table, entry_id)
         self._db.begin()
         query: Any = sql_select(self._table).where(self._table.id == entry_id)
         entry: Any = await self._get(query)
@@ -72,6 +220,66 @@ class BaseRepository(
             return None
         return entry
 
+    async def read_many(self, entry_ids: Sequence[UUID4]) -> list[TABLE | None]:
+        """Read entries by id in one query, in the order of the ids requested."""
+        if self._loader is not None:
+            return await self._loader.load_many(self._table, entry_ids)
+        self._db.begin()
+        query: Any = sql_select(self._table).where(self._table.id.in_(entry_ids))
+        results: Any = await self._db.execute(query)
+        entries: dict[Any, TABLE] = {
+            entry.id: entry for entry in results.scalars().all()
+        }
+        return [entries.get(entry_id) for entry_id in entry_ids]
+
+    async def stream(
+        self, query: Select, chunk_size: int | None = None
+    ) -> AsyncIterator[TABLE]:
+        """Yield the entries of a query ordered by id, reading a chunk at a time.
+
+        Each chunk is its own keyset query after the last id yielded, so no
+        cursor stays open while the caller works through the entries.
+        """
+        size: int = chunk_size or settings.db.bulk_chunk_size
+        last_id: Any = None
+        while True:
+            stmt: Select = query.order_by(self._table.id).limit(size)
+            if last_id is not None:
+                stmt = stmt.where(self._table.id > last_id)
+            results: Any = await self._db.execute(stmt)
+            entries: Sequence[TABLE] = results.scalars().all()
+            for entry in entries:
+                yield entry
+            if len(entries) < size:
+                return
+            last_id = entries[-1].id
+
+    async def read_with_access(
+        self,
+        entry_id: UUID4,
+        access: ColumnElement[bool] | None = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> tuple[TABLE | None, bool]:
+        """Read an entry by id together with an access condition, in one query.
+
+        Returns the entry, or `None` when it does not exist, and whether the
+        access condition holds for the entry.
+        """
+        self._db.begin()
+        has_access: ColumnElement[bool] = true() if access is None else access
+        query: Any = (
+            sql_select(self._table, has_access.label("has_access"))
+            .where(self._table.id == entry_id)
+            .options(*options)
+        )
+        results: Any = await self._db.execute(query)
+        data: Any = results.first()
+        if data is None:
+            return None, False
+        if self._loader is not None:
+            self._loader.prime(data[0])
+        return data[0], bool(data[1])
+
     async def update(
         self,
         entry: TABLE,
@@ -81,16 +289,41 @@ class BaseRepository(
         for k, v in schema.model_dump(exclude_unset=True, exclude_none=True).items():
             setattr(entry, k, v)
         self._db.add(entry)
-        await self._db.commit()
-        await self._db.refresh(entry)  # pragma: no cover
-        return entry  # pragma: no cover
+        await self._commit()
+        return entry
 
     async def delete(self, entry: TABLE) -> None:
         self._db.begin()
         await self._db.delete(entry)
-        await self._db.commit()
+        await self._commit()
+        if self._loader is not None:
+            self._loader.forget(self._table, entry.id)
         return None  # pragma: no cover
 
+    async def delete_many(
+        self,
+        entry_ids: Sequence[UUID4],
+        chunk_size: int | None = None,
+    ) -> int:
+        """Delete entries by id in one transaction, a chunk of ids per statement.
+
+        Rows are deleted with `DELETE ... WHERE id IN (...)`, relationship
+        cascades configured on the models are not applied. Returns the number of
+        rows deleted.
+        """
+        self._db.begin()
+        count: int = 0
+        for chunk in chunked(entry_ids, chunk_size or settings.db.bulk_chunk_size):
+            result: Any = await self._db.execute(
+                sql_delete(self._table).where(self._table.id.in_(chunk))
+            )
+            count += result.rowcount
+        await self._commit()
+        if self._loader is not None:
+            for entry_id in entry_ids:
+                self._loader.forget(self._table, entry_id)
+        return count
+
     async def exists_by_fields(
         self,
         fields: dict[str, Any],
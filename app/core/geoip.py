@@ -0,0 +1,261 @@
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network
+from typing import Any, BinaryIO
+
+from cachetools import LRUCache
+
+from app.config import settings
+from app.core.logger import logger
+
+# magic, ipv4 ranges, ipv6 ranges, records, bytes of the encoded records
+INDEX_HEADER: struct.Struct = struct.Struct("<8s4Q")
+INDEX_MAGIC: bytes = b"GCIPIDX1"
+UINT64_MASK: int = (1 << 64) - 1
+
+
+def _pad(size: int) -> int:
+    return (8 - size % 8) % 8
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "big":  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def read_ip_range_rows(
+    csv_path: str,
+) -> Iterator[tuple[IPv4Address | IPv6Address, IPv4Address | IPv6Address, dict]]:
+    """Read the ranges of a CSV with a `network` CIDR column.
+
+    The other columns of a row, e.g. city, region, country, postal, timezone,
+    latitude and longitude, are the record of the range, empty values are
+    dropped.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as csv_file:
+        for row in csv.DictReader(csv_file):
+            network = ip_network(row.pop("network").strip(), strict=False)
+            record: dict = {k: v for k, v in row.items() if k and v not in ("", None)}
+            yield network[0], network[-1], record
+
+
+def build_ip_range_index(
+    rows: Iterable[tuple[IPv4Address | IPv6Address, IPv4Address | IPv6Address, dict]],
+    index_path: str,
+) -> int:
+    """Write the sorted ranges and their deduplicated records to an index file.
+
+    The file holds packed arrays of the ipv4 (uint32) and ipv6 (two uint64)
+    range starts and ends with the record id of each range, the offsets of
+    the records and the JSON encoded records. Returns the number of ranges.
+    """
+    records: dict[str, int] = {}
+    ranges: dict[int, list[tuple[int, int, int]]] = {4: [], 6: []}
+    for first, last, record in rows:
+        encoded: str = json.dumps(record, sort_keys=True, separators=(",", ":"))
+        record_id: int = records.setdefault(encoded, len(records))
+        ranges[first.version].append((int(first), int(last), record_id))
+    for version, version_ranges in ranges.items():
+        version_ranges.sort()
+        for previous, current in zip(version_ranges, version_ranges[1:]):
+            if current[0] <= previous[1]:
+                raise ValueError(
+                    "Overlapping IPv{} ranges starting at {} and {}".format(
+                        version,
+                        ip_address(previous[0]),
+                        ip_address(current[0]),
+                    )
+                )
+    blob: bytes = b"".join(encoded.encode("utf-8") for encoded in records)
+    offsets: array = array("Q", [0])
+    for encoded in records:
+        offsets.append(offsets[-1] + len(encoded.encode("utf-8")))
+    v4, v6 = ranges[4], ranges[6]
+    sections: list[array] = [
+        array("I", (r[0] for r in v4)),
+        array("I", (r[1] for r in v4)),
+        array("I", (r[2] for r in v4)),
+        array("Q", (r[0] >> 64 for r in v6)),
+        array("Q", (r[0] & UINT64_MASK for r in v6)),
+        array("Q", (r[1] >> 64 for r in v6)),
+        array("Q", (r[1] & UINT64_MASK for r in v6)),
+        array("I", (r[2] for r in v6)),
+        offsets,
+    ]
+    index_file: BinaryIO
+    with open(index_path, "wb") as index_file:
+        index_file.write(
+            INDEX_HEADER.pack(INDEX_MAGIC, len(v4), len(v6), len(records), len(blob))
+        )
+        for section in sections:
+            data: bytes = _little_endian(section).tobytes()
+            index_file.write(data + b"\0" * _pad(len(data)))
+        index_file.write(blob)
+    return len(v4) + len(v6)
+
+
+class IpRangeIndex:
+    """A read only, memory mapped index of ip ranges.
+
+    Lookups binary search the packed range starts, the arrays are read in
+    place from the mapped file so every worker process shares the same pages.
+    """
+
+    def __init__(self, index_path: str, record_cache_size: int = 4096) -> None:
+        self.index_path: str = index_path
+        with open(index_path, "rb") as index_file:
+            self._mmap: mmap.mmap = mmap.mmap(
+                index_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        magic, v4_count, v6_count, record_count, blob_size = INDEX_HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != INDEX_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{index_path} is not an ip range index")
+        self._view: memoryview = memoryview(self._mmap)
+        offset: int = INDEX_HEADER.size
+        sizes: list[tuple[str, int]] = [
+            ("I", v4_count),
+            ("I", v4_count),
+            ("I", v4_count),
+            ("Q", v6_count),
+            ("Q", v6_count),
+            ("Q", v6_count),
+            ("Q", v6_count),
+            ("I", v6_count),
+            ("Q", record_count + 1),
+        ]
+        sections: list[Any] = []
+        for typecode, count in sizes:
+            size: int = count * struct.calcsize(typecode)
+            sections.append(self._section(offset, size, typecode))
+            offset += size + _pad(size)
+        (
+            self._v4_starts,
+            self._v4_ends,
+            self._v4_records,
+            self._v6_start_hi,
+            self._v6_start_lo,
+            self._v6_end_hi,
+            self._v6_end_lo,
+            self._v6_records,
+            self._record_offsets,
+        ) = sections
+        self._blob: memoryview = self._view[offset : offset + blob_size]
+        self.v4_count: int = v4_count
+        self.v6_count: int = v6_count
+        self._records: LRUCache[int, dict] = LRUCache(maxsize=record_cache_size)
+
+    def _section(self, offset: int, size: int, typecode: str) -> Any:
+        view: memoryview = self._view[offset : offset + size]
+        if sys.byteorder == "big":  # pragma: no cover
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(typecode)
+
+    def __len__(self) -> int:
+        return self.v4_count + self.v6_count
+
+    def record(self, record_id: int) -> dict:
+        record: dict | None = self._records.get(record_id)
+        if record is None:
+            start, end = (
+                self._record_offsets[record_id],
+                self._record_offsets[record_id + 1],
+            )
+            record = json.loads(bytes(self._blob[start:end]))
+            self._records[record_id] = record
+        return record
+
+    def _find_v4(self, value: int) -> int | None:
+        i: int = bisect_right(self._v4_starts, value) - 1
+        if i < 0 or value > self._v4_ends[i]:
+            return None
+        return self._v4_records[i]
+
+    def _find_v6(self, value: int) -> int | None:
+        key: tuple[int, int] = (value >> 64, value & UINT64_MASK)
+        i: int = (
+            bisect_right(
+                range(self.v6_count),
+                key,
+                key=lambda j: (self._v6_start_hi[j], self._v6_start_lo[j]),
+            )
+            - 1
+        )
+        if i < 0 or key > (self._v6_end_hi[i], self._v6_end_lo[i]):
+            return None
+        return self._v6_records[i]
+
+    def lookup(self, ip: str | IPv4Address | IPv6Address) -> dict | None:
+        """The record of the range containing the ip address, if any."""
+        address: IPv4Address | IPv6Address = (
+            ip if isinstance(ip, (IPv4Address, IPv6Address)) else ip_address(ip)
+        )
+        record_id: int | None
+        if address.version == 4:
+            record_id = self._find_v4(int(address))
+        elif address.ipv4_mapped is not None:
+            record_id = self._find_v4(int(address.ipv4_mapped))
+        else:
+            record_id = self._find_v6(int(address))
+        if record_id is None:
+            return None
+        return self.record(record_id)
+
+    def close(self) -> None:
+        for section in (
+            self._v4_starts,
+            self._v4_ends,
+            self._v4_records,
+            self._v6_start_hi,
+            self._v6_start_lo,
+            self._v6_end_hi,
+            self._v6_end_lo,
+            self._v6_records,
+            self._record_offsets,
+            self._blob,
+        ):
+            if isinstance(section, memoryview):
+                section.release()
+        self._view.release()
+        self._mmap.close()
+
+
+_ip_range_index: IpRangeIndex | None = None
+_ip_range_index_lock = threading.Lock()
+
+
+def get_ip_range_index() -> IpRangeIndex | None:
+    """The ip range index of CLOUDKEY_IP_RANGE_INDEX, opened on first use.
+
+    Returns None when no index is configured or it can not be opened.
+    """
+    global _ip_range_index
+    index_path: str | None = settings.cloud.ip_range_index
+    if not index_path:
+        return None
+    if _ip_range_index is None or _ip_range_index.index_path != index_path:
+        with _ip_range_index_lock:
+            if _ip_range_index is None or _ip_range_index.index_path != index_path:
+                if not os.path.exists(index_path):
+                    logger.warning(f"IP range index not found: {index_path}")
+                    return None
+                try:
+                    _ip_range_index = IpRangeIndex(index_path)
+                except Exception as e:  # pragma: no cover
+                    logger.warning(f"Error opening IP range index: {e}")
+                    return None
+    return _ip_range_index
@@ -1,5 +1,31 @@
+from typing import Any
+
 import ipinfo
+from ipinfo.cache.interface import CacheInterface
+from ipinfo.handler_async import AsyncHandler
 
 from app.config import settings
 
-ipinfo_handler = ipinfo.getHandler(settings.cloud.ipinfo)
+
+class IpinfoNoCache(CacheInterface):
+    """Skip the cache of the ipinfo handler, lookups are cached by the caller."""
+
+    def __contains__(self, key: Any) -> bool:
+        return False
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        pass
+
+    def __getitem__(self, key: Any) -> Any:
+        raise KeyError(key)
+
+    def __delitem__(self, key: Any) -> None:
+        pass
+
+
+# one aiohttp session is shared by every lookup, closed in the app lifespan
+ipinfo_handler: AsyncHandler = ipinfo.getHandlerAsync(
+    settings.cloud.ipinfo,
+    cache=IpinfoNoCache(),
+    request_options={"timeout": settings.cloud.ipinfo_timeout},
+)
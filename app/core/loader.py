@@ -0,0 +1,133 @@
+import asyncio
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+from pydantic import UUID4, BaseModel
+from sqlalchemy import select as sql_select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ENTITY_LOADER_KEY: str = "entity_loader"
+
+
+class EntityLoaderStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    batches: int = 0
+    size: int = 0
+
+
+class EntityLoader:
+    """Batch and memoize primary key reads for the lifetime of one session.
+
+    Reads of the same table that are requested in the same event loop iteration
+    are loaded together with a single `WHERE id IN (...)` query, and every row
+    loaded (or found missing) is served from memory for the rest of the session.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._db: AsyncSession = session
+        self._entries: dict[tuple[type, Hashable], Any] = {}
+        self._pending: dict[type, dict[Hashable, asyncio.Future[Any]]] = {}
+        self._lock: asyncio.Lock = asyncio.Lock()
+        # the event loop only keeps weak references to the dispatch tasks
+        self._dispatching: set[asyncio.Task] = set()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.batches: int = 0
+
+    async def load(self, table: type, entry_id: UUID4) -> Any | None:
+        key: tuple[type, Hashable] = (table, entry_id)
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        pending: dict[Hashable, asyncio.Future[Any]] = self._pending.setdefault(
+            table, {}
+        )
+        if entry_id in pending:
+            self.hits += 1
+            return await asyncio.shield(pending[entry_id])
+        self.misses += 1
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if not pending:
+            loop.call_soon(self._schedule_dispatch, table)
+        pending[entry_id] = loop.create_future()
+        return await asyncio.shield(pending[entry_id])
+
+    async def load_many(
+        self, table: type, entry_ids: Sequence[UUID4]
+    ) -> list[Any | None]:
+        return list(
+            await asyncio.gather(
+                *[self.load(table, entry_id) for entry_id in entry_ids]
+            )
+        )
+
+    def prime(self, entry: Any) -> None:
+        """Store an entry that was loaded or created outside of the loader."""
+        self._entries[(type(entry), entry.id)] = entry
+
+    def forget(self, table: type, entry_id: UUID4) -> None:
+        self._entries.pop((table, entry_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> EntityLoaderStats:
+        return EntityLoaderStats(
+            hits=self.hits,
+            misses=self.misses,
+            batches=self.batches,
+            size=len(self._entries),
+        )
+
+    def _schedule_dispatch(self, table: type) -> None:
+        batch: dict[Hashable, asyncio.Future[Any]] = self._pending.pop(table, {})
+        if batch:
+            task: asyncio.Task = asyncio.create_task(self._dispatch(table, batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(
+        self, table: type, batch: dict[Hashable, asyncio.Future[Any]]
+    ) -> None:
+        try:
+            # a session can only run one statement at a time
+            async with self._lock:
+                query: Any = sql_select(table).where(table.id.in_(list(batch.keys())))
+                results: Any = await self._db.execute(query)
+                rows: dict[Hashable, Any] = {
+                    row.id: row for row in results.scalars().all()
+                }
+            self.batches += 1
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for entry_id, future in batch.items():
+            entry: Any | None = rows.get(entry_id)
+            self._entries[(table, entry_id)] = entry
+            if not future.done():
+                future.set_result(entry)
+
+
+def enable_entity_loader(session: AsyncSession) -> EntityLoader:
+    """Attach an entity loader to the session, or return the attached one."""
+    loader: EntityLoader | None = session.info.get(ENTITY_LOADER_KEY)
+    if loader is None:
+        loader = EntityLoader(session)
+        session.info[ENTITY_LOADER_KEY] = loader
+    return loader
+
+
+def get_entity_loader(session: AsyncSession) -> EntityLoader | None:
+    return session.info.get(ENTITY_LOADER_KEY)
+
+
+__all__: list[str] = [
+    "ENTITY_LOADER_KEY",
+    "EntityLoader",
+    "EntityLoaderStats",
+    "enable_entity_loader",
+    "get_entity_loader",
+]
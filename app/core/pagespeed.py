@@ -0,0 +1,112 @@
+import asyncio
+import random
+from typing import Any
+
+import httpx
+
+from app.config import settings
+from app.core.logger import logger
+
+# responses worth retrying, the api is rate limited or temporarily unavailable
+PSI_RETRY_STATUS_CODES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+PSI_MAX_RETRY_AFTER: float = 60.0
+
+
+class PageSpeedInsightsClient:
+    """An async client of the Google PageSpeed Insights API.
+
+    Every run shares one pooled HTTP client and at most `concurrency` runs are
+    in flight across the process. Timeouts, connection errors and 429 or 5xx
+    responses are retried up to `max_retries` times with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str | None,
+        concurrency: int = 4,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ) -> None:
+        self.api_url: str = api_url
+        self.api_key: str | None = api_key
+        self.concurrency: int = concurrency
+        self.timeout: float = timeout
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def retry_delay(self, attempt: int, response: httpx.Response | None) -> float:
+        delay: float = self.backoff * 2**attempt + random.uniform(0, self.backoff)
+        retry_after: str | None = (
+            response.headers.get("retry-after") if response is not None else None
+        )
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), PSI_MAX_RETRY_AFTER))
+        return delay
+
+    async def run_pagespeed(self, url: str, strategy: str) -> dict[str, Any]:
+        """Run PageSpeed Insights on the url and return the decoded report.
+
+        Raises the last `httpx.HTTPError` once the retries are exhausted.
+        """
+        params: dict[str, str] = {"url": url, "strategy": strategy}
+        if self.api_key is not None:
+            params["key"] = self.api_key
+        async with self.semaphore:
+            attempt: int = 0
+            while True:
+                response: httpx.Response | None = None
+                try:
+                    response = await self.client.get(self.api_url, params=params)
+                    if (
+                        response.status_code not in PSI_RETRY_STATUS_CODES
+                        or attempt >= self.max_retries
+                    ):
+                        response.raise_for_status()
+                        return response.json()
+                except httpx.TransportError as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    logger.info("PageSpeed Insights request failed: %s" % e)
+                delay: float = self.retry_delay(attempt, response)
+                logger.info(
+                    "Retrying PageSpeed Insights for %s in %.1fs" % (url, delay)
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+psi_client: PageSpeedInsightsClient = PageSpeedInsightsClient(
+    api_url=settings.cloud.psi_url,
+    api_key=settings.cloud.googleapi,
+    concurrency=settings.cloud.psi_concurrency,
+    timeout=settings.cloud.psi_timeout,
+    max_retries=settings.cloud.psi_max_retries,
+    backoff=settings.cloud.psi_backoff,
+)
@@ -7,12 +7,18 @@ https://github.com/dialoguemd/fastapi-sqla/blob/master/fastapi_sqla/asyncio_supp
 
 """
 
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from collections.abc import Sequence
-from typing import Annotated, Generic, TypeVar
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Any, Generic, TypeVar
+from uuid import UUID
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import Result, Select, TableClause, func, table
+from sqlalchemy import Result, Select, TableClause, and_, func, or_, table, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import column as sql_column
 from sqlalchemy.sql import select as sql_select
@@ -21,6 +27,13 @@ from app.config import settings
 
 PAGE_SIZE_MAX = settings.api.query_limit_rows_max
 PAGE_SIZE_DEFAULT = settings.api.query_limit_rows_default
+PAGE_CURSOR_MAXLEN = 256
+
+
+class PaginatedTotalMode(str, Enum):
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
 
 
 class PageParamsFromQuery:
@@ -34,12 +47,24 @@ class PageParamsFromQuery:
                 le=PAGE_SIZE_MAX,
             ),
         ] = PAGE_SIZE_DEFAULT,
+        include_total: Annotated[bool | None, Query()] = True,
+        cursor: Annotated[str | None, Query(max_length=PAGE_CURSOR_MAXLEN)] = None,
     ):
         page = 1 if page is None or page < 1 else page
         size = PAGE_SIZE_DEFAULT if size is None or size < 1 else size
         size = PAGE_SIZE_MAX if size > PAGE_SIZE_MAX else size
+        if cursor:
+            try:
+                decode_page_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Invalid pagination cursor",
+                )
         self.page = page
         self.size = size
+        self.include_total = include_total is not False
+        self.cursor = cursor or None
 
 
 GetPaginatedQueryParams = Annotated[PageParamsFromQuery, Depends()]
@@ -53,6 +78,14 @@ class PageParams(BaseModel):
         ge=1,
         le=PAGE_SIZE_MAX,
     )
+    include_total: bool = Field(
+        True,
+        description="Count the exact total, otherwise estimate it from table statistics",
+    )
+    cursor: str | None = Field(
+        None,
+        description="Opaque keyset cursor, fetches the page after it instead of by number",
+    )
 
 
 T = TypeVar("T", bound=BaseModel)
@@ -61,21 +94,152 @@ T = TypeVar("T", bound=BaseModel)
 class Paginated(BaseModel, Generic[T]):
     """Response schema for any paged API."""
 
-    total: int
+    total: int | None
+    total_mode: PaginatedTotalMode = PaginatedTotalMode.exact
     page: int
     size: int
+    next_cursor: str | None = None
     results: list[T]
 
     def __repr__(self) -> str:  # pragma: no cover
-        return "<{} total={} page={} size={} results={}>".format(
+        return "<{} total={} ({}) page={} size={} results={}>".format(
             "Paginated",
             self.total,
+            self.total_mode.value,
             self.page,
             self.size,
             len(self.results),
         )
 
 
+def encode_page_cursor(created_at: datetime, entry_id: UUID) -> str:
+    """Encode the `(created_at, id)` sort key of a row as an opaque cursor."""
+    cursor_data: str = json.dumps([created_at.isoformat(), str(entry_id)])
+    return urlsafe_b64encode(cursor_data.encode("utf-8")).decode("utf-8")
+
+
+def decode_page_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode an opaque cursor into its `(created_at, id)` sort key.
+
+    Raises a `ValueError` when the cursor was not produced by `encode_page_cursor`.
+    """
+    try:
+        created_at, entry_id = json.loads(urlsafe_b64decode(cursor.encode("utf-8")))
+        return datetime.fromisoformat(created_at), UUID(entry_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def keyset_query(stmt: Select, cursor: str | None = None) -> Select:
+    """Order a select statement by the stable `(created_at, id)` sort key.
+
+    When a cursor is provided only the rows sorted after it are selected, so a
+    page is fetched at any depth without an OFFSET. The paged tables keep a
+    composite `(created_at, id)` index for this sort key.
+    """
+    entity: Any = stmt.column_descriptions[0]["entity"]
+    stmt = stmt.order_by(entity.created_at, entity.id)
+    if cursor:
+        created_at, entry_id = decode_page_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                entity.created_at > created_at,
+                and_(entity.created_at == created_at, entity.id > entry_id),
+            )
+        )
+    return stmt
+
+
+def count_query(stmt: Select) -> Select:
+    """Wrap a select statement in a `SELECT COUNT(*)` subquery.
+
+    Ordering, limit and offset are stripped from the inner statement, joins,
+    filters and DISTINCT are preserved so the count matches the result rows.
+    """
+    count_subquery = stmt.order_by(None).limit(None).offset(None).subquery()
+    return sql_select(func.count()).select_from(count_subquery)
+
+
+def is_unfiltered_query(stmt: Select) -> bool:
+    """Whether a select statement reads every row of its table.
+
+    Only a bare `select(Model)` qualifies, ordering, limit and offset aside. Any
+    filter, join, DISTINCT or grouping makes the statement filtered.
+    """
+    entity: Any = stmt.column_descriptions[0]["entity"]
+    if entity is None:
+        return False
+    unordered: Select = stmt.order_by(None).limit(None).offset(None)
+    return unordered.compare(sql_select(entity))
+
+
+async def estimated_table_count(db: AsyncSession, table_name: str) -> int | None:
+    """Read the approximate row count of a table from the database statistics.
+
+    Returns `None` when the dialect does not keep table statistics, or they have
+    not been collected yet (e.g. sqlite without `ANALYZE`).
+    """
+    dialect_name: str = db.bind.dialect.name
+    try:
+        if dialect_name in ("mysql", "mariadb"):
+            estimate = await db.scalar(
+                text(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+                ),
+                {"table_name": table_name},
+            )
+            return None if estimate is None else int(estimate)
+        if dialect_name == "sqlite":
+            stat_table = await db.scalar(
+                text(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'sqlite_stat1'"
+                )
+            )
+            if stat_table is None:
+                return None
+            stat = await db.scalar(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table_name LIMIT 1"),
+                {"table_name": table_name},
+            )
+            return None if stat is None else int(str(stat).split(" ")[0])
+    except DBAPIError:  # pragma: no cover
+        return None
+    return None  # pragma: no cover
+
+
+async def paginated_total(
+    table_name: str,
+    db: AsyncSession,
+    stmt: Select,
+    include_total: bool = True,
+) -> tuple[int | None, PaginatedTotalMode]:
+    """Compute the total row count for a paginated statement.
+
+    - exact: `SELECT COUNT(*)` over the filtered statement as a subquery, or over
+        the table when the statement is unfiltered
+    - estimated: table statistics, only for unfiltered statements when the exact
+        total was not requested
+    - none: the exact total was not requested for a filtered statement
+    """
+    is_filtered: bool = not is_unfiltered_query(stmt)
+    if not include_total:
+        if is_filtered:
+            return None, PaginatedTotalMode.none
+        estimate: int | None = await estimated_table_count(db, table_name)
+        if estimate is not None:
+            return estimate, PaginatedTotalMode.estimated
+    count_stmt: Select
+    if is_filtered:
+        count_stmt = count_query(stmt)
+    else:
+        count_table: TableClause = table(table_name, sql_column("id"))
+        count_stmt = sql_select(func.count()).select_from(count_table)
+    total_count: int | None = await db.scalar(count_stmt)
+    return total_count or 0, PaginatedTotalMode.exact
+
+
 async def paginated_query(
     table_name: str,
     db: AsyncSession,
@@ -83,32 +247,38 @@ async def paginated_query(
     page_params: PageParams,
     response_schema: Generic[T],
 ) -> Paginated[T]:
-    """Paginate the query."""
-    count_table: TableClause
-    count_stmt: Select
+    """Paginate the query.
+
+    The total is only computed for pages fetched by number, a page fetched with
+    a cursor follows a first page that already returned it.
+    """
     total_count: int | None = None
-    if stmt.whereclause is not None:
-        # TODO: THIS IS A HACK TO GET THE COUNT
-        # need to find a better way to get the count
-        # without having to do a subquery
-        total_query = stmt
-        total_result = await db.execute(total_query)
-        total_data = total_result.scalars().all()
-        total_count = len(total_data)
-    else:
-        count_table = table(table_name, sql_column("id"))
-        count_stmt = sql_select(func.count()).select_from(count_table)
-        total_count = await db.scalar(count_stmt)
+    total_mode: PaginatedTotalMode = PaginatedTotalMode.none
+    if page_params.cursor is None:
+        total_count, total_mode = await paginated_total(
+            table_name=table_name,
+            db=db,
+            stmt=stmt,
+            include_total=page_params.include_total,
+        )
 
-    paginated_query = stmt.offset((page_params.page - 1) * page_params.size).limit(
-        page_params.size
-    )
+    paginated_query = keyset_query(stmt, page_params.cursor)
+    if page_params.cursor is None:
+        paginated_query = paginated_query.offset(
+            (page_params.page - 1) * page_params.size
+        )
+    paginated_query = paginated_query.limit(page_params.size)
     result: Result = await db.execute(paginated_query)
     data: Sequence = result.scalars().all()
+    next_cursor: str | None = None
+    if len(data) == page_params.size:
+        next_cursor = encode_page_cursor(data[-1].created_at, data[-1].id)
 
     return Paginated(
-        total=total_count or 0,
+        total=total_count,
+        total_mode=total_mode,
         page=page_params.page,
         size=page_params.size,
+        next_cursor=next_cursor,
         results=[response_schema.model_validate(item) for item in data],
     )
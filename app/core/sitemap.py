@@ -0,0 +1,291 @@
+import zlib
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
+from lxml import etree
+
+from app.config import settings
+
+SITEMAP_ROOT_ELEMENTS: tuple[str, ...] = ("urlset", "sitemapindex")
+SITEMAP_ENTRY_ELEMENTS: tuple[str, ...] = ("url", "sitemap")
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+SITEMAP_MAX_REDIRECTS: int = 5
+
+
+class SitemapError(Exception):
+    """The document is not a valid sitemap."""
+
+
+class SitemapRedirectError(httpx.RequestError):
+    """The sitemap redirected to another host."""
+
+
+class SitemapUrl(NamedTuple):
+    """A `<url>` entry of a urlset."""
+
+    loc: str
+    lastmod: datetime | None = None
+    changefreq: str | None = None
+    priority: float | None = None
+
+
+class SitemapReference(NamedTuple):
+    """A `<sitemap>` entry of a sitemap index."""
+
+    loc: str
+    lastmod: datetime | None = None
+
+
+def parse_sitemap_date(value: str | None) -> datetime | None:
+    """Parse a W3C datetime of a sitemap as an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        date: datetime = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+
+def parse_sitemap_priority(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        priority: float = float(value)
+    except ValueError:
+        return None
+    return priority if 0.0 <= priority <= 1.0 else None
+
+
+class SitemapParser:
+    """An incremental parser of a sitemap index or urlset.
+
+    The document is fed a chunk of bytes at a time, gzip compressed documents
+    are decompressed as they are fed. Every `<url>` or `<sitemap>` entry is
+    returned as soon as it is complete and dropped from the parsed tree, so the
+    memory used is bounded by the size of a chunk and not of the document.
+    """
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes: int | None = max_bytes
+        self.size: int = 0
+        # the root element, urlset or sitemapindex
+        self.kind: str | None = None
+        self._started: bool = False
+        self._decompressor: zlib._Decompress | None = None
+        self._parser: etree.XMLPullParser = etree.XMLPullParser(
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+
+    def _decompress(self, data: bytes) -> bytes:
+        if self._decompressor is None:
+            return data
+        if self.max_bytes is None:
+            return self._decompressor.decompress(data)
+        # never inflate more than the size left, plus a byte to detect overflow
+        return self._decompressor.decompress(data, self.max_bytes - self.size + 1)
+
+    def feed(self, data: bytes) -> list[SitemapUrl | SitemapReference]:
+        """Parse the next chunk of the document, returns the completed entries."""
+        if not self._started and len(data) > 0:
+            self._started = True
+            if data[:2] == GZIP_MAGIC:
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            data = self._decompress(data)
+        except zlib.error as e:
+            raise SitemapError(f"Invalid gzip compressed sitemap: {e}") from e
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise SitemapError(f"Sitemap is larger than {self.max_bytes} bytes")
+        try:
+            self._parser.feed(data)
+        except etree.XMLSyntaxError as e:
+            raise SitemapError(f"Invalid sitemap XML: {e}") from e
+        return list(self._read_entries())
+
+    def close(self) -> list[SitemapUrl | SitemapReference]:
+        """Finish parsing the document, returns the last completed entries."""
+        try:
+            if self._decompressor is not None:
+                self._parser.feed(self._decompressor.flush())
+            self._parser.close()
+        except (etree.XMLSyntaxError, zlib.error) as e:
+            raise SitemapError(f"Invalid sitemap XML: {e}") from e
+        return list(self._read_entries())
+
+    def _read_entries(self) -> Iterator[SitemapUrl | SitemapReference]:
+        for event, element in self._parser.read_events():
+            name: str = etree.QName(element).localname
+            if event == "start":
+                if self.kind is None:
+                    if name not in SITEMAP_ROOT_ELEMENTS:
+                        raise SitemapError(f"Not a sitemap, the root is <{name}>")
+                    self.kind = name
+                continue
+            parent: etree._Element | None = element.getparent()
+            if name not in SITEMAP_ENTRY_ELEMENTS or parent is None:
+                continue
+            if parent.getparent() is not None:
+                continue
+            entry: SitemapUrl | SitemapReference | None = self._entry(name, element)
+            # drop the entry and the entries before it from the tree
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+            if entry is not None:
+                yield entry
+
+    def _entry(
+        self, name: str, element: etree._Element
+    ) -> SitemapUrl | SitemapReference | None:
+        values: dict[str, str] = {}
+        for child in element:
+            if isinstance(child.tag, str) and child.text:
+                values[etree.QName(child).localname] = child.text.strip()
+        loc: str | None = values.get("loc")
+        if not loc:
+            return None
+        lastmod: datetime | None = parse_sitemap_date(values.get("lastmod"))
+        if name == "sitemap":
+            return SitemapReference(loc=loc, lastmod=lastmod)
+        return SitemapUrl(
+            loc=loc,
+            lastmod=lastmod,
+            changefreq=values.get("changefreq", "").lower() or None,
+            priority=parse_sitemap_priority(values.get("priority")),
+        )
+
+
+class SitemapResponse:
+    """The response of a sitemap request, the body is parsed as it streams in."""
+
+    def __init__(self, response: httpx.Response, max_bytes: int | None) -> None:
+        self.response: httpx.Response = response
+        self.parser: SitemapParser = SitemapParser(max_bytes=max_bytes)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.response.status_code == 304
+
+    @property
+    def etag(self) -> str | None:
+        return self.response.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.response.headers.get("last-modified")
+
+    @property
+    def is_index(self) -> bool:
+        return self.parser.kind == "sitemapindex"
+
+    async def entries(self) -> AsyncIterator[SitemapUrl | SitemapReference]:
+        """Yield the entries of the sitemap before the rest of the body is read.
+
+        Raises `SitemapError` when the body is not a valid sitemap.
+        """
+        async for data in self.response.aiter_bytes():
+            for entry in self.parser.feed(data):
+                yield entry
+        for entry in self.parser.close():
+            yield entry
+
+
+class SitemapClient:
+    """An async client fetching sitemaps over one pooled HTTP client.
+
+    Sitemaps are requested with the validators of a previous response, an
+    unchanged sitemap answers 304 Not Modified without a body. Redirects are
+    followed up to `max_redirects` times, only on the host of the sitemap url.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_bytes: int | None = None,
+        max_redirects: int = SITEMAP_MAX_REDIRECTS,
+    ) -> None:
+        self.timeout: float = timeout
+        self.max_bytes: int | None = max_bytes
+        self.max_redirects: int = max_redirects
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(self.timeout))
+        return self._client
+
+    async def send(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """Send a streamed GET request, following the redirects on the same host.
+
+        Raises `SitemapRedirectError` when a redirect leaves the host of the url
+        and `httpx.TooManyRedirects` after `max_redirects` redirects.
+        """
+        host: str = urlsplit(url).netloc.lower()
+        request: httpx.Request = self.client.build_request("GET", url, headers=headers)
+        for _ in range(self.max_redirects + 1):
+            response: httpx.Response = await self.client.send(request, stream=True)
+            if response.next_request is None:
+                return response
+            await response.aclose()
+            request = response.next_request
+            # every hop is checked, a redirect chain may not leave the host
+            if (
+                request.url.scheme not in ("http", "https")
+                or urlsplit(str(request.url)).netloc.lower() != host
+            ):
+                raise SitemapRedirectError(
+                    f"Sitemap redirected to another host: {request.url}",
+                    request=request,
+                )
+        raise httpx.TooManyRedirects(
+            "Exceeded maximum allowed redirects.", request=request
+        )
+
+    @asynccontextmanager
+    async def fetch(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> AsyncIterator[SitemapResponse]:
+        """Request the sitemap at the url, if it changed since `etag` or
+        `last_modified`.
+
+        Raises `httpx.HTTPError` when the sitemap can not be fetched.
+        """
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response: httpx.Response = await self.send(url, headers)
+        try:
+            if response.status_code != 304:
+                response.raise_for_status()
+            yield SitemapResponse(response, self.max_bytes)
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+sitemap_client: SitemapClient = SitemapClient(
+    timeout=settings.cloud.sitemap_timeout,
+    max_bytes=settings.cloud.sitemap_max_bytes,
+)
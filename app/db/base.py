@@ -3,6 +3,7 @@ from app.entities.core_audit_log.model import AuditLog
 from app.entities.core_geocoord.model import Geocoord
 from app.entities.core_ipaddress.model import Ipaddress
 from app.entities.core_ipaddress_geocoord.model import IpaddressGeocoord
+from app.entities.core_job.model import Job
 from app.entities.core_organization.model import Organization
 from app.entities.core_permission.model import Permission
 from app.entities.core_role.model import Role
@@ -35,6 +36,7 @@ from app.entities.website_go_gads.model import WebsiteGoAdsProperty
 from app.entities.website_keywordcorpus.model import WebsiteKeywordCorpus
 from app.entities.website_page.model import WebsitePage
 from app.entities.website_pagespeedinsight.model import WebsitePageSpeedInsights
+from app.entities.website_sitemap.model import WebsiteSitemap
 
 __all__: list[str] = [
     "Base",
@@ -62,6 +64,7 @@ __all__: list[str] = [
     "UserIpaddress",
     "AuditLog",
     "IpaddressGeocoord",
+    "Job",
     "Permission",
     "Role",
     "RolePermission",
@@ -72,6 +75,7 @@ __all__: list[str] = [
     "WebsiteKeywordCorpus",
     "WebsitePage",
     "WebsitePageSpeedInsights",
+    "WebsiteSitemap",
     "WebsiteGoAnalytics4Property",
     "WebsiteGoAdsProperty",
 ]
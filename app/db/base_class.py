@@ -1,9 +1,11 @@
 from datetime import datetime
+from typing import Any
 
 from sqlalchemy import DateTime
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from app.config import settings
 from app.utilities.dates_and_time import get_date
 
 
@@ -14,3 +16,17 @@ class Base(AsyncAttrs, DeclarativeBase):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=get_date, nullable=False, onupdate=get_date
     )
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        tablename: str | None = cls.__dict__.get("__tablename__")
+        if tablename is not None:
+            mapper_args: dict = {**cls.__dict__.get("__mapper_args__", {})}
+            # columns generated by the database are fetched in the INSERT/UPDATE
+            # (RETURNING where supported) instead of a SELECT after the commit
+            mapper_args.setdefault("eager_defaults", True)
+            # tables listed in DATABASE_NO_REFRESH_TABLES keep the rows already
+            # loaded in the identity map instead of overwriting them on every query
+            if tablename in settings.db.no_refresh_tables:
+                mapper_args["always_refresh"] = False
+            cls.__mapper_args__ = mapper_args
+        super().__init_subclass__(**kwargs)
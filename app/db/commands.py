@@ -23,6 +23,7 @@ from app.entities.organization_platform.schemas import OrganizationPlatformCreat
 from app.entities.platform.crud import PlatformRepository
 from app.entities.platform.model import Platform
 from app.entities.platform.schemas import PlatformCreate
+from app.entities.website_page.crud import WebsitePageRepository
 from app.services.clerk.settings import clerk_settings
 from app.services.permission.schemas import AclPrivilege
 
@@ -77,6 +78,22 @@ async def drop_db_tables() -> None:  # pragma: no cover
     logger.info("Database Tables Dropped")
 
 
+async def backfill_user_auth_id_hash() -> int:  # pragma: no cover
+    session: AsyncSession
+    async with async_session() as session:
+        user_repo: UserRepository = UserRepository(session)
+        count: int = await user_repo.backfill_auth_id_hash()
+    return count
+
+
+async def backfill_website_page_url_hash() -> int:  # pragma: no cover
+    session: AsyncSession
+    async with async_session() as session:
+        pages_repo: WebsitePageRepository = WebsitePageRepository(session)
+        count: int = await pages_repo.backfill_url_hash()
+    return count
+
+
 async def create_init_data() -> int:  # pragma: no cover
     i_count = 0
     session: AsyncSession
@@ -0,0 +1,122 @@
+import time
+from contextlib import AsyncExitStack
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.config import settings
+from app.core.logger import logger
+
+
+class PoolStats(BaseModel):
+    name: str
+    size: int = 0
+    checked_in: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    checkouts: int = 0
+    slow_checkouts: int = 0
+    checkout_total_ms: float = 0.0
+    checkout_max_ms: float = 0.0
+
+
+class PoolMetrics:
+    """Count connection checkouts of a pool and the time spent waiting on them.
+
+    The checkout time includes waiting for a free connection and opening a new
+    connection, checkouts slower than `slow_checkout_ms` are logged.
+    """
+
+    def __init__(self, name: str, slow_checkout_ms: float) -> None:
+        self.name: str = name
+        self.slow_checkout_ms: float = slow_checkout_ms
+        self.checkouts: int = 0
+        self.slow_checkouts: int = 0
+        self.checkout_total_ms: float = 0.0
+        self.checkout_max_ms: float = 0.0
+
+    def record_checkout(self, elapsed_ms: float) -> None:
+        self.checkouts += 1
+        self.checkout_total_ms += elapsed_ms
+        self.checkout_max_ms = max(self.checkout_max_ms, elapsed_ms)
+        if elapsed_ms > self.slow_checkout_ms:
+            self.slow_checkouts += 1
+            logger.warning(
+                "Slow database connection checkout from the {} pool: {:.1f}ms".format(
+                    self.name, elapsed_ms
+                )
+            )
+
+    def stats(self, pool: Pool | None = None) -> PoolStats:
+        stats: PoolStats = PoolStats(
+            name=self.name,
+            checkouts=self.checkouts,
+            slow_checkouts=self.slow_checkouts,
+            checkout_total_ms=round(self.checkout_total_ms, 3),
+            checkout_max_ms=round(self.checkout_max_ms, 3),
+        )
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.size = pool.size()
+            stats.checked_in = pool.checkedin()
+            stats.checked_out = pool.checkedout()
+            stats.overflow = pool.overflow()
+        return stats
+
+
+# checkout metrics of each pool, keyed by the pool logging name
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    if name not in pool_metrics:
+        pool_metrics[name] = PoolMetrics(
+            name=name, slow_checkout_ms=settings.db.pool_slow_checkout_ms
+        )
+    return pool_metrics[name]
+
+
+class MonitoredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """An async queue pool that records how long each checkout takes."""
+
+    def connect(self) -> Any:
+        start: float = time.perf_counter()
+        connection: Any = super().connect()
+        get_pool_metrics(self.logging_name or "default").record_checkout(
+            (time.perf_counter() - start) * 1000
+        )
+        return connection
+
+
+def get_pool_stats(engine: AsyncEngine) -> PoolStats:
+    pool: Pool = engine.pool
+    return get_pool_metrics(pool.logging_name or "default").stats(pool)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open connections up front so the first requests do not pay for them.
+
+    At most `pool_size` connections are opened, connections above the pool size
+    would be closed again when they are returned.
+    """
+    pool: Pool = engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        connections = min(connections, pool.size())
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            connection: Any = await stack.enter_async_context(engine.connect())
+            await connection.execute(text("SELECT 1"))
+    return max(connections, 0)
+
+
+__all__: list[str] = [
+    "MonitoredAsyncAdaptedQueuePool",
+    "PoolMetrics",
+    "PoolStats",
+    "get_pool_metrics",
+    "get_pool_stats",
+    "pool_metrics",
+    "warm_up_pool",
+]
@@ -1,9 +1,10 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+from itertools import cycle
 from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -11,18 +12,71 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import SingletonThreadPool
+from sqlalchemy.pool import QueuePool, SingletonThreadPool
+from sqlalchemy.sql.dml import UpdateBase
 
-from app.config import ApiModes, settings
+from app.config import settings
 from app.core.logger import logger
+from app.db.pool import MonitoredAsyncAdaptedQueuePool
+
+
+def engine_options() -> dict[str, Any]:
+    return {
+        "echo": settings.db.echo,
+        "pool_pre_ping": settings.db.pool_pre_ping,
+        "pool_recycle": settings.db.pool_recycle,
+        "query_cache_size": settings.db.statement_cache_size,
+    }
+
+
+def queue_pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.db.pool_size,
+        "max_overflow": settings.db.pool_max_overflow,
+        "pool_timeout": settings.db.pool_timeout,
+    }
+
+
+def use_sqlite_transactions(engine: Engine) -> None:
+    """Let SQLAlchemy open the transactions of pysqlite connections.
+
+    The driver only emits BEGIN before a write, so a savepoint taken before the
+    first write would commit on RELEASE. Turn the driver transactions off and
+    emit BEGIN when SQLAlchemy begins one, following the pysqlite recipe. The
+    reads of a transaction then hold their locks, the WAL journal keeps them
+    from blocking the writes of other connections.
+    """
+    if engine.dialect.name != "sqlite":  # pragma: no cover
+        return
+
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+        cursor: Any = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def do_begin(connection: Any) -> None:
+        connection.exec_driver_sql("BEGIN")
+
 
 # Session
-engine: Engine = create_engine(
-    url=settings.db.uri,
-    pool_pre_ping=True,
-    poolclass=SingletonThreadPool,
-    echo=settings.api.mode == ApiModes.development.value,
-)
+engine: Engine
+if make_url(settings.db.uri).get_backend_name() == "sqlite":
+    # sqlite connections can not be shared across threads
+    engine = create_engine(
+        url=settings.db.uri, poolclass=SingletonThreadPool, **engine_options()
+    )
+else:  # pragma: no cover
+    engine = create_engine(
+        url=settings.db.uri,
+        poolclass=QueuePool,
+        **engine_options(),
+        **queue_pool_options(),
+    )
+
+use_sqlite_transactions(engine)
 
 session: sessionmaker[Session] = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
@@ -31,19 +85,119 @@ session: sessionmaker[Session] = sessionmaker(
 # Async Session
 async_engine: AsyncEngine = create_async_engine(
     url=settings.db.uri_async,
-    echo=settings.api.mode == ApiModes.development.value,
+    poolclass=MonitoredAsyncAdaptedQueuePool,
+    pool_logging_name="primary",
+    **engine_options(),
+    **queue_pool_options(),
+)
+use_sqlite_transactions(async_engine.sync_engine)
+
+# Read Replicas
+replica_engines: list[AsyncEngine] = [
+    create_async_engine(
+        url=uri,
+        poolclass=MonitoredAsyncAdaptedQueuePool,
+        pool_logging_name=f"replica_{i}",
+        **engine_options(),
+        **queue_pool_options(),
+    )
+    for i, uri in enumerate(settings.db.replica_uris_async)
+]
+for replica_engine in replica_engines:
+    use_sqlite_transactions(replica_engine.sync_engine)
+_replica_cycle = cycle(replica_engines)
+
+UNIT_OF_WORK_KEY: str = "unit_of_work"
+AFTER_COMMIT_KEY: str = "after_commit"
+REPLICA_KEY: str = "replica"
+WRITTEN_KEY: str = "written"
+
+
+def next_replica_engine() -> AsyncEngine | None:
+    """The next read replica engine, round robin, or `None` without replicas."""
+    return next(_replica_cycle, None)
+
+
+class RoutingSession(Session):
+    """Route the statements of a session with a replica to the replica.
+
+    The first write of the session, and every statement after it, goes to the
+    primary so the session reads its own writes.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[WRITTEN_KEY] = True
+        replica: AsyncEngine | None = self.info.get(REPLICA_KEY)
+        if replica is not None and not self.info.get(WRITTEN_KEY):
+            return replica.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+async_session: Any = async_sessionmaker(
+    async_engine, sync_session_class=RoutingSession, expire_on_commit=False
 )
 
-async_session: Any = async_sessionmaker(async_engine, expire_on_commit=False)
+
+def has_written(session: AsyncSession) -> bool:
+    return bool(session.info.get(WRITTEN_KEY, False))
+
+
+def read_from_primary(session: AsyncSession) -> bool:
+    """Route the following statements of the session to the primary.
+
+    Returns whether the session was reading from a replica, so a read that
+    missed on a lagging replica can be repeated on the primary.
+    """
+    return session.info.pop(REPLICA_KEY, None) is not None
+
+
+def is_unit_of_work(session: AsyncSession) -> bool:
+    return bool(session.info.get(UNIT_OF_WORK_KEY, False))
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Run the callback once the writes of the session are committed.
+
+    Outside of a unit of work every write commits on its own, so the callback
+    runs right away.
+    """
+    if not is_unit_of_work(session):
+        callback()
+        return
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def commit_session(session: AsyncSession) -> None:
+    """Commit the session and run the callbacks waiting for the commit."""
+    await session.commit()
+    for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+        callback()
 
 
 @asynccontextmanager
-async def get_db_session() -> AsyncGenerator[AsyncSession, Any]:
+async def get_db_session(
+    unit_of_work: bool = False,
+    read_only: bool = False,
+) -> AsyncGenerator[AsyncSession, Any]:
+    """Open an async session.
+
+    In a unit of work repository writes only flush, the session commits once
+    when the context exits and rolls back if an exception is raised.
+
+    A read only session reads from the next read replica, when replicas are
+    configured, until it writes.
+    """
     session: AsyncSession
     async with async_session() as session:
+        session.info[UNIT_OF_WORK_KEY] = unit_of_work
+        if read_only:
+            session.info[REPLICA_KEY] = next_replica_engine()
         try:
             session.begin()
             yield session
+            if unit_of_work:
+                await commit_session(session)
         except Exception as e:  # pragma: no cover
             logger.warning(e)
             await session.rollback()
@@ -1,11 +1,14 @@
+import time
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.db.session import get_db_session
+from app.core.loader import EntityLoader, enable_entity_loader
+from app.core.logger import logger
+from app.db.session import get_db_session, has_written, replica_engines
 
 
 async def verify_content_length(content_length: int = Header(...)) -> None:
@@ -26,9 +29,49 @@ async def verify_content_type(content_type: str = Header(...)) -> None:
     return None
 
 
-async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
-    async with get_db_session() as session:
+PRIMARY_UNTIL_SESSION_KEY: str = "db_primary_until"
+REPLICA_SAFE_METHODS: tuple[str, ...] = ("GET", "HEAD")
+
+
+def reads_from_replica(request: Request | None) -> bool:
+    """Whether the request may read from a replica.
+
+    Only safe methods read from a replica, and not for the replica lag tolerance
+    after the same client wrote, so the client reads its own writes.
+    """
+    if request is None or request.method not in REPLICA_SAFE_METHODS:
+        return False
+    if "session" in request.scope:
+        primary_until: float = request.session.get(PRIMARY_UNTIL_SESSION_KEY, 0)
+        return primary_until < time.time()
+    return True
+
+
+async def get_async_db(
+    request: Request = None,  # type: ignore[assignment]
+) -> AsyncGenerator[AsyncSession, None]:
+    async with get_db_session(
+        unit_of_work=settings.db.unit_of_work,
+        read_only=reads_from_replica(request),
+    ) as session:
+        # repository reads by id are batched and memoized for this request
+        loader: EntityLoader = enable_entity_loader(session)
         yield session
+        stats = loader.stats()
+        logger.debug(
+            "Entity loader hits={} misses={} batches={}".format(
+                stats.hits, stats.misses, stats.batches
+            )
+        )
+        if (
+            len(replica_engines) > 0
+            and request is not None
+            and "session" in request.scope
+            and has_written(session)
+        ):
+            request.session[PRIMARY_UNTIL_SESSION_KEY] = (
+                time.time() + settings.db.replica_lag_tolerance
+            )
 
 
 AsyncDatabaseSession = Annotated[AsyncSession, Depends(get_async_db)]
@@ -1,16 +1,20 @@
-from typing import Generic, TypeVar
+from collections.abc import Sequence
+from typing import Any, Generic, TypeVar
 
 from fastapi import status
 from pydantic import UUID4, BaseModel
-from sqlalchemy import Select
+from sqlalchemy import ColumnElement, Select
+from sqlalchemy.sql.base import ExecutableOption
 
+from app.core.crud import BaseRepository
 from app.core.pagination import PageParams, Paginated, paginated_query
 from app.db.base_class import Base
 from app.entities.api.dependencies import AsyncDatabaseSession
+from app.entities.api.errors import EntityNotFound
 from app.entities.core_organization.crud import OrganizationRepository
 from app.entities.core_user.crud import UserRepository
 from app.entities.core_user.model import User
-from app.entities.core_user.schemas import UserUpdatePrivileges
+from app.entities.core_user.schemas import UserAccessGraph, UserUpdatePrivileges
 from app.entities.core_user_organization.crud import UserOrganizationRepository
 from app.services.permission import (
     ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS,
@@ -53,6 +57,48 @@ class PermissionController(Generic[T]):
         self.organization_repo = OrganizationRepository(db)
         self.user_organization_repo = UserOrganizationRepository(db)
 
+    def has_privileged_access(self, privileges: list[AclPrivilege] = []) -> bool:
+        # admins can access all resources
+        if self.current_user.is_superuser or RoleAdmin in self.privileges:
+            return True
+        # current user with these privileges can access
+        for perm in privileges:
+            if perm in self.privileges:
+                return True
+        return False
+
+    async def read_if_accessible(
+        self,
+        repository: BaseRepository,
+        entry_id: UUID4,
+        access: ColumnElement[bool],
+        entity_info: str,
+        privileges: list[AclPrivilege] = [],
+        options: Sequence[ExecutableOption] = (),
+    ) -> Any:
+        """Read a resource by id and check the current user can access it, in a
+        single query.
+
+        Raises `EntityNotFound` when the resource does not exist, and denies
+        access the same as `verify_user_can_access` when the access condition
+        does not hold.
+        """
+        entry: Any | None
+        has_access: bool
+        entry, has_access = await repository.read_with_access(
+            entry_id=entry_id,
+            access=None if self.has_privileged_access(privileges) else access,
+            options=options,
+        )
+        if entry is None:
+            raise EntityNotFound(entity_info=entity_info)
+        if not has_access:
+            raise AuthPermissionException(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                message=ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS,
+            )
+        return entry
+
     async def verify_user_can_access(
         self,
         privileges: list[AclPrivilege] = [],
@@ -61,18 +107,25 @@ class PermissionController(Generic[T]):
         platform_id: UUID4 | None = None,
         website_id: UUID4 | None = None,
     ) -> bool:
-        # admins can access all resources
-        if self.current_user.is_superuser or RoleAdmin in self.privileges:
+        # admins and users with these privileges can access all resources
+        if self.has_privileged_access(privileges):
             return True
-        # current user with these privileges can access
-        for perm in privileges:
-            if perm in self.privileges:
-                return True
         # current user can access their own resources
         if user_id and user_id == self.current_user.id:
             return True
-        # count the current user relationships with resource
-        users_access: int = await self.user_repo.verify_relationship(
+        # check the cached organization memberships of the current user
+        access_graph: UserAccessGraph = await self.user_repo.read_access_graph(
+            self.current_user.id
+        )
+        if access_graph.can_access(
+            user_id=user_id,
+            organization_id=organization_id,
+            platform_id=platform_id,
+            website_id=website_id,
+        ):
+            return True
+        # confirm with the database before denying access
+        users_access: bool = await self.user_repo.verify_relationship(
             current_user_id=self.current_user.id,
             user_id=user_id,
             organization_id=organization_id,
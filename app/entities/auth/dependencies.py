@@ -4,6 +4,7 @@ from fastapi import Depends, HTTPException, Security, status
 
 from app.core.logger import logger
 from app.db.constants import DB_STR_USER_PICTURE_DEFAULT
+from app.db.session import commit_session, read_from_primary
 from app.entities.api.dependencies import AsyncDatabaseSession
 from app.entities.auth.constants import (
     ERROR_MESSAGE_UNAUTHORIZED,
@@ -57,11 +58,14 @@ async def get_current_user(
             detail=ERROR_MESSAGE_UNVERIFIED_ACCESS_DENIED,
         )
     users_repo: UserRepository = UserRepository(session=db)
-    current_user: User | None = await users_repo.read_by(
-        field_name="auth_id", field_value=auth_user.auth_id
-    )
+    current_user: User | None = await users_repo.read_by_auth_id(auth_user.auth_id)
+    if current_user is None and read_from_primary(db):
+        # the user may not be replicated yet, never create it twice
+        current_user = await users_repo.read_by_auth_id(auth_user.auth_id)
+    # the clerk user may be shared through the token cache, do not mutate it
+    is_verified: bool = auth_user.is_verified or False
     if auth_user.auth_id == clerk_settings.first_user_unverified_auth_id:
-        auth_user.is_verified = False
+        is_verified = False
     # auth_scopes = get_acl_scope_list(auth_user.roles, auth_user.permissions)
     if not current_user:
         new_username = auth_user.username or auth_user.email.split("@")[0]
@@ -73,20 +77,25 @@ async def get_current_user(
                 picture=auth_user.picture or DB_STR_USER_PICTURE_DEFAULT,
                 scopes=[RoleUser],
                 is_active=True,
-                is_verified=auth_user.is_verified or False,
+                is_verified=is_verified,
                 is_superuser=False,
             )
         )
         logger.info(f"Created user: {current_user.id}")
-    else:
+        users_repo.cache_user(current_user)
+    elif current_user.is_verified != is_verified:
+        # only write the user when the verified state changed
         current_user = await users_repo.update(
             entry=current_user,
-            schema=UserUpdateAsManager(is_verified=auth_user.is_verified or False),
+            schema=UserUpdateAsManager(is_verified=is_verified),
         )
         if current_user:
+            users_repo.cache_user(current_user)
             logger.info(f"Updated user: {current_user.id}")
 
     if current_user.is_verified is False:
+        # keep the unverified state, the request is rejected and would roll back
+        await commit_session(db)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=ERROR_MESSAGE_UNVERIFIED_ACCESS_DENIED,
@@ -13,3 +13,7 @@ class IpaddressRepository(
     @property
     def _table(self) -> Ipaddress:
         return Ipaddress
+
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        return ("address",)
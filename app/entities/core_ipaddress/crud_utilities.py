@@ -2,6 +2,7 @@ from pydantic import UUID4
 from pydantic.networks import IPvAnyAddress
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.logger import logger
 from app.db.session import get_db_session
 from app.entities.core_ipaddress.crud import IpaddressRepository
@@ -11,6 +12,10 @@ from app.entities.core_ipaddress.schemas import (
     IpaddressRead,
     IpinfoResponse,
 )
+from app.entities.core_ipaddress.utilities import (
+    IpaddressDetailsLookup,
+    get_ipinfo_details,
+)
 from app.entities.core_user_ipaddress.crud import UserIpaddressRepository
 from app.entities.core_user_ipaddress.model import UserIpaddress
 from app.entities.core_user_ipaddress.schemas import UserIpaddressCreate
@@ -33,47 +38,49 @@ async def get_ipaddress_from_db(ip: IPvAnyAddress) -> Ipaddress | None:
         return None
 
 
-async def create_or_update_ipaddress(
-    ip: IPvAnyAddress, ip_details: IpinfoResponse
+async def fetch_ipaddress_details(ip: str) -> IpinfoResponse | None:
+    """The details of an ip address already in the database, or from ipinfo.io."""
+    ip_in_db: Ipaddress | None = await get_ipaddress_from_db(ip)
+    if ip_in_db is not None:
+        return IpinfoResponse.model_validate(ip_in_db)
+    return await get_ipinfo_details(ip)
+
+
+# cached, single flight lookups of the details of ip addresses
+ipaddress_details_lookup: IpaddressDetailsLookup = IpaddressDetailsLookup(
+    fetch=fetch_ipaddress_details,
+    maxsize=settings.cloud.ipinfo_cache_maxsize,
+    ttl=settings.cloud.ipinfo_cache_ttl,
+    negative_ttl=settings.cloud.ipinfo_negative_cache_ttl,
+)
+
+
+async def upsert_user_ipaddress(
+    ip: IPvAnyAddress | str, user_id: UUID4, ip_details: IpinfoResponse
 ) -> Ipaddress | None:
-    try:
-        fetch_ip: Ipaddress | None = None
-        session: AsyncSession
-        ip_repo: IpaddressRepository
-        async with get_db_session() as session:
-            ip_repo = IpaddressRepository(session)
-            fetch_ip = await ip_repo.read_by(
-                field_name="address",
-                field_value=str(ip),
-            )
-            if fetch_ip is None:
-                fetch_ip = await ip_repo.create(
-                    schema=IpaddressCreate(
-                        address=str(ip),
-                        hostname=ip_details.hostname,
-                        is_anycast=ip_details.is_anycast,
-                        city=ip_details.city,
-                        region=ip_details.region,
-                        country=ip_details.country,
-                        loc=ip_details.loc,
-                        org=ip_details.org,
-                        postal=ip_details.postal,
-                        timezone=ip_details.timezone,
-                        country_name=ip_details.country_name,
-                        is_eu=ip_details.is_eu,
-                        country_flag_url=ip_details.country_flag_url,
-                        country_flag_unicode=ip_details.country_flag_unicode,
-                        country_currency_code=ip_details.country_currency_code,
-                        continent_code=ip_details.continent_code,
-                        continent_name=ip_details.continent_name,
-                        latitude=ip_details.latitude,
-                        longitude=ip_details.longitude,
-                    )
+    """Upsert the ip address and assign it to the user in one transaction."""
+    session: AsyncSession
+    async with get_db_session(unit_of_work=True) as session:
+        ip_repo: IpaddressRepository = IpaddressRepository(session)
+        await ip_repo.upsert_many(
+            [
+                IpaddressCreate(
+                    **ip_details.model_dump(exclude={"address"}),
+                    address=str(ip),
                 )
-        return fetch_ip
-    except Exception as e:  # pragma: no cover
-        logger.warning("Error creating or updating IpAddress: %s" % e)
-        return None
+            ]
+        )
+        ipaddress: Ipaddress | None = await ip_repo.read_by(
+            field_name="address",
+            field_value=str(ip),
+        )
+        if ipaddress is None:  # pragma: no cover
+            return None
+        await UserIpaddressRepository(session).upsert_many(
+            [UserIpaddressCreate(user_id=user_id, ipaddress_id=ipaddress.id)]
+        )
+    logger.info(f"User({user_id}) assigned IP({ip}) to their account.")
+    return ipaddress
 
 
 async def assign_ip_address_to_user(
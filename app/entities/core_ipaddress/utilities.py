@@ -1,13 +1,46 @@
+from collections.abc import Awaitable, Callable
+
 from ipinfo.details import Details
+from ipinfo.handler_utils import format_details
 from pydantic.networks import IPvAnyAddress
 
+from app.core.cache import MonitoredTTLCache, SingleFlight
+from app.core.geoip import IpRangeIndex, get_ip_range_index
 from app.core.ipinfo import ipinfo_handler
+from app.core.logger import logger
 from app.entities.core_ipaddress.schemas import IpinfoResponse
 
 
-def get_ipinfo_details(ip_address: IPvAnyAddress) -> IpinfoResponse:
-    ip_data: Details = ipinfo_handler.getDetails(ip_address)
-    ip_datails: dict = ip_data.details
+async def get_ipinfo_details(ip_address: IPvAnyAddress | str) -> IpinfoResponse:
+    """The details of an ip address from the local ip range index, when one is
+    configured and has the address, or else from ipinfo.io."""
+    ip_range_index: IpRangeIndex | None = get_ip_range_index()
+    if ip_range_index is not None:
+        record: dict | None = ip_range_index.lookup(str(ip_address))
+        if record is not None:
+            return parse_ipinfo_details(format_ip_range_details(ip_address, record))
+    ip_data: Details = await ipinfo_handler.getDetails(str(ip_address))
+    return parse_ipinfo_details(ip_data.details)
+
+
+def format_ip_range_details(ip_address: IPvAnyAddress | str, record: dict) -> dict:
+    """Complete the record of an ip range like the ipinfo handler formats a
+    response, adding the country name, flag, currency and continent."""
+    details: dict = {"ip": str(ip_address), **record}
+    if "loc" not in details and "latitude" in record and "longitude" in record:
+        details["loc"] = "{},{}".format(record["latitude"], record["longitude"])
+    format_details(
+        details,
+        ipinfo_handler.countries,
+        ipinfo_handler.eu_countries,
+        ipinfo_handler.countries_flags,
+        ipinfo_handler.countries_currencies,
+        ipinfo_handler.continents,
+    )
+    return {k: v for k, v in details.items() if v is not None}
+
+
+def parse_ipinfo_details(ip_datails: dict) -> IpinfoResponse:
     country_flag_unicode_value: dict = ip_datails.get(
         "country_flag", dict(unicode=None)
     )
@@ -37,3 +70,58 @@ def get_ipinfo_details(ip_address: IPvAnyAddress) -> IpinfoResponse:
         latitude=ip_datails.get("latitude", None),
         longitude=ip_datails.get("longitude", None),
     )
+
+
+class IpaddressDetailsLookup:
+    """Look up the details of ip addresses, at most one lookup per address.
+
+    Found details are kept in an LRU cache for `ttl` seconds and failed lookups
+    are remembered for `negative_ttl` seconds, concurrent lookups of the same
+    address share the one in flight. The error of a failed fetch is raised to
+    the lookups sharing it, later lookups of the address return None until the
+    failure expires, or look it up again with `retry_failed`.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[IpinfoResponse | None]],
+        maxsize: int = 10000,
+        ttl: float = 86400,
+        negative_ttl: float = 300,
+    ) -> None:
+        self.fetch: Callable[[str], Awaitable[IpinfoResponse | None]] = fetch
+        self.cache: MonitoredTTLCache[str, IpinfoResponse] = MonitoredTTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+        self.failures: MonitoredTTLCache[str, bool] = MonitoredTTLCache(
+            maxsize=maxsize, ttl=negative_ttl
+        )
+        self._lookups: SingleFlight[str, IpinfoResponse | None] = SingleFlight()
+
+    async def _fetch(self, ip_address: str) -> IpinfoResponse | None:
+        try:
+            details: IpinfoResponse | None = await self.fetch(ip_address)
+        except Exception as e:
+            logger.warning(f"Error fetching IP Details: {ip_address}: {e}")
+            self.failures[ip_address] = True
+            raise
+        if details is None:
+            self.failures[ip_address] = True
+        else:
+            self.cache[ip_address] = details
+        return details
+
+    async def lookup(
+        self, ip_address: IPvAnyAddress | str, retry_failed: bool = False
+    ) -> IpinfoResponse | None:
+        key: str = str(ip_address)
+        details: IpinfoResponse | None = self.cache.lookup(key)
+        if details is not None:
+            return details
+        if not retry_failed and self.failures.get(key, False):
+            return None
+        return await self._lookups.do(key, lambda: self._fetch(key))
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.failures.clear()
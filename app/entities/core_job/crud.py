@@ -0,0 +1,200 @@
+from datetime import timedelta
+from typing import Any
+
+from pydantic import UUID4
+from sqlalchemy import and_, or_, update
+from sqlalchemy import select as sql_select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.crud import BaseRepository
+from app.entities.core_job.model import Job
+from app.entities.core_job.schemas import (
+    JobCreate,
+    JobRead,
+    JobStatus,
+    JobUpdate,
+)
+from app.utilities.dates_and_time import get_date
+
+
+class JobRepository(BaseRepository[JobCreate, JobRead, JobUpdate, Job]):
+    """The persistent job queue.
+
+    State changes are conditional updates that check the affected row count,
+    a worker only changes a job it still holds the lease of, so every
+    operation is safe with many workers polling the same table.
+    """
+
+    @property
+    def _table(self) -> Job:
+        return Job
+
+    async def read_active(self, idempotency_key: str) -> Job | None:
+        return await self._get(sql_select(Job).where(Job.active_key == idempotency_key))
+
+    async def read_latest(self, idempotency_key: str) -> Job | None:
+        return await self._get(
+            sql_select(Job)
+            .where(Job.idempotency_key == idempotency_key)
+            .order_by(Job.created_at.desc())
+            .limit(1)
+        )
+
+    async def enqueue(self, schema: JobCreate) -> tuple[Job, bool]:
+        """Queue a job unless a job with the same idempotency key is active.
+
+        Returns the job and whether it was created, the queued or running job
+        of the key is returned when the key is already active. Inside a unit of
+        work the job is only flushed and commits with the session.
+        """
+        if schema.idempotency_key is not None:
+            active: Job | None = await self.read_active(schema.idempotency_key)
+            if active is not None:
+                return active, False
+            schema.active_key = schema.idempotency_key
+        values: dict[str, Any] = schema.model_dump(exclude_none=True)
+        job: Job = Job(**values)
+        try:
+            # a savepoint keeps the other writes of the session on a conflict
+            async with self._db.begin_nested():
+                self._db.add(job)
+        except IntegrityError:
+            # another request queued the same key first
+            active = await self.read_active(schema.idempotency_key or "")
+            if active is None:  # pragma: no cover
+                raise
+            return active, False
+        await self._commit()
+        return job, True
+
+    async def claim(
+        self, worker_id: str, limit: int, lease_seconds: float
+    ) -> list[Job]:
+        """Lease up to `limit` jobs that are due or whose lease has expired."""
+        now = get_date()
+        claimable = or_(
+            and_(Job.status == JobStatus.queued.value, Job.run_after <= now),
+            and_(Job.status == JobStatus.running.value, Job.lease_expires_at < now),
+        )
+        candidates: list[tuple[UUID4, int]] = list(
+            (
+                await self._db.execute(
+                    sql_select(Job.id, Job.attempts)
+                    .where(claimable)
+                    .order_by(Job.run_after)
+                    .limit(limit * 2)
+                )
+            ).all()
+        )
+        claimed: list[UUID4] = []
+        for job_id, attempts in candidates:
+            if len(claimed) >= limit:
+                break
+            # compare and swap on the attempt count, a concurrent worker that
+            # claimed the job first has already incremented it
+            cursor: Any = await self._db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.attempts == attempts, claimable)
+                .values(
+                    status=JobStatus.running.value,
+                    attempts=attempts + 1,
+                    locked_by=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    heartbeat_at=now,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if cursor.rowcount == 1:
+                claimed.append(job_id)
+        await self._db.commit()
+        if not claimed:
+            return []
+        jobs: list[Job] = list(
+            (
+                await self._db.scalars(
+                    sql_select(Job).where(Job.id.in_(claimed)).order_by(Job.run_after)
+                )
+            ).all()
+        )
+        return jobs
+
+    async def _update_leased(
+        self, job_id: UUID4, worker_id: str, **values: Any
+    ) -> bool:
+        cursor: Any = await self._db.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.locked_by == worker_id,
+                Job.status == JobStatus.running.value,
+            )
+            .values(updated_at=get_date(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        await self._db.commit()
+        return cursor.rowcount == 1
+
+    async def heartbeat(
+        self,
+        job_id: UUID4,
+        worker_id: str,
+        lease_seconds: float,
+        result: Any | None = None,
+    ) -> bool:
+        """Extend the lease of a running job, False once the lease was lost."""
+        now = get_date()
+        values: dict[str, Any] = {
+            "heartbeat_at": now,
+            "lease_expires_at": now + timedelta(seconds=lease_seconds),
+        }
+        if result is not None:
+            values["result"] = result
+        return await self._update_leased(job_id, worker_id, **values)
+
+    async def complete(
+        self, job_id: UUID4, worker_id: str, result: Any | None = None
+    ) -> bool:
+        return await self._update_leased(
+            job_id,
+            worker_id,
+            status=JobStatus.succeeded.value,
+            active_key=None,
+            locked_by=None,
+            lease_expires_at=None,
+            finished_at=get_date(),
+            result=result,
+        )
+
+    async def fail(
+        self,
+        job: Job,
+        worker_id: str,
+        error: str,
+        retry_delay: float,
+        result: Any | None = None,
+    ) -> bool:
+        """Queue the job again after `retry_delay`, or fail it for good once its
+        attempts are exhausted."""
+        if job.attempts < job.max_attempts:
+            return await self._update_leased(
+                job.id,
+                worker_id,
+                status=JobStatus.queued.value,
+                locked_by=None,
+                lease_expires_at=None,
+                run_after=get_date() + timedelta(seconds=retry_delay),
+                last_error=error,
+                result=result,
+            )
+        return await self._update_leased(
+            job.id,
+            worker_id,
+            status=JobStatus.failed.value,
+            active_key=None,
+            locked_by=None,
+            lease_expires_at=None,
+            finished_at=get_date(),
+            last_error=error,
+            result=result,
+        )
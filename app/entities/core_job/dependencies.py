@@ -0,0 +1,26 @@
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import Depends
+
+from app.entities.api.dependencies import AsyncDatabaseSession
+from app.entities.api.errors import EntityNotFound
+from app.entities.core_job.crud import JobRepository
+from app.entities.core_job.model import Job
+from app.utilities import parse_id
+
+
+async def get_job_or_404(
+    db: AsyncDatabaseSession,
+    job_id: Any,
+) -> Job | None:
+    """Parses uuid/int and fetches job by id."""
+    parsed_id: UUID = parse_id(job_id)
+    job_repo: JobRepository = JobRepository(session=db)
+    job: Job | None = await job_repo.read(parsed_id)
+    if job is None:
+        raise EntityNotFound(entity_info="Job {}".format(parsed_id))
+    return job
+
+
+FetchJobOr404 = Annotated[Job, Depends(get_job_or_404)]
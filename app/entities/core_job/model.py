@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from pydantic import UUID4
+from sqlalchemy import JSON, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy_utils import JSONType, UUIDType
+
+from app.db.base_class import Base
+from app.db.constants import DB_STR_64BIT_MAXLEN_INPUT, DB_STR_TINYTEXT_MAXLEN_INPUT
+from app.services.permission import (
+    AccessRead,
+    AclAction,
+    AclPermission,
+    AclPrivilege,
+    RoleUser,
+)
+from app.utilities.dates_and_time import get_date
+from app.utilities.uuids import get_uuid
+
+
+class Job(Base):
+    __tablename__: str = "job"
+    __table_args__: dict = {"mysql_engine": "InnoDB"}
+    __mapper_args__: dict = {"always_refresh": True}
+    id: Mapped[UUID4] = mapped_column(
+        UUIDType(binary=False),
+        index=True,
+        unique=True,
+        primary_key=True,
+        nullable=False,
+        default=get_uuid,
+    )
+    name: Mapped[str] = mapped_column(
+        String(DB_STR_64BIT_MAXLEN_INPUT), nullable=False, index=True
+    )
+    payload: Mapped[JSON] = mapped_column(JSONType(), nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(
+        String(DB_STR_64BIT_MAXLEN_INPUT), nullable=False, index=True, default="queued"
+    )
+    # the caller supplied key of the work, kept after the job finished
+    idempotency_key: Mapped[str | None] = mapped_column(
+        String(DB_STR_TINYTEXT_MAXLEN_INPUT), nullable=True, index=True
+    )
+    # the idempotency key while the job is queued or running, the unique index
+    # rejects a second active job for the same key
+    active_key: Mapped[str | None] = mapped_column(
+        String(DB_STR_TINYTEXT_MAXLEN_INPUT), nullable=True, unique=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, index=True, default=get_date
+    )
+    locked_by: Mapped[str | None] = mapped_column(
+        String(DB_STR_64BIT_MAXLEN_INPUT), nullable=True
+    )
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    result: Mapped[JSON | None] = mapped_column(JSONType(), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    user_id: Mapped[UUID4 | None] = mapped_column(
+        UUIDType(binary=False), nullable=True, index=True
+    )
+
+    def __acl__(
+        self,
+    ) -> list[tuple[AclAction, AclPrivilege, AclPermission]]:  # pragma: no cover
+        return [
+            # read
+            (AclAction.allow, RoleUser, AccessRead),
+        ]
+
+    def __repr__(self) -> str:  # pragma: no cover
+        repr_str: str = f"Job({self.name}, {self.status}, attempt {self.attempts} of {self.max_attempts})"
+        return repr_str
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends
+
+from app.entities.api.dependencies import get_async_db
+from app.entities.auth.dependencies import (
+    Permission,
+    PermissionController,
+    get_current_user,
+    get_permission_controller,
+)
+from app.entities.core_job.dependencies import get_job_or_404
+from app.entities.core_job.model import Job
+from app.entities.core_job.schemas import JobRead
+from app.services.permission import AccessRead, RoleAdmin, RoleManager
+
+router: APIRouter = APIRouter()
+
+
+@router.get(
+    "/{job_id}",
+    name="jobs:read",
+    dependencies=[
+        Depends(get_async_db),
+        Depends(get_job_or_404),
+        Depends(get_current_user),
+        Depends(get_permission_controller),
+    ],
+    response_model=JobRead,
+)
+async def jobs_read(
+    job: Job = Permission(AccessRead, get_job_or_404),
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> JobRead:
+    """Retrieve the status of a queued job by id.
+
+    Permissions:
+    ------------
+    `role=admin|manager` : all jobs
+
+    `role=user` : only jobs queued by the user, or by users associated with the
+        same organizations via `user_organization` table
+
+    Returns:
+    --------
+    `JobRead` : the status, attempts and result of the job
+
+    """
+    await permissions.verify_user_can_access(
+        privileges=[RoleAdmin, RoleManager],
+        user_id=job.user_id,
+    )
+    return JobRead.model_validate(job)
@@ -0,0 +1,47 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import UUID4
+
+from app.core.schema import BaseSchema, BaseSchemaRead
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+# a job holds its active key while it is in one of these states
+JOB_ACTIVE_STATUSES: tuple[JobStatus, ...] = (JobStatus.queued, JobStatus.running)
+
+
+class JobBase(BaseSchema):
+    name: str
+    payload: dict[str, Any]
+    idempotency_key: str | None = None
+    max_attempts: int = 3
+    user_id: UUID4 | None = None
+
+
+class JobCreate(JobBase):
+    active_key: str | None = None
+    run_after: datetime | None = None
+
+
+class JobUpdate(BaseSchema):
+    # jobs change state through the queue operations of the repository
+    pass
+
+
+class JobRead(JobBase, BaseSchemaRead):
+    id: UUID4
+    status: JobStatus
+    attempts: int
+    run_after: datetime
+    heartbeat_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: Any | None = None
+    last_error: str | None = None
@@ -10,14 +10,16 @@ from app.entities.core_organization.schemas import (
     OrganizationRead,
     OrganizationUpdate,
 )
+from app.entities.core_user.crud import AccessGraphInvalidation
 from app.entities.core_user.model import User
 from app.entities.core_user_organization.model import UserOrganization
 
 
 class OrganizationRepository(
+    AccessGraphInvalidation,
     BaseRepository[
         OrganizationCreate, OrganizationRead, OrganizationUpdate, Organization
-    ]
+    ],
 ):
     @property
     def _table(self) -> Organization:
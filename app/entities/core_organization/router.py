@@ -1,4 +1,5 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends
+from pydantic import UUID4
 from sqlalchemy import Select
 
 from app.api.get_query import CommonUserQueryParams, GetUserQueryParams
@@ -67,6 +68,7 @@ from app.services.permission import (
     RoleUser,
 )
 from app.tasks.background import bg_task_request_to_delete_organization
+from app.tasks.queue import enqueue_job
 
 router: APIRouter = APIRouter()
 
@@ -112,7 +114,12 @@ async def organizations_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=Organization.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleAdmin: OrganizationRead,
             RoleManager: OrganizationRead,
@@ -156,7 +163,12 @@ async def organizations_list_public(
     ] = await permissions.get_paginated_resource_response(
         table_name=Organization.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleUser: OrganizationReadPublic,
         },
@@ -175,7 +187,6 @@ async def organizations_list_public(
     response_model=OrganizationRead,
 )
 async def organizations_create(
-    bg_tasks: BackgroundTasks,
     organization_in: OrganizationCreate,
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> OrganizationRead:
@@ -405,7 +416,6 @@ async def organizations_update_style_guide(
     response_model=OrganizationDelete,
 )
 async def organizations_delete(
-    bg_tasks: BackgroundTasks,
     organization: Organization = Permission(
         [AccessDelete, AccessDeleteSelf], get_organization_or_404
     ),
@@ -429,6 +439,7 @@ async def organizations_delete(
         privileges=[RoleAdmin], organization_id=organization.id
     )
     output_message: str
+    job_id: UUID4 | None = None
     if RoleAdmin in permissions.privileges:
         organizations_repo: OrganizationRepository = OrganizationRepository(
             session=permissions.db
@@ -436,16 +447,23 @@ async def organizations_delete(
         await organizations_repo.delete(entry=organization)
         output_message = "Organization deleted"
     else:
-        bg_tasks.add_task(
+        job, _ = await enqueue_job(
             bg_task_request_to_delete_organization,
-            user_id=str(permissions.current_user.id),
-            organization_id=str(organization.id),
+            payload={
+                "user_id": str(permissions.current_user.id),
+                "organization_id": str(organization.id),
+            },
+            idempotency_key=f"delete-organization:{organization.id}",
+            user_id=permissions.current_user.id,
+            session=permissions.db,
         )
+        job_id = job.id
         output_message = "Organization requested to be deleted"
     return OrganizationDelete(
         message=output_message,
         user_id=permissions.current_user.id,
         organization_id=organization.id,
+        job_id=job_id,
     )
 
 
@@ -52,3 +52,4 @@ class OrganizationDelete(BaseSchema):
     message: str
     user_id: UUID4
     organization_id: UUID4
+    job_id: UUID4 | None = None
@@ -1,12 +1,18 @@
 from collections.abc import Sequence
+from typing import Any, Union
 from uuid import UUID
 
-from sqlalchemy import Result, Select
+from sqlalchemy import Result, Select, and_, exists, literal, union_all
+from sqlalchemy import inspect as sql_inspect
 from sqlalchemy import select as sql_select
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.config import settings
+from app.core.cache import MonitoredTTLCache
 from app.core.crud import BaseRepository
 from app.entities.core_user.model import User
 from app.entities.core_user.schemas import (
+    UserAccessGraph,
     UserCreate,
     UserRead,
     UserUpdate,
@@ -15,13 +21,192 @@ from app.entities.core_user.schemas import (
 from app.entities.core_user_organization.model import UserOrganization
 from app.entities.organization_platform.model import OrganizationPlatform
 from app.entities.organization_website.model import OrganizationWebsite
+from app.services.encryption import blind_index
 
+# column values of resolved users, keyed by auth_id
+user_cache: MonitoredTTLCache[str, dict[str, Any]] = MonitoredTTLCache(
+    maxsize=settings.api.user_cache_maxsize, ttl=settings.api.user_cache_ttl
+)
+
+# organization memberships of users, keyed by user id
+access_graph_cache: MonitoredTTLCache[UUID, UserAccessGraph] = MonitoredTTLCache(
+    maxsize=settings.api.access_graph_cache_maxsize,
+    ttl=settings.api.access_graph_cache_ttl,
+)
+
+
+# bumped on every invalidation, a graph read across a bump is not cached
+access_graph_version: int = 0
+
+
+def invalidate_access_graphs() -> None:
+    """Clear the cached access graphs after an organization membership changed."""
+    global access_graph_version
+    access_graph_version += 1
+    access_graph_cache.clear()
+
+
+class AccessGraphInvalidation:
+    """Repository mixin clearing the cached access graphs once a delete commits.
+
+    Deleting organizations, users, websites, platforms or the links between
+    them removes memberships, directly or through cascades.
+    """
+
+    async def delete(self, entry: Any) -> None:
+        await super().delete(entry)  # type: ignore[misc]
+        self._after_commit(invalidate_access_graphs)  # type: ignore[attr-defined]
 
-class UserRepository(BaseRepository[UserCreate, UserRead, UserUpdate, User]):
+    async def delete_many(
+        self, entry_ids: Sequence[UUID], chunk_size: int | None = None
+    ) -> int:
+        count: int = await super().delete_many(  # type: ignore[misc]
+            entry_ids, chunk_size=chunk_size
+        )
+        self._after_commit(invalidate_access_graphs)  # type: ignore[attr-defined]
+        return count
+
+
+class UserRepository(
+    AccessGraphInvalidation, BaseRepository[UserCreate, UserRead, UserUpdate, User]
+):
     @property
     def _table(self) -> User:
         return User
 
+    def cache_user(self, entry: User) -> None:
+        auth_id: str = entry.auth_id
+        values: dict[str, Any] = {
+            attr.key: getattr(entry, attr.key)
+            for attr in sql_inspect(User).column_attrs
+        }
+
+        def store() -> None:
+            user_cache[auth_id] = values
+
+        # uncommitted users are not shared with other requests
+        self._after_commit(store)
+
+    def invalidate_cached_user(self, entry: User) -> None:
+        auth_id: str = entry.auth_id
+        self._after_commit(lambda: user_cache.pop(auth_id, None))
+
+    async def read_by(self, field_name: str, field_value: Any) -> User | None:
+        """Read a user by a field, auth_id lookups go through the blind index.
+
+        Users created before the auth_id_hash column was populated fall back to
+        the encrypted auth_id comparison, see `backfill_auth_id_hash`.
+        """
+        if field_name != "auth_id" or field_value is None:
+            return await super().read_by(field_name, field_value)
+        entry: User | None = await super().read_by(
+            "auth_id_hash", blind_index(field_value)
+        )
+        if entry is None:
+            entry = await super().read_by(field_name, field_value)
+        return entry
+
+    async def backfill_auth_id_hash(self, batch_size: int = 500) -> int:
+        """Populate the auth_id blind index of users missing it, in batches."""
+        count: int = 0
+        while True:
+            stmt: Select = (
+                sql_select(self._table)
+                .where(self._table.auth_id_hash.is_(None))
+                .limit(batch_size)
+            )
+            result: Result = await self._db.execute(stmt)
+            entries: Sequence[User] = result.scalars().all()
+            if len(entries) == 0:
+                break
+            for entry in entries:
+                entry.auth_id_hash = blind_index(entry.auth_id)
+            await self._db.commit()
+            count += len(entries)
+        return count
+
+    async def read_by_auth_id(self, auth_id: str) -> User | None:
+        """Read a user by auth_id, serving the cached user for a short ttl.
+
+        A cached user is attached to the session without a query, any write made
+        through this repository invalidates the cached user.
+        """
+        cached: dict[str, Any] | None = user_cache.lookup(auth_id)
+        if cached is not None:
+            values: dict[str, Any] = {
+                k: list(v) if isinstance(v, list) else v for k, v in cached.items()
+            }
+            entry: User = User(**values)
+            make_transient_to_detached(entry)
+            user: User | None = await self._db.merge(entry, load=False)
+        else:
+            user = await self.read_by(field_name="auth_id", field_value=auth_id)
+            if user is not None:
+                self.cache_user(user)
+        if user is not None and self._loader is not None:
+            self._loader.prime(user)
+        return user
+
+    async def update(
+        self,
+        entry: User,
+        schema: Union[UserUpdate, Any],
+    ) -> User:
+        self.invalidate_cached_user(entry)
+        return await super().update(entry=entry, schema=schema)
+
+    async def delete(self, entry: User) -> None:
+        self.invalidate_cached_user(entry)
+        return await super().delete(entry)
+
+    async def delete_many(
+        self, entry_ids: Sequence[UUID], chunk_size: int | None = None
+    ) -> int:
+        count: int = await super().delete_many(entry_ids, chunk_size=chunk_size)
+        # the cache is keyed by auth_id, which the ids do not give
+        self._after_commit(user_cache.clear)
+        return count
+
+    async def read_access_graph(self, user_id: UUID) -> UserAccessGraph:
+        """Read the organizations of a user and the users, platforms and websites
+        of those organizations, cached per user until memberships change.
+        """
+        cached: UserAccessGraph | None = access_graph_cache.lookup(user_id)
+        if cached is not None:
+            return cached
+        version: int = access_graph_version
+        user_orgs = sql_select(UserOrganization.organization_id).where(
+            UserOrganization.user_id == user_id
+        )
+        stmt = union_all(
+            sql_select(literal("organization"), UserOrganization.organization_id).where(
+                UserOrganization.user_id == user_id
+            ),
+            sql_select(literal("user"), UserOrganization.user_id).where(
+                UserOrganization.organization_id.in_(user_orgs)
+            ),
+            sql_select(literal("platform"), OrganizationPlatform.platform_id).where(
+                OrganizationPlatform.organization_id.in_(user_orgs)
+            ),
+            sql_select(literal("website"), OrganizationWebsite.website_id).where(
+                OrganizationWebsite.organization_id.in_(user_orgs)
+            ),
+        )
+        result: Result = await self._db.execute(stmt)
+        graph: UserAccessGraph = UserAccessGraph()
+        graph_ids: dict[str, set[UUID]] = {
+            "organization": graph.organization_ids,
+            "user": graph.user_ids,
+            "platform": graph.platform_ids,
+            "website": graph.website_ids,
+        }
+        for kind, item_id in result.all():
+            graph_ids[kind].add(item_id)
+        # a membership change committed during the read may not be in the graph
+        if version == access_graph_version:
+            access_graph_cache[user_id] = graph
+        return graph
+
     async def verify_relationship(
         self,
         current_user_id: UUID,
@@ -29,105 +214,78 @@ class UserRepository(BaseRepository[UserCreate, UserRead, UserUpdate, User]):
         organization_id: UUID | None = None,
         platform_id: UUID | None = None,
         website_id: UUID | None = None,
-    ) -> int:
+    ) -> bool:
         """
         Verify that the current user has access to the requested resource.
 
-        Dynamically build a select query based on the parameters passed in:
+        Dynamically build a single EXISTS query based on the parameters passed in:
+
+        1. if a user_id is passed in check the user shares an organization with
+        the current user.
 
-        1. if a user_id is passed in get all the organizations of that user, then get
-        all the organizations of the current user and see if there is an intersection.
+        2. if a organization_id is passed in check the current user belongs to it.
 
-        2. if a organization_id is passed in get all the organizations of the current user
-        and see if the organization_id is in that list
+        3. if a platform_id is passed in check the platform is assigned to one of
+        the organizations of the current user.
 
-        3. if a website_id is passed in get all the organizations of that website, then
-        get all the organizations of the current user and see if there is an intersection
+        4. if a website_id is passed in check the website is assigned to one of
+        the organizations of the current user.
 
         """
-        if (
-            user_id is None
-            and organization_id is None
-            and platform_id is None
-            and website_id is None
-        ):
-            return 0
-        stmt: Select = sql_select(self._table)
+        current_user_organizations = sql_select(UserOrganization.organization_id).where(
+            UserOrganization.user_id == current_user_id
+        )
+        conditions: list[Any] = []
         # 1
         if user_id:
-            # get all the organizations of the user_id
-            user_organizations = sql_select(UserOrganization.organization_id).where(
-                UserOrganization.user_id == user_id
-            )
-            # get all organizations of the current user
-            current_user_organizations = sql_select(
-                UserOrganization.organization_id
-            ).where(UserOrganization.user_id == current_user_id)
-            # find the intersection
-            stmt = (
-                stmt.join(UserOrganization, User.id == UserOrganization.user_id)
-                .where(UserOrganization.organization_id.in_(user_organizations))
-                .where(UserOrganization.organization_id.in_(current_user_organizations))
+            conditions.append(
+                exists().where(
+                    UserOrganization.user_id == user_id,
+                    UserOrganization.organization_id.in_(current_user_organizations),
+                )
             )
         # 2
         if organization_id:
-            # get all organizations of the current user
-            current_user_organizations = sql_select(
-                UserOrganization.organization_id
-            ).where(UserOrganization.user_id == current_user_id)
-            # check if the organization_id is in the list
-            stmt = (
-                stmt.join(UserOrganization, User.id == UserOrganization.user_id)
-                .where(UserOrganization.organization_id == organization_id)
-                .where(UserOrganization.organization_id.in_(current_user_organizations))
+            conditions.append(
+                exists().where(
+                    UserOrganization.user_id == current_user_id,
+                    UserOrganization.organization_id == organization_id,
+                )
             )
         # 3
         if platform_id:
-            # get all organizations of the platform_id
-            platform_organizations = sql_select(
-                OrganizationPlatform.organization_id
-            ).where(OrganizationPlatform.platform_id == platform_id)
-            # get all organizations of the current user
-            current_user_organizations = sql_select(
-                UserOrganization.organization_id
-            ).where(UserOrganization.user_id == current_user_id)
-            # find the intersection
-            stmt = (
-                stmt.join(UserOrganization, User.id == UserOrganization.user_id)
-                .where(UserOrganization.organization_id.in_(platform_organizations))
-                .where(UserOrganization.organization_id.in_(current_user_organizations))
+            conditions.append(
+                exists().where(
+                    OrganizationPlatform.platform_id == platform_id,
+                    OrganizationPlatform.organization_id.in_(
+                        current_user_organizations
+                    ),
+                )
             )
         # 4
         if website_id:
-            # get all organizations of the website_id
-            website_organizations = sql_select(
-                OrganizationWebsite.organization_id
-            ).where(OrganizationWebsite.website_id == website_id)
-            # get all organizations of the current user
-            current_user_organizations = sql_select(
-                UserOrganization.organization_id
-            ).where(UserOrganization.user_id == current_user_id)
-            # find the intersection
-            stmt = (
-                stmt.join(UserOrganization, User.id == UserOrganization.user_id)
-                .where(UserOrganization.organization_id.in_(website_organizations))
-                .where(UserOrganization.organization_id.in_(current_user_organizations))
+            conditions.append(
+                exists().where(
+                    OrganizationWebsite.website_id == website_id,
+                    OrganizationWebsite.organization_id.in_(current_user_organizations),
+                )
             )
-        result: Result = await self._db.execute(stmt)
-        data: Sequence[User] = result.scalars().all()
-        return len(data)
+        if len(conditions) == 0:
+            return False
+        has_access: bool | None = await self._db.scalar(sql_select(and_(*conditions)))
+        return bool(has_access)
 
     async def add_privileges(
         self,
         entry: User,
         schema: UserUpdatePrivileges,
     ) -> User:
-        updated_scopes = entry.scopes
+        updated_scopes = list(entry.scopes)
         if schema.scopes:
             updated_scopes.extend(schema.scopes)
         entry.scopes = list(set(updated_scopes))
-        await self._db.commit()
-        await self._db.refresh(entry)
+        self.invalidate_cached_user(entry)
+        await self._commit()
         return entry
 
     async def remove_privileges(
@@ -141,6 +299,6 @@ class UserRepository(BaseRepository[UserCreate, UserRead, UserUpdate, User]):
                 scope for scope in user_scopes if scope not in schema.scopes
             ]
         entry.scopes = list(set(updated_scopes))
-        await self._db.commit()
-        await self._db.refresh(entry)
+        self.invalidate_cached_user(entry)
+        await self._commit()
         return entry
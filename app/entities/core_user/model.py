@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from pydantic import UUID4
 from sqlalchemy import Boolean, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy_utils import UUIDType
 from sqlalchemy_utils.types.encrypted.encrypted_type import (
     AesEngine,
@@ -12,13 +12,14 @@ from sqlalchemy_utils.types.encrypted.encrypted_type import (
 from app.db.base_class import Base
 from app.db.constants import (
     DB_STR_32BIT_MAXLEN_STORED,
+    DB_STR_64BIT_MAXLEN_INPUT,
     DB_STR_SHORTTEXT_MAXLEN_STORED,
     DB_STR_TINYTEXT_MAXLEN_INPUT,
     DB_STR_TINYTEXT_MAXLEN_STORED,
     DB_STR_USER_PICTURE_DEFAULT,
 )
 from app.db.custom_types.scopes import Scopes
-from app.services.encryption import encryption_settings
+from app.services.encryption import blind_index, encryption_settings
 from app.services.permission import AclPrivilege
 from app.services.permission.schemas import (
     AccessCreate,
@@ -69,6 +70,12 @@ class User(Base):
         unique=True,
         nullable=False,
     )
+    auth_id_hash: Mapped[str | None] = mapped_column(
+        String(length=DB_STR_64BIT_MAXLEN_INPUT),
+        index=True,
+        unique=True,
+        nullable=True,
+    )
     email: Mapped[str] = mapped_column(
         StringEncryptedType(
             String,
@@ -141,6 +148,13 @@ class User(Base):
         "AuditLog", back_populates="user"
     )
 
+    # validators
+    @validates("auth_id")
+    def validate_auth_id(self, key: str, value: str) -> str:
+        """Keep the auth_id blind index in sync with the encrypted auth_id."""
+        self.auth_id_hash = blind_index(value) if value is not None else None
+        return value
+
     # properties as methods
     def privileges(self) -> list[AclPrivilege]:
         """
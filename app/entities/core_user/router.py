@@ -1,4 +1,5 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, Request
+from fastapi import APIRouter, Depends, Request
+from pydantic import UUID4
 
 from app.core.pagination import (
     GetPaginatedQueryParams,
@@ -45,6 +46,7 @@ from app.tasks.background import (
     bg_task_request_to_delete_user,
     bg_task_track_user_ipinfo,
 )
+from app.tasks.queue import enqueue_job
 
 router: APIRouter = APIRouter()
 
@@ -61,7 +63,6 @@ router: APIRouter = APIRouter()
     response_model=UserReadAsAdmin | UserReadAsManager | UserRead,
 )
 async def users_current(
-    bg_tasks: BackgroundTasks,
     request: Request,
     request_ip: RequestOrganizationIp,
     permissions: PermissionController = Depends(get_permission_controller),
@@ -86,10 +87,15 @@ async def users_current(
     req_sess_ip = request.session.get("ip_address", False)
     if not req_sess_ip:
         request.session["ip_address"] = request_ip
-        bg_tasks.add_task(
+        await enqueue_job(
             bg_task_track_user_ipinfo,
-            ip_address=str(request_ip),
-            user_id=str(permissions.current_user.id),
+            payload={
+                "ip_address": str(request_ip),
+                "user_id": str(permissions.current_user.id),
+            },
+            idempotency_key=f"ipinfo:{request_ip}:{permissions.current_user.id}",
+            user_id=permissions.current_user.id,
+            session=permissions.db,
         )
 
     response_out: UserReadAsAdmin | UserReadAsManager | UserRead = (
@@ -143,7 +149,12 @@ async def users_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=permissions.user_repo._table.__tablename__,
         stmt=permissions.user_repo.query_list(),
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleAdmin: UserReadAsAdmin,
             RoleManager: UserReadAsManager,
@@ -295,7 +306,6 @@ async def users_update(
     response_model=None,
 )
 async def users_delete(
-    bg_tasks: BackgroundTasks,
     user: User = Permission([AccessDelete, AccessDeleteSelf], get_user_or_404),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> UserDelete:
@@ -316,8 +326,16 @@ async def users_delete(
 
     await permissions.verify_user_can_access(privileges=[RoleAdmin], user_id=user.id)
     output_message: str
+    job_id: UUID4 | None = None
     if permissions.current_user.id == user.id:
-        bg_tasks.add_task(bg_task_request_to_delete_user, user_id=str(user.id))
+        job, _ = await enqueue_job(
+            bg_task_request_to_delete_user,
+            payload={"user_id": str(user.id)},
+            idempotency_key=f"delete-user:{user.id}",
+            user_id=user.id,
+            session=permissions.db,
+        )
+        job_id = job.id
         output_message = "User requested to be deleted"
     else:
         await permissions.user_repo.delete(entry=user)
@@ -325,6 +343,7 @@ async def users_delete(
     return UserDelete(
         message=output_message,
         user_id=user.id,
+        job_id=job_id,
     )
 
 
@@ -1,4 +1,4 @@
-from pydantic import UUID4, field_validator
+from pydantic import UUID4, BaseModel, field_validator
 
 from app.core.schema import BaseSchema, BaseSchemaRead
 from app.db.validators import (
@@ -122,3 +122,31 @@ class UserReadAsAdmin(UserBase, BaseSchemaRead):
 class UserDelete(BaseSchema):
     message: str
     user_id: UUID4
+    job_id: UUID4 | None = None
+
+
+class UserAccessGraph(BaseModel):
+    """The resources a user shares an organization with."""
+
+    organization_ids: set[UUID4] = set()
+    user_ids: set[UUID4] = set()
+    platform_ids: set[UUID4] = set()
+    website_ids: set[UUID4] = set()
+
+    def can_access(
+        self,
+        user_id: UUID4 | None = None,
+        organization_id: UUID4 | None = None,
+        platform_id: UUID4 | None = None,
+        website_id: UUID4 | None = None,
+    ) -> bool:
+        checks: list[tuple[UUID4 | None, set[UUID4]]] = [
+            (user_id, self.user_ids),
+            (organization_id, self.organization_ids),
+            (platform_id, self.platform_ids),
+            (website_id, self.website_ids),
+        ]
+        requested = [(item_id, ids) for item_id, ids in checks if item_id is not None]
+        if len(requested) == 0:
+            return False
+        return all(item_id in ids for item_id, ids in requested)
@@ -15,3 +15,7 @@ class UserIpaddressRepository(
     @property
     def _table(self) -> UserIpaddress:
         return UserIpaddress
+
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        return ("user_id", "ipaddress_id")
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from pydantic import UUID4
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy_utils import UUIDType
 
@@ -14,7 +14,10 @@ if TYPE_CHECKING:  # pragma: no cover
 
 class UserIpaddress(Base):
     __tablename__: str = "user_ipaddress"
-    __table_args__: dict = {"mysql_engine": "InnoDB"}
+    __table_args__: tuple = (
+        UniqueConstraint("user_id", "ipaddress_id"),
+        {"mysql_engine": "InnoDB"},
+    )
     id: Mapped[UUID4] = mapped_column(
         UUIDType(binary=False),
         index=True,
@@ -1,4 +1,10 @@
+from typing import Any, Union
+
 from app.core.crud import BaseRepository
+from app.entities.core_user.crud import (
+    AccessGraphInvalidation,
+    invalidate_access_graphs,
+)
 from app.entities.core_user_organization.model import UserOrganization
 from app.entities.core_user_organization.schemas import (
     UserOrganizationCreate,
@@ -8,13 +14,21 @@ from app.entities.core_user_organization.schemas import (
 
 
 class UserOrganizationRepository(
+    AccessGraphInvalidation,
     BaseRepository[
         UserOrganizationCreate,
         UserOrganizationRead,
         UserOrganizationUpdate,
         UserOrganization,
-    ]
+    ],
 ):
     @property
     def _table(self) -> UserOrganization:
         return UserOrganization
+
+    async def create(
+        self, schema: Union[UserOrganizationCreate, Any]
+    ) -> UserOrganization:
+        entry: UserOrganization = await super().create(schema)
+        self._after_commit(invalidate_access_graphs)
+        return entry
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from pydantic import UUID4
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy_utils import UUIDType
 
@@ -35,7 +35,10 @@ if TYPE_CHECKING:  # pragma: no cover
 
 class GoAdsProperty(Base):
     __tablename__: str = "go_ads"
-    __table_args__: dict = {"mysql_engine": "InnoDB"}
+    __table_args__: tuple = (
+        Index("ix_go_ads_created_at_id", "created_at", "id"),
+        {"mysql_engine": "InnoDB"},
+    )
     __mapper_args__: dict = {"always_refresh": True}
     id: Mapped[UUID4] = mapped_column(
         UUIDType(binary=False),
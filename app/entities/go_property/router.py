@@ -127,7 +127,12 @@ async def go_property_list(
         ] = await permissions.get_paginated_resource_response(
             table_name=GoAnalytics4Property.__tablename__,
             stmt=select_stmt,
-            page_params=PageParams(page=query.page, size=query.size),
+            page_params=PageParams(
+                page=query.page,
+                size=query.size,
+                include_total=query.include_total,
+                cursor=query.cursor,
+            ),
             responses={
                 RoleAdmin: GoAnalytics4PropertyRead,
                 RoleManager: GoAnalytics4PropertyRead,
@@ -155,7 +160,12 @@ async def go_property_list(
         ] = await permissions.get_paginated_resource_response(
             table_name=GoAnalytics4Stream.__tablename__,
             stmt=select_stmt,
-            page_params=PageParams(page=query.page, size=query.size),
+            page_params=PageParams(
+                page=query.page,
+                size=query.size,
+                include_total=query.include_total,
+                cursor=query.cursor,
+            ),
             responses={
                 RoleAdmin: GoAnalytics4StreamRead,
                 RoleManager: GoAnalytics4StreamRead,
@@ -183,7 +193,12 @@ async def go_property_list(
         ] = await permissions.get_paginated_resource_response(
             table_name=GoAdsProperty.__tablename__,
             stmt=select_stmt,
-            page_params=PageParams(page=query.page, size=query.size),
+            page_params=PageParams(
+                page=query.page,
+                size=query.size,
+                include_total=query.include_total,
+                cursor=query.cursor,
+            ),
             responses={
                 RoleAdmin: GoAdsPropertyRead,
                 RoleManager: GoAdsPropertyRead,
@@ -211,7 +226,12 @@ async def go_property_list(
         ] = await permissions.get_paginated_resource_response(
             table_name=GoSearchConsoleProperty.__tablename__,
             stmt=select_stmt,
-            page_params=PageParams(page=query.page, size=query.size),
+            page_params=PageParams(
+                page=query.page,
+                size=query.size,
+                include_total=query.include_total,
+                cursor=query.cursor,
+            ),
             responses={
                 RoleAdmin: GoSearchConsolePropertyRead,
                 RoleManager: GoSearchConsolePropertyRead,
@@ -1,4 +1,10 @@
+from typing import Any, Union
+
 from app.core.crud import BaseRepository
+from app.entities.core_user.crud import (
+    AccessGraphInvalidation,
+    invalidate_access_graphs,
+)
 from app.entities.organization_platform.model import OrganizationPlatform
 from app.entities.organization_platform.schemas import (
     OrganizationPlatformCreate,
@@ -8,13 +14,21 @@ from app.entities.organization_platform.schemas import (
 
 
 class OrganizationPlatformRepository(
+    AccessGraphInvalidation,
     BaseRepository[
         OrganizationPlatformCreate,
         OrganizationPlatformRead,
         OrganizationPlatformUpdate,
         OrganizationPlatform,
-    ]
+    ],
 ):
     @property
     def _table(self) -> OrganizationPlatform:
         return OrganizationPlatform
+
+    async def create(
+        self, schema: Union[OrganizationPlatformCreate, Any]
+    ) -> OrganizationPlatform:
+        entry: OrganizationPlatform = await super().create(schema)
+        self._after_commit(invalidate_access_graphs)
+        return entry
@@ -1,4 +1,15 @@
+from typing import Any, Union
+
+from pydantic import UUID4
+from sqlalchemy import Exists, exists
+from sqlalchemy import select as sql_select
+
 from app.core.crud import BaseRepository
+from app.entities.core_user.crud import (
+    AccessGraphInvalidation,
+    invalidate_access_graphs,
+)
+from app.entities.core_user_organization.model import UserOrganization
 from app.entities.organization_website.model import OrganizationWebsite
 from app.entities.organization_website.schemas import (
     OrganizationWebsiteCreate,
@@ -7,14 +18,35 @@ from app.entities.organization_website.schemas import (
 )
 
 
+def user_website_access(website_id: Any, user_id: UUID4) -> Exists:
+    """An EXISTS clause that is true when the website is assigned to one of the
+    organizations of the user, correlates to the outer query by `website_id`.
+    """
+    user_organizations = sql_select(UserOrganization.organization_id).where(
+        UserOrganization.user_id == user_id
+    )
+    return exists().where(
+        OrganizationWebsite.website_id == website_id,
+        OrganizationWebsite.organization_id.in_(user_organizations),
+    )
+
+
 class OrganizationWebsiteRepository(
+    AccessGraphInvalidation,
     BaseRepository[
         OrganizationWebsiteCreate,
         OrganizationWebsiteRead,
         OrganizationWebsiteUpdate,
         OrganizationWebsite,
-    ]
+    ],
 ):
     @property
     def _table(self) -> OrganizationWebsite:
         return OrganizationWebsite
+
+    async def create(
+        self, schema: Union[OrganizationWebsiteCreate, Any]
+    ) -> OrganizationWebsite:
+        entry: OrganizationWebsite = await super().create(schema)
+        self._after_commit(invalidate_access_graphs)
+        return entry
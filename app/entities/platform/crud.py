@@ -5,6 +5,7 @@ from sqlalchemy import select as sql_select
 
 from app.core.crud import BaseRepository
 from app.entities.core_organization.model import Organization
+from app.entities.core_user.crud import AccessGraphInvalidation
 from app.entities.core_user.model import User
 from app.entities.core_user_organization.model import UserOrganization
 from app.entities.organization_platform.model import OrganizationPlatform
@@ -17,7 +18,8 @@ from app.entities.platform.schemas import (
 
 
 class PlatformRepository(
-    BaseRepository[PlatformCreate, PlatformRead, PlatformUpdateAsAdmin, Platform]
+    AccessGraphInvalidation,
+    BaseRepository[PlatformCreate, PlatformRead, PlatformUpdateAsAdmin, Platform],
 ):
     @property
     def _table(self) -> Platform:
@@ -89,7 +89,12 @@ async def platform_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=Platform.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleAdmin: PlatformRead,
             RoleManager: PlatformRead,
@@ -6,13 +6,14 @@ from app.services.encryption import (
     EncryptionSettings,
     SecureMessage,
     get_encryption_settings,
+    get_secure_message,
 )
 
 
 def get_secure_message_encryption(
     settings: EncryptionSettings = Depends(get_encryption_settings),
 ) -> SecureMessage:  # pragma: no cover
-    return SecureMessage(
+    return get_secure_message(
         pass_key=settings.encryption_key,
         salt=settings.encryption_salt,
     )
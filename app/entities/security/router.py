@@ -7,7 +7,15 @@ from app.entities.security.dependencies import (
     get_secure_message_encryption,
 )
 from app.services.csrf import CsrfProtect, CsrfToken, csrf_settings
-from app.services.encryption import EncryptedMessage, PlainMessage
+from app.services.encryption import (
+    EncryptedMessage,
+    EncryptedMessageBatch,
+    MessageBatchResult,
+    PlainMessage,
+    PlainMessageBatch,
+    decrypt_and_verify_many,
+    sign_and_encrypt_many,
+)
 
 router: APIRouter = APIRouter()
 
@@ -122,3 +130,53 @@ async def secure_decrypt_message(
     """Decrypts and verifies the RSA signature of a securely encrypted message."""
     decrypted_message = secure.decrypt_and_verify(input.message, str)
     return PlainMessage(message=str(decrypted_message))
+
+
+@router.post(
+    "/encrypt/messages",
+    name="secure:secure_encrypt_messages",
+    dependencies=[
+        Depends(get_current_user),
+        Depends(get_secure_message_encryption),
+    ],
+)
+async def secure_encrypt_messages(
+    request: Request,
+    current_user: CurrentUser,
+    secure: SecureMessageEncryption,
+    input: PlainMessageBatch,
+) -> MessageBatchResult:
+    """Encrypts a batch of messages using AES signed by an RSA key.
+
+    The messages are signed in parallel off the event loop, the results keep the
+    order of the input messages.
+    """
+    messages = await sign_and_encrypt_many(
+        secure, [item.message for item in input.messages]
+    )
+    return MessageBatchResult(messages=messages)
+
+
+@router.post(
+    "/decrypt/messages",
+    name="secure:secure_decrypt_messages",
+    dependencies=[
+        Depends(get_current_user),
+        Depends(get_secure_message_encryption),
+    ],
+)
+async def secure_decrypt_messages(
+    request: Request,
+    current_user: CurrentUser,
+    secure: SecureMessageEncryption,
+    input: EncryptedMessageBatch,
+) -> MessageBatchResult:
+    """Decrypts and verifies a batch of securely encrypted messages.
+
+    A message that fails to decrypt or verify reports its error in place, the
+    results keep the order of the input messages.
+    """
+    messages = await decrypt_and_verify_many(
+        secure, [item.message for item in input.messages]
+    )
+    return MessageBatchResult(messages=messages)
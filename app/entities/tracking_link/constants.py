@@ -0,0 +1,2 @@
+ERROR_MESSAGE_IMPORT_FORMAT_INVALID = "IMPORT_FORMAT_INVALID"
+ERROR_MESSAGE_IMPORT_HEADER_INVALID = "IMPORT_HEADER_INVALID"
@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import BinaryExpression, Select, and_
@@ -24,6 +26,20 @@ class TrackingLinkRepository(
     def _table(self) -> TrackingLink:
         return TrackingLink
 
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        return ("url_hash",)
+
+    async def read_url_hashes(self, url_hashes: Sequence[str]) -> set[str]:
+        """The url hashes of the links that exist, read with one `IN` query."""
+        if len(url_hashes) == 0:
+            return set()
+        self._db.begin()
+        results: Any = await self._db.execute(
+            sql_select(self._table.url_hash).where(self._table.url_hash.in_(url_hashes))
+        )
+        return set(results.scalars().all())
+
     def query_list(
         self,
         user_id: UUID | None = None,
@@ -0,0 +1,210 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.entities.tracking_link.crud import TrackingLinkRepository
+from app.entities.tracking_link.errors import TrackingLinkImportHeaderInvalid
+from app.entities.tracking_link.schemas import (
+    TrackingLinkCreate,
+    TrackingLinkCreateRequest,
+    TrackingLinkImportError,
+    TrackingLinkImportFormat,
+    TrackingLinkImportResult,
+)
+from app.entities.tracking_link.utilities import hash_url, parse_url_utm_params
+
+
+async def iter_import_lines(
+    stream: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[str | None]:
+    """Yield the lines of a streamed body as they arrive.
+
+    A line longer than `max_length` characters is not kept in memory, it is
+    yielded as `None`.
+    """
+    decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder("utf-8-sig")(
+        errors="replace"
+    )
+    buffer: str = ""
+    # the rest of a line that is too long is dropped up to the next newline
+    overflow: bool = False
+    async for data in stream:
+        lines: list[str] = (buffer + decoder.decode(data)).split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            if overflow or len(line) > max_length:
+                overflow = False
+                yield None
+            else:
+                yield line.rstrip("\r")
+        if len(buffer) > max_length:
+            overflow = True
+            buffer = ""
+    buffer += decoder.decode(b"", final=True)
+    if overflow or len(buffer) > max_length:
+        yield None
+    elif buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_import_rows(
+    lines: AsyncIterator[str | None],
+    import_format: TrackingLinkImportFormat,
+    max_length: int,
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """Yield the line number and the values of each row of an import.
+
+    The values of a row that can not be read are replaced by the error. Blank
+    lines are skipped, the first line of a CSV import is its header and must
+    name a `url` column.
+    """
+    header: list[str] | None = None
+    line_number: int = 0
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            yield line_number, f"Row is longer than {max_length} characters"
+            continue
+        if not line.strip():
+            continue
+        if import_format == TrackingLinkImportFormat.NDJSON:
+            try:
+                values: Any = json.loads(line)
+            except ValueError as e:
+                yield line_number, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(values, dict):
+                yield line_number, "Row is not a JSON object"
+                continue
+            yield line_number, values
+            continue
+        try:
+            fields: list[str] = next(csv.reader([line]))
+        except csv.Error as e:
+            yield line_number, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [field.strip().lower() for field in fields]
+            if "url" not in header:
+                raise TrackingLinkImportHeaderInvalid()
+            continue
+        yield (
+            line_number,
+            {
+                name: value.strip() or None
+                for name, value in zip(header, fields)
+                if name in ("url", "is_active")
+            },
+        )
+
+
+def tracking_link_import_create(
+    values: dict[str, Any], organization_id: UUID | None
+) -> TrackingLinkCreate:
+    """The tracking link of an import row, raises `ValueError` for invalid rows."""
+    try:
+        link_in: TrackingLinkCreateRequest = TrackingLinkCreateRequest(
+            url=values.get("url"),
+            is_active=values.get("is_active"),
+            organization_id=organization_id,
+        )
+    except ValidationError as e:
+        raise ValueError(e.errors()[0]["msg"])
+    try:
+        url_params = parse_url_utm_params(link_in.url)
+    except Exception:
+        raise ValueError("Invalid UTM parameters in URL")
+    return TrackingLinkCreate(
+        url=link_in.url,
+        url_hash=hash_url(link_in.url),
+        is_active=link_in.is_active if link_in.is_active is not None else True,
+        organization_id=organization_id,
+        **url_params.model_dump(),
+    )
+
+
+async def create_new_tracking_links(
+    links_repo: TrackingLinkRepository, links: list[TrackingLinkCreate]
+) -> int:
+    """Insert the links whose url is not tracked yet.
+
+    The existing links are read with one query. Returns the number of links
+    created.
+    """
+    existing: set[str] = await links_repo.read_url_hashes(
+        [link.url_hash for link in links]
+    )
+    new_links: list[TrackingLinkCreate] = [
+        link for link in links if link.url_hash not in existing
+    ]
+    return await links_repo.insert_many(new_links)
+
+
+async def import_tracking_links(
+    links_repo: TrackingLinkRepository,
+    stream: AsyncIterator[bytes],
+    import_format: TrackingLinkImportFormat,
+    organization_id: UUID | None = None,
+    chunk_size: int | None = None,
+) -> TrackingLinkImportResult:
+    """Create the tracking links of a CSV or NDJSON body as it streams in.
+
+    Rows are validated and written `chunk_size` links at a time, a chunk
+    checks which of its urls exist with one query and inserts the others with
+    one batched statement. Rows repeating a url of the same chunk, of an
+    earlier chunk or of an existing link are counted as duplicates.
+
+    Only the current chunk is kept in memory, the errors of the first
+    `import_max_errors` invalid rows are returned. The links are committed
+    with the session of `links_repo`.
+    """
+    chunk_size = chunk_size or settings.db.bulk_chunk_size
+    max_length: int = settings.api.import_max_row_length
+    result: TrackingLinkImportResult = TrackingLinkImportResult()
+    links: dict[str, TrackingLinkCreate] = {}
+
+    def add_error(row: int, url: Any, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < settings.api.import_max_errors:
+            result.errors.append(
+                TrackingLinkImportError(
+                    row=row, url=url if isinstance(url, str) else None, error=error
+                )
+            )
+
+    async def create_links() -> None:
+        if not links:
+            return
+        created: int = await create_new_tracking_links(links_repo, list(links.values()))
+        result.created += created
+        result.duplicates += len(links) - created
+        links.clear()
+
+    async for row, values in iter_import_rows(
+        iter_import_lines(stream, max_length), import_format, max_length
+    ):
+        result.rows += 1
+        if isinstance(values, str):
+            add_error(row, None, values)
+            continue
+        try:
+            link: TrackingLinkCreate = tracking_link_import_create(
+                values, organization_id
+            )
+        except ValueError as e:
+            add_error(row, values.get("url"), str(e))
+            continue
+        if link.url_hash in links:
+            result.duplicates += 1
+            continue
+        links[link.url_hash] = link
+        if len(links) >= chunk_size:
+            await create_links()
+    await create_links()
+    return result
@@ -0,0 +1,17 @@
+from fastapi import status
+
+from app.core.exceptions import ApiException
+from app.entities.tracking_link.constants import (
+    ERROR_MESSAGE_IMPORT_FORMAT_INVALID,
+    ERROR_MESSAGE_IMPORT_HEADER_INVALID,
+)
+
+
+class TrackingLinkImportFormatInvalid(ApiException):
+    def __init__(self, message: str = ERROR_MESSAGE_IMPORT_FORMAT_INVALID):
+        super().__init__(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, message)
+
+
+class TrackingLinkImportHeaderInvalid(ApiException):
+    def __init__(self, message: str = ERROR_MESSAGE_IMPORT_HEADER_INVALID):
+        super().__init__(status.HTTP_422_UNPROCESSABLE_ENTITY, message)
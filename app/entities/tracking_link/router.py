@@ -1,6 +1,7 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from pydantic import UUID4
 from sqlalchemy import Select
 
 from app.api.get_query import (
@@ -18,12 +19,16 @@ from app.entities.auth.dependencies import (
 )
 from app.entities.core_organization.errors import OrganizationNotFound
 from app.entities.tracking_link.crud import TrackingLinkRepository
+from app.entities.tracking_link.crud_utilities import import_tracking_links
 from app.entities.tracking_link.dependencies import get_tracking_link_or_404
+from app.entities.tracking_link.errors import TrackingLinkImportFormatInvalid
 from app.entities.tracking_link.model import TrackingLink
 from app.entities.tracking_link.schemas import (
     TrackingLinkBaseParams,
     TrackingLinkCreate,
     TrackingLinkCreateRequest,
+    TrackingLinkImportFormat,
+    TrackingLinkImportResult,
     TrackingLinkRead,
     TrackingLinkUpdate,
     TrackingLinkUpdateRequest,
@@ -110,7 +115,12 @@ async def tracking_link_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=TrackingLink.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleAdmin: TrackingLinkRead,
             RoleManager: TrackingLinkRead,
@@ -188,6 +198,63 @@ async def tracking_link_create(
     return response_out
 
 
+@router.post(
+    "/import",
+    name="tracking_link:import",
+    dependencies=[
+        Depends(get_async_db),
+        Depends(get_current_user),
+        Depends(get_permission_controller),
+    ],
+    response_model=TrackingLinkImportResult,
+)
+async def tracking_link_import(
+    request: Request,
+    organization_id: UUID4 | None = None,
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> TrackingLinkImportResult:
+    """Create tracking links from a CSV or NDJSON body, one link per line.
+
+    The body is read as it is uploaded, a `text/csv` body starts with a header
+    naming a `url` and optionally an `is_active` column, each line of an
+    `application/x-ndjson` body is an object with the same keys. Urls that are
+    already tracked or repeated in the file are skipped.
+
+    Permissions:
+    ------------
+    `role=admin|manager` : import tracking links for all organizations
+
+    `role=user` : only import tracking links for organizations associated with the
+        user via `user_organization` table
+
+    Returns:
+    --------
+    `TrackingLinkImportResult` : the number of links created and the errors of
+        the rows that could not be imported
+
+    """
+    await permissions.verify_user_can_access(
+        privileges=[RoleAdmin, RoleManager],
+        organization_id=organization_id,
+    )
+    if organization_id is not None:
+        organization_exists = await permissions.organization_repo.read(organization_id)
+        if organization_exists is None:
+            raise OrganizationNotFound()
+    try:
+        import_format = TrackingLinkImportFormat.from_content_type(
+            request.headers.get("content-type")
+        )
+    except ValueError:
+        raise TrackingLinkImportFormatInvalid()
+    return await import_tracking_links(
+        TrackingLinkRepository(permissions.db),
+        request.stream(),
+        import_format,
+        organization_id=organization_id,
+    )
+
+
 @router.get(
     "/{tracking_link_id}",
     name="tracking_link:read",
@@ -1,4 +1,6 @@
-from pydantic import UUID4, field_validator
+from enum import Enum, unique
+
+from pydantic import UUID4, BaseModel, field_validator
 
 from app.core.schema import BaseSchema, BaseSchemaRead
 from app.db.validators import (
@@ -220,3 +222,32 @@ class TrackingLinkRead(BaseSchemaRead):
     _validate_utm_term = field_validator("utm_term", mode="before")(
         validate_utm_term_optional
     )
+
+
+@unique
+class TrackingLinkImportFormat(str, Enum):
+    """The media types of a tracking link import, one link per line."""
+
+    CSV = "text/csv"
+    NDJSON = "application/x-ndjson"
+
+    @classmethod
+    def from_content_type(cls, content_type: str | None) -> "TrackingLinkImportFormat":
+        media_type: str = (content_type or "").split(";")[0].strip().lower()
+        if media_type in ("application/jsonl", "application/json-lines"):
+            return cls.NDJSON
+        return cls(media_type)
+
+
+class TrackingLinkImportError(BaseModel):
+    row: int
+    url: str | None = None
+    error: str
+
+
+class TrackingLinkImportResult(BaseModel):
+    rows: int = 0
+    created: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[TrackingLinkImportError] = []
@@ -1 +1,2 @@
 ERROR_MESSAGE_DOMAIN_INVALID = "DOMAIN_INVALID"
+ERROR_MESSAGE_SITEMAP_URL_INVALID = "SITEMAP_URL_INVALID"
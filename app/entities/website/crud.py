@@ -7,6 +7,7 @@ from sqlalchemy import select as sql_select
 from app.core.crud import BaseRepository
 from app.core.logger import logger
 from app.entities.core_organization.model import Organization
+from app.entities.core_user.crud import AccessGraphInvalidation
 from app.entities.core_user.model import User
 from app.entities.core_user_organization.model import UserOrganization
 from app.entities.organization_website.model import OrganizationWebsite
@@ -15,12 +16,17 @@ from app.entities.website.schemas import WebsiteCreate, WebsiteRead, WebsiteUpda
 
 
 class WebsiteRepository(
-    BaseRepository[WebsiteCreate, WebsiteRead, WebsiteUpdate, Website]
+    AccessGraphInvalidation,
+    BaseRepository[WebsiteCreate, WebsiteRead, WebsiteUpdate, Website],
 ):
     @property
     def _table(self) -> Website:
         return Website
 
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        return ("domain",)
+
     def query_list(
         self,
         user_id: UUID | None = None,
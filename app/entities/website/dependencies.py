@@ -5,7 +5,13 @@ from fastapi import Depends
 
 from app.entities.api.dependencies import AsyncDatabaseSession
 from app.entities.api.errors import EntityNotFound
+from app.entities.auth.dependencies import (
+    PermissionController,
+    get_permission_controller,
+)
+from app.entities.organization_website.crud import user_website_access
 from app.entities.website.crud import Website, WebsiteRepository
+from app.services.permission import RoleAdmin, RoleManager
 from app.utilities import parse_id
 
 
@@ -22,4 +28,21 @@ async def get_website_or_404(
     return website
 
 
+async def get_accessible_website_or_404(
+    website_id: Any,
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> Website:
+    """Parses uuid/int and fetches website by id, if the current user can access it."""
+    parsed_id: UUID = parse_id(website_id)
+    website_repo: WebsiteRepository = WebsiteRepository(session=permissions.db)
+    website: Website = await permissions.read_if_accessible(
+        repository=website_repo,
+        entry_id=parsed_id,
+        access=user_website_access(Website.id, permissions.current_user.id),
+        entity_info="Website {}".format(parsed_id),
+        privileges=[RoleAdmin, RoleManager],
+    )
+    return website
+
+
 FetchWebsiteOr404 = Annotated[Website, Depends(get_website_or_404)]
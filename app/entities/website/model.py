@@ -31,6 +31,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from app.entities.website_keywordcorpus.model import WebsiteKeywordCorpus
     from app.entities.website_page.model import WebsitePage
     from app.entities.website_pagespeedinsight.model import WebsitePageSpeedInsights
+    from app.entities.website_sitemap.model import WebsiteSitemap
 
 
 class Website(Base):
@@ -60,6 +61,9 @@ class Website(Base):
     pages: Mapped[list["WebsitePage"]] = relationship(
         "WebsitePage", back_populates="website", cascade="all, delete-orphan"
     )
+    sitemaps: Mapped[list["WebsiteSitemap"]] = relationship(
+        "WebsiteSitemap", back_populates="website", cascade="all, delete-orphan"
+    )
     ga4_properties: Mapped[list["GoAnalytics4Property"]] = relationship(
         "GoAnalytics4Property", secondary="website_go_a4", back_populates="websites"
     )
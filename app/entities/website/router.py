@@ -1,3 +1,5 @@
+from urllib.parse import urlsplit
+
 from fastapi import APIRouter, Depends
 from sqlalchemy import Select
 
@@ -7,18 +9,36 @@ from app.api.get_query import (
 )
 from app.core.pagination import PageParams, Paginated
 from app.entities.api.dependencies import get_async_db
-from app.entities.api.errors import EntityAlreadyExists
+from app.entities.api.errors import EntityAlreadyExists, EntityNotFound
 from app.entities.auth.dependencies import (
     Permission,
     PermissionController,
     get_current_user,
     get_permission_controller,
 )
+from app.entities.core_job.crud import JobRepository
+from app.entities.core_job.model import Job
 from app.entities.website.crud import WebsiteRepository
-from app.entities.website.dependencies import get_website_or_404
-from app.entities.website.errors import DomainInvalid
+from app.entities.website.dependencies import get_accessible_website_or_404
+from app.entities.website.errors import DomainInvalid, SitemapUrlInvalid
 from app.entities.website.model import Website
 from app.entities.website.schemas import WebsiteCreate, WebsiteRead, WebsiteUpdate
+from app.entities.website_page.crud_utilities import (
+    website_sitemap_sync_key,
+    website_sitemap_sync_progress,
+)
+from app.entities.website_page.schemas import (
+    WebsiteSitemapSync,
+    WebsiteSitemapSyncProgress,
+)
+from app.entities.website_pagespeedinsight.crud_utilities import (
+    website_pagespeedinsights_batch_key,
+    website_pagespeedinsights_batch_progress,
+)
+from app.entities.website_pagespeedinsight.schemas import (
+    PSIDevice,
+    WebsitePageSpeedInsightsBatchProgress,
+)
 from app.services.permission import (
     AccessDelete,
     AccessRead,
@@ -27,6 +47,11 @@ from app.services.permission import (
     RoleManager,
     RoleUser,
 )
+from app.tasks.background import (
+    bg_task_website_pagespeedinsights_batch,
+    bg_task_website_sitemap_sync,
+)
+from app.tasks.queue import enqueue_job
 
 router: APIRouter = APIRouter()
 
@@ -73,7 +98,12 @@ async def website_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=Website.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleUser: WebsiteRead,
         },
@@ -135,14 +165,14 @@ async def website_create(
     name="websites:read",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_or_404),
+        Depends(get_accessible_website_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
     response_model=WebsiteRead,
 )
 async def website_read(
-    website: Website = Permission(AccessRead, get_website_or_404),
+    website: Website = Permission(AccessRead, get_accessible_website_or_404),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> WebsiteRead:
     """Retrieve a single website by id.
@@ -162,11 +192,6 @@ async def website_read(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=website.id,
-    )
-
     response_out: WebsiteRead = permissions.get_resource_response(
         resource=website,
         responses={
@@ -181,7 +206,7 @@ async def website_read(
     name="websites:update",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_or_404),
+        Depends(get_accessible_website_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
@@ -189,7 +214,7 @@ async def website_read(
 )
 async def website_update(
     website_in: WebsiteUpdate,
-    website: Website = Permission(AccessUpdate, get_website_or_404),
+    website: Website = Permission(AccessUpdate, get_accessible_website_or_404),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> WebsiteRead:
     """Update a website by id.
@@ -214,10 +239,6 @@ async def website_update(
             RoleUser: WebsiteUpdate,
         },
     )
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=website.id,
-    )
     websites_repo: WebsiteRepository = WebsiteRepository(session=permissions.db)
     if website_in.domain is not None:
         domain_found: Website | None = await websites_repo.read_by(
@@ -248,14 +269,14 @@ async def website_update(
     name="websites:delete",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_or_404),
+        Depends(get_accessible_website_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
     response_model=None,
 )
 async def website_delete(
-    website: Website = Permission(AccessDelete, get_website_or_404),
+    website: Website = Permission(AccessDelete, get_accessible_website_or_404),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> None:
     """Delete a website by id.
@@ -274,9 +295,187 @@ async def website_delete(
     `None`
 
     """
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager], website_id=website.id
-    )
     websites_repo: WebsiteRepository = WebsiteRepository(session=permissions.db)
     await websites_repo.delete(entry=website)
     return None
+
+
+@router.post(
+    "/{website_id}/process-psi",
+    name="websites:process_website_page_speed_insights",
+    dependencies=[
+        Depends(get_async_db),
+        Depends(get_accessible_website_or_404),
+        Depends(get_current_user),
+        Depends(get_permission_controller),
+    ],
+    response_model=WebsitePageSpeedInsightsBatchProgress,
+)
+async def website_process_website_page_speed_insights(
+    website: Website = Permission(AccessUpdate, get_accessible_website_or_404),
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> WebsitePageSpeedInsightsBatchProgress:
+    """A webhook to initiate processing the page speed insights of every active
+    page of a website.
+
+    The batch is queued as a job and the pages are fetched by a job worker with a
+    bounded pool of fetches, a website runs one batch at a time and the progress
+    of the queued or running batch is returned.
+
+    Permissions:
+    ------------
+    `role=admin|manager` : all websites
+
+    `role=user` : only websites associated with organizations they are associated with via
+        `user_organization` table, and associated with the organization via `organization_website` table
+
+    Returns:
+    --------
+    `WebsitePageSpeedInsightsBatchProgress` : the progress counters of the batch
+
+    """
+    job, _ = await enqueue_job(
+        bg_task_website_pagespeedinsights_batch,
+        payload={
+            "website_id": str(website.id),
+            "devices": [PSIDevice.mobile.value, PSIDevice.desktop.value],
+        },
+        idempotency_key=website_pagespeedinsights_batch_key(website.id),
+        user_id=permissions.current_user.id,
+        session=permissions.db,
+    )
+    return website_pagespeedinsights_batch_progress(job)
+
+
+@router.get(
+    "/{website_id}/process-psi",
+    name="websites:read_website_page_speed_insights_progress",
+    dependencies=[
+        Depends(get_async_db),
+        Depends(get_accessible_website_or_404),
+        Depends(get_current_user),
+        Depends(get_permission_controller),
+    ],
+    response_model=WebsitePageSpeedInsightsBatchProgress,
+)
+async def website_read_website_page_speed_insights_progress(
+    website: Website = Permission(AccessRead, get_accessible_website_or_404),
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> WebsitePageSpeedInsightsBatchProgress:
+    """Retrieve the progress of the page speed insights batch of a website.
+
+    Permissions:
+    ------------
+    `role=admin|manager` : all websites
+
+    `role=user` : only websites associated with organizations they are associated with via
+        `user_organization` table, and associated with the organization via `organization_website` table
+
+    Returns:
+    --------
+    `WebsitePageSpeedInsightsBatchProgress` : the progress counters of the last batch
+
+    """
+    job: Job | None = await JobRepository(permissions.db).read_latest(
+        website_pagespeedinsights_batch_key(website.id)
+    )
+    if job is None:
+        raise EntityNotFound(
+            entity_info="Page speed insights batch of website id = {}".format(
+                website.id
+            )
+        )
+    return website_pagespeedinsights_batch_progress(job)
+
+
+@router.post(
+    "/{website_id}/sync-sitemap",
+    name="websites:sync_website_sitemap",
+    dependencies=[
+        Depends(get_async_db),
+        Depends(get_accessible_website_or_404),
+        Depends(get_current_user),
+        Depends(get_permission_controller),
+    ],
+    response_model=WebsiteSitemapSyncProgress,
+)
+async def website_sync_website_sitemap(
+    sitemap_in: WebsiteSitemapSync | None = None,
+    website: Website = Permission(AccessUpdate, get_accessible_website_or_404),
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> WebsiteSitemapSyncProgress:
+    """Sync the pages of a website with its sitemap.
+
+    The sitemap, `/sitemap.xml` of the website unless a `sitemap_url` on the
+    domain of the website is sent, is streamed by a job worker and its pages
+    are added or updated, the active pages not in the sitemap are deactivated.
+    A website runs one sync at a time and the progress of the queued or running
+    sync is returned.
+
+    Permissions:
+    ------------
+    `role=admin|manager` : all websites
+
+    `role=user` : only websites associated with organizations they are associated with via
+        `user_organization` table, and associated with the organization via `organization_website` table
+
+    Returns:
+    --------
+    `WebsiteSitemapSyncProgress` : the progress counters of the sync
+
+    """
+    sitemap_url: str = f"{website.get_link()}/sitemap.xml"
+    if sitemap_in is not None and sitemap_in.sitemap_url is not None:
+        sitemap_url = sitemap_in.sitemap_url
+        parts = urlsplit(sitemap_url)
+        host: str = (parts.hostname or "").removeprefix("www.")
+        domain: str = website.domain.lower().removeprefix("www.")
+        if parts.scheme not in ("http", "https") or host != domain:
+            raise SitemapUrlInvalid()
+    job, _ = await enqueue_job(
+        bg_task_website_sitemap_sync,
+        payload={"website_id": str(website.id), "sitemap_url": sitemap_url},
+        idempotency_key=website_sitemap_sync_key(website.id),
+        user_id=permissions.current_user.id,
+        session=permissions.db,
+    )
+    return website_sitemap_sync_progress(job)
+
+
+@router.get(
+    "/{website_id}/sync-sitemap",
+    name="websites:read_website_sitemap_sync_progress",
+    dependencies=[
+        Depends(get_async_db),
+        Depends(get_accessible_website_or_404),
+        Depends(get_current_user),
+        Depends(get_permission_controller),
+    ],
+    response_model=WebsiteSitemapSyncProgress,
+)
+async def website_read_website_sitemap_sync_progress(
+    website: Website = Permission(AccessRead, get_accessible_website_or_404),
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> WebsiteSitemapSyncProgress:
+    """Retrieve the progress of the sitemap sync of a website.
+
+    Permissions:
+    ------------
+    `role=admin|manager` : all websites
+
+    `role=user` : only websites associated with organizations they are associated with via
+        `user_organization` table, and associated with the organization via `organization_website` table
+
+    Returns:
+    --------
+    `WebsiteSitemapSyncProgress` : the progress counters of the last sync
+
+    """
+    job: Job | None = await JobRepository(permissions.db).read_latest(
+        website_sitemap_sync_key(website.id)
+    )
+    if job is None:
+        raise EntityNotFound(
+            entity_info="Sitemap sync of website id = {}".format(website.id)
+        )
+    return website_sitemap_sync_progress(job)
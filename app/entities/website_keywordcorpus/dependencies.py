@@ -5,10 +5,16 @@ from fastapi import Depends
 
 from app.entities.api.dependencies import AsyncDatabaseSession
 from app.entities.api.errors import EntityNotFound
+from app.entities.auth.dependencies import (
+    PermissionController,
+    get_permission_controller,
+)
+from app.entities.organization_website.crud import user_website_access
 from app.entities.website_keywordcorpus.crud import (
     WebsiteKeywordCorpus,
     WebsiteKeywordCorpusRepository,
 )
+from app.services.permission import RoleAdmin, RoleManager
 from app.utilities import parse_id
 
 
@@ -31,6 +37,28 @@ async def get_website_page_kwc_or_404(
     return website_keyword_corpus
 
 
+async def get_accessible_website_page_kwc_or_404(
+    kwc_id: Any,
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> WebsiteKeywordCorpus:
+    """Parses uuid/int and fetches website keyword corpus by id, if the current
+    user can access the website of the keyword corpus."""
+    parsed_id: UUID = parse_id(kwc_id)
+    website_page_kwc_repo: WebsiteKeywordCorpusRepository = (
+        WebsiteKeywordCorpusRepository(session=permissions.db)
+    )
+    website_keyword_corpus: WebsiteKeywordCorpus = await permissions.read_if_accessible(
+        repository=website_page_kwc_repo,
+        entry_id=parsed_id,
+        access=user_website_access(
+            WebsiteKeywordCorpus.website_id, permissions.current_user.id
+        ),
+        entity_info="WebsitePageKeywordCorpus {}".format(parsed_id),
+        privileges=[RoleAdmin, RoleManager],
+    )
+    return website_keyword_corpus
+
+
 FetchWebsiteKeywordCorpusOr404 = Annotated[
     WebsiteKeywordCorpus, Depends(get_website_page_kwc_or_404)
 ]
@@ -17,7 +17,9 @@ from app.entities.auth.dependencies import (
 from app.entities.website.crud import WebsiteRepository
 from app.entities.website.model import Website
 from app.entities.website_keywordcorpus.crud import WebsiteKeywordCorpusRepository
-from app.entities.website_keywordcorpus.dependencies import get_website_page_kwc_or_404
+from app.entities.website_keywordcorpus.dependencies import (
+    get_accessible_website_page_kwc_or_404,
+)
 from app.entities.website_keywordcorpus.model import WebsiteKeywordCorpus
 from app.entities.website_keywordcorpus.schemas import (
     WebsiteKeywordCorpusCreate,
@@ -91,7 +93,12 @@ async def website_page_keyword_corpus_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=WebsiteKeywordCorpus.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleAdmin: WebsiteKeywordCorpusRead,
             RoleManager: WebsiteKeywordCorpusRead,
@@ -148,13 +155,7 @@ async def website_page_keyword_corpus_create(
     a_web_page: WebsitePage | None = await web_page_repo.read(entry_id=kwc_in.page_id)
     if a_web_page is None:
         raise EntityNotFound(entity_info="WebsitePage id = {}".format(kwc_in.page_id))
-    a_web_page: WebsitePage | None = await web_page_repo.exists_by_fields(
-        {
-            "id": kwc_in.page_id,
-            "website_id": kwc_in.website_id,
-        }
-    )
-    if a_web_page is None:
+    if a_web_page.website_id != kwc_in.website_id:
         raise EntityRelationshipNotFound(
             entity_info="WebsitePage id = {}, website_id = {}".format(
                 kwc_in.page_id,
@@ -173,7 +174,7 @@ async def website_page_keyword_corpus_create(
     name="website_page_keyword_corpus:read",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_page_kwc_or_404),
+        Depends(get_accessible_website_page_kwc_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
@@ -181,7 +182,7 @@ async def website_page_keyword_corpus_create(
 )
 async def website_page_keyword_corpus_read(
     web_page_kwc: WebsiteKeywordCorpus = Permission(
-        AccessRead, get_website_page_kwc_or_404
+        AccessRead, get_accessible_website_page_kwc_or_404
     ),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> WebsiteKeywordCorpusRead:
@@ -204,11 +205,6 @@ async def website_page_keyword_corpus_read(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=web_page_kwc.website_id,
-    )
-
     response_out: WebsiteKeywordCorpusRead = permissions.get_resource_response(
         resource=web_page_kwc,
         responses={
@@ -223,7 +219,7 @@ async def website_page_keyword_corpus_read(
     name="website_page_keyword_corpus:delete",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_page_kwc_or_404),
+        Depends(get_accessible_website_page_kwc_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
@@ -231,7 +227,7 @@ async def website_page_keyword_corpus_read(
 )
 async def website_page_keyword_corpus_delete(
     web_page_kwc: WebsiteKeywordCorpus = Permission(
-        AccessDelete, get_website_page_kwc_or_404
+        AccessDelete, get_accessible_website_page_kwc_or_404
     ),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> None:
@@ -254,10 +250,6 @@ async def website_page_keyword_corpus_delete(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=web_page_kwc.website_id,
-    )
     web_kwc_repo: WebsiteKeywordCorpusRepository
     web_kwc_repo = WebsiteKeywordCorpusRepository(session=permissions.db)
     await web_kwc_repo.delete(entry=web_page_kwc)
@@ -1,13 +1,19 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import BinaryExpression, Select, and_
+from sqlalchemy import BinaryExpression, Result, Select, and_
 from sqlalchemy import select as sql_select
+from sqlalchemy import update as sql_update
 
-from app.core.crud import BaseRepository
+from app.config import settings
+from app.core.crud import BaseRepository, chunked
 from app.entities.core_organization.model import Organization
 from app.entities.core_user.model import User
 from app.entities.core_user_organization.model import UserOrganization
 from app.entities.organization_website.model import OrganizationWebsite
+from app.entities.tracking_link.utilities import hash_url
 from app.entities.website.model import Website
 from app.entities.website_page.model import WebsitePage
 from app.entities.website_page.schemas import (
@@ -24,11 +30,16 @@ class WebsitePageRepository(
     def _table(self) -> WebsitePage:
         return WebsitePage
 
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        return ("website_id", "url_hash")
+
     def query_list(
         self,
         user_id: UUID | None = None,
         website_id: UUID | None = None,
         is_active: bool | None = None,
+        sitemap_id: UUID | None = None,
     ) -> Select:
         stmt: Select = sql_select(self._table)
         conditions: list[BinaryExpression[bool]] = []
@@ -51,6 +62,153 @@ class WebsitePageRepository(
             conditions.append(self._table.website_id.like(website_id))
         if is_active is not None:
             conditions.append(self._table.is_active == is_active)
+        if sitemap_id:
+            conditions.append(self._table.sitemap_id == sitemap_id)
         if len(conditions) > 0:
             stmt = stmt.where(and_(*conditions))
         return stmt
+
+    async def read_active_urls(
+        self,
+        website_id: UUID,
+        after_id: UUID | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[UUID, str]]:
+        """The ids and urls of the next active pages of a website, by id.
+
+        One keyset chunk of at most `limit` pages sorted after `after_id`, so a
+        caller can close the session between chunks.
+        """
+        stmt: Select = (
+            sql_select(self._table.id, self._table.url)
+            .where(
+                self._table.website_id == website_id,
+                self._table.is_active.is_(True),
+            )
+            .order_by(self._table.id)
+            .limit(limit or settings.db.bulk_chunk_size)
+        )
+        if after_id is not None:
+            stmt = stmt.where(self._table.id > after_id)
+        results: Result = await self._db.execute(stmt)
+        return [(row.id, row.url) for row in results.all()]
+
+    async def read_sitemap_state(
+        self, website_id: UUID, url_hashes: Sequence[str]
+    ) -> dict[str, Any]:
+        """The sitemap columns of the existing pages of a website by url hash,
+        read in one query."""
+        self._db.begin()
+        results: Any = await self._db.execute(
+            sql_select(
+                self._table.url_hash,
+                self._table.priority,
+                self._table.last_modified,
+                self._table.change_frequency,
+                self._table.is_active,
+                self._table.sitemap_id,
+            ).where(
+                self._table.website_id == website_id,
+                self._table.url_hash.in_(url_hashes),
+            )
+        )
+        return {row.url_hash: row for row in results.all()}
+
+    async def deactivate_many(
+        self, entry_ids: Sequence[UUID], chunk_size: int | None = None
+    ) -> int:
+        """Deactivate pages by id, a chunk of ids per statement.
+
+        Returns the number of pages deactivated.
+        """
+        self._db.begin()
+        count: int = 0
+        for chunk in chunked(entry_ids, chunk_size or settings.db.bulk_chunk_size):
+            result: Any = await self._db.execute(
+                sql_update(self._table)
+                .where(self._table.id.in_(chunk), self._table.is_active.is_(True))
+                .values(is_active=False)
+                .execution_options(synchronize_session=False)
+            )
+            count += result.rowcount
+        await self._commit()
+        if self._loader is not None:
+            self._loader.clear()
+        return count
+
+    async def backfill_url_hash(self, batch_size: int = 500) -> int:
+        """Populate the url hash of pages missing it, in batches.
+
+        Pages written before the url_hash column existed have no hash, the
+        column is added as nullable so they do not collide in the unique
+        `(website_id, url_hash)` constraint.
+        """
+        count: int = 0
+        while True:
+            stmt: Select = (
+                sql_select(self._table)
+                .where(self._table.url_hash.is_(None))
+                .limit(batch_size)
+            )
+            result: Result = await self._db.execute(stmt)
+            entries: Sequence[WebsitePage] = result.scalars().all()
+            if len(entries) == 0:
+                break
+            for entry in entries:
+                entry.url_hash = hash_url(entry.url)
+            await self._db.commit()
+            count += len(entries)
+        return count
+
+    async def detach_sitemaps(self, sitemap_ids: Sequence[UUID]) -> int:
+        """Deactivate the pages of sitemaps that are no longer read.
+
+        Returns the number of active pages deactivated.
+        """
+        self._db.begin()
+        deactivated: Any = await self._db.execute(
+            sql_update(self._table)
+            .where(
+                self._table.sitemap_id.in_(sitemap_ids),
+                self._table.is_active.is_(True),
+            )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        await self._db.execute(
+            sql_update(self._table)
+            .where(self._table.sitemap_id.in_(sitemap_ids))
+            .values(sitemap_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        if self._loader is not None:
+            self._loader.clear()
+        return deactivated.rowcount
+
+    async def deactivate_without_sitemap(
+        self, website_id: UUID, since: datetime
+    ) -> int:
+        """Deactivate the active pages of a website that a sitemap listed, that
+        no sitemap lists anymore and that were not written since a time.
+
+        Pages no sitemap ever listed, like the pages created by users, are
+        left alone. Returns the number of pages deactivated.
+        """
+        self._db.begin()
+        result: Any = await self._db.execute(
+            sql_update(self._table)
+            .where(
+                self._table.website_id == website_id,
+                self._table.from_sitemap.is_(True),
+                self._table.sitemap_id.is_(None),
+                self._table.is_active.is_(True),
+                self._table.updated_at < since,
+            )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        if self._loader is not None:
+            self._loader.clear()
+        return result.rowcount
@@ -0,0 +1,332 @@
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+from uuid import UUID
+
+import httpx
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.sitemap import (
+    SitemapClient,
+    SitemapError,
+    SitemapReference,
+    SitemapResponse,
+    SitemapUrl,
+    sitemap_client,
+)
+from app.db.constants import DB_STR_URLPATH_MAXLEN_INPUT
+from app.db.session import get_db_session
+from app.entities.api.errors import EntityNotFound
+from app.entities.core_job.model import Job
+from app.entities.core_job.schemas import JobStatus
+from app.entities.tracking_link.utilities import hash_url
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.model import Website
+from app.entities.website_page.crud import WebsitePageRepository
+from app.entities.website_page.schemas import (
+    SitemapPageChangeFrequency,
+    WebsitePageSitemapUpsert,
+    WebsiteSitemapSyncProgress,
+)
+from app.entities.website_sitemap.crud import WebsiteSitemapRepository
+from app.entities.website_sitemap.model import WebsiteSitemap
+from app.entities.website_sitemap.schemas import WebsiteSitemapCreate
+from app.utilities.dates_and_time import get_date
+
+
+def website_sitemap_sync_key(website_id: UUID) -> str:
+    """The idempotency key of the sitemap sync job of a website."""
+    return f"website-sitemap:{website_id}"
+
+
+def website_sitemap_sync_progress(job: Job) -> WebsiteSitemapSyncProgress:
+    """The progress of a sitemap sync job, its last reported counters and status."""
+    values: dict = {**job.payload, **(job.result or {})}
+    values["job_id"] = job.id
+    values["status"] = job.status
+    return WebsiteSitemapSyncProgress.model_validate(values)
+
+
+def sitemap_url_path(loc: str, host: str) -> str | None:
+    """The path of a sitemap url on the host, `None` for the urls of other hosts."""
+    try:
+        parts = urlsplit(loc)
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https") or parts.netloc.lower() != host:
+        return None
+    path: str = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return path if len(path) <= DB_STR_URLPATH_MAXLEN_INPUT else None
+
+
+def same_sitemap_date(a: datetime | None, b: datetime | None) -> bool:
+    """Compare dates as the database stores them, in whole seconds of UTC."""
+    if a is None or b is None:
+        return a is b
+    if a.tzinfo is not None:
+        a = a.astimezone(timezone.utc).replace(tzinfo=None)
+    if b.tzinfo is not None:
+        b = b.astimezone(timezone.utc).replace(tzinfo=None)
+    return a.replace(microsecond=0) == b.replace(microsecond=0)
+
+
+def sitemap_page_changed(existing: Any, page: WebsitePageSitemapUpsert) -> bool:
+    """Whether the page of a sitemap differs from its row in the database."""
+    return (
+        not existing.is_active
+        or existing.sitemap_id != page.sitemap_id
+        # priorities may be stored as single precision floats
+        or round(float(existing.priority), 3) != round(float(page.priority), 3)
+        or not same_sitemap_date(existing.last_modified, page.last_modified)
+        or existing.change_frequency != page.change_frequency
+    )
+
+
+def sitemap_page_upsert(
+    website_id: UUID, sitemap_id: UUID, path: str, entry: SitemapUrl
+) -> WebsitePageSitemapUpsert:
+    change_frequency: str | None = entry.changefreq
+    if change_frequency is not None and not SitemapPageChangeFrequency.has_value(
+        change_frequency
+    ):
+        change_frequency = None
+    return WebsitePageSitemapUpsert(
+        url=path,
+        url_hash=hash_url(path),
+        priority=entry.priority if entry.priority is not None else 0.5,
+        last_modified=entry.lastmod,
+        change_frequency=change_frequency,
+        website_id=website_id,
+        sitemap_id=sitemap_id,
+    )
+
+
+async def write_website_sitemap_pages(
+    website_id: UUID, pages: list[WebsitePageSitemapUpsert]
+) -> tuple[int, int]:
+    """Write the new and changed pages of a chunk of sitemap pages.
+
+    The existing pages are read with one query and only the pages that are new
+    or changed are upserted, in one transaction. Returns the number of pages
+    added and updated.
+    """
+    async with get_db_session(unit_of_work=True) as session:
+        pages_repo: WebsitePageRepository = WebsitePageRepository(session)
+        existing: dict[str, Any] = await pages_repo.read_sitemap_state(
+            website_id, [page.url_hash for page in pages]
+        )
+        changed: list[WebsitePageSitemapUpsert] = [
+            page
+            for page in pages
+            if page.url_hash not in existing
+            or sitemap_page_changed(existing[page.url_hash], page)
+        ]
+        if changed:
+            await pages_repo.upsert_many(changed)
+    added: int = sum(1 for page in changed if page.url_hash not in existing)
+    return added, len(changed) - added
+
+
+async def deactivate_website_sitemap_missing_pages(
+    sitemap_id: UUID, url_hashes: set[str]
+) -> int:
+    """Deactivate the active pages of a sitemap whose url hash it no longer lists.
+
+    Returns the number of pages deactivated.
+    """
+    async with get_db_session(unit_of_work=True) as session:
+        pages_repo: WebsitePageRepository = WebsitePageRepository(session)
+        missing: list[UUID] = [
+            page.id
+            async for page in pages_repo.stream(
+                pages_repo.query_list(is_active=True, sitemap_id=sitemap_id)
+            )
+            if page.url_hash not in url_hashes
+        ]
+        if not missing:
+            return 0
+        return await pages_repo.deactivate_many(missing)
+
+
+class SitemapVisit(NamedTuple):
+    url: str
+    depth: int
+    parent_id: UUID | None = None
+    # the lastmod of the sitemap in its index
+    lastmod: datetime | None = None
+
+
+async def sync_website_sitemap(
+    progress: WebsiteSitemapSyncProgress,
+    client: SitemapClient = sitemap_client,
+    chunk_size: int | None = None,
+    max_depth: int | None = None,
+) -> WebsiteSitemapSyncProgress:
+    """Sync the pages of a website with its sitemap, reading only what changed.
+
+    The sitemap and the sitemaps of an index, up to `max_depth` levels deep,
+    are requested with the ETag and Last-Modified of their last read and a
+    sitemap whose lastmod in its index did not change is not requested at all.
+    The sitemaps of an unchanged index are checked the same way.
+
+    A changed sitemap is streamed `chunk_size` pages at a time, each chunk reads
+    its existing pages with one query and upserts only the new pages and the
+    pages whose lastmod, priority or change frequency changed. The active pages
+    of a changed sitemap it no longer lists are deactivated. Once every sitemap
+    was read, the pages of sitemaps no longer listed and of no sitemap are
+    deactivated too, no such page is deactivated when a sitemap failed.
+
+    Only the sitemaps and urls on the host of the sitemap url are read. The
+    counters of `progress` are updated as the sync runs.
+    """
+    chunk_size = chunk_size or settings.db.bulk_chunk_size
+    if max_depth is None:
+        max_depth = settings.cloud.sitemap_max_depth
+    async with get_db_session() as session:
+        website: Website | None = await WebsiteRepository(session).read(
+            entry_id=progress.website_id
+        )
+    if website is None:
+        raise EntityNotFound(entity_info=f"Website {progress.website_id}")
+    host: str = urlsplit(progress.sitemap_url).netloc.lower()
+    # pages of no sitemap written before this time are deactivated, the
+    # database may only store whole seconds
+    started_at: datetime = get_date().replace(microsecond=0)
+    pending: deque[SitemapVisit] = deque([SitemapVisit(progress.sitemap_url, 0)])
+    # the sitemaps read or unchanged, by url and by id
+    visited_urls: set[str] = set()
+    visited_ids: set[UUID] = set()
+
+    async def write_pages(pages: dict[str, WebsitePageSitemapUpsert]) -> None:
+        if not pages:
+            return
+        added, updated = await write_website_sitemap_pages(
+            website.id, list(pages.values())
+        )
+        progress.added += added
+        progress.updated += updated
+        progress.unchanged += len(pages) - added - updated
+        pages.clear()
+
+    async def read_entries(
+        visit: SitemapVisit, sitemap: WebsiteSitemap, response: SitemapResponse
+    ) -> None:
+        pages: dict[str, WebsitePageSitemapUpsert] = {}
+        # the pages listed, a sitemap lists at most 50,000 urls
+        listed: set[str] = set()
+        async for entry in response.entries():
+            if isinstance(entry, SitemapReference):
+                if (
+                    visit.depth < max_depth
+                    and sitemap_url_path(entry.loc, host) is not None
+                ):
+                    pending.append(
+                        SitemapVisit(
+                            entry.loc, visit.depth + 1, sitemap.id, entry.lastmod
+                        )
+                    )
+                continue
+            progress.pages += 1
+            path: str | None = sitemap_url_path(entry.loc, host)
+            if path is None:
+                progress.skipped += 1
+                continue
+            page: WebsitePageSitemapUpsert = sitemap_page_upsert(
+                website.id, sitemap.id, path, entry
+            )
+            pages[page.url_hash] = page
+            listed.add(page.url_hash)
+            if len(pages) >= chunk_size:
+                await write_pages(pages)
+        await write_pages(pages)
+        progress.removed += await deactivate_website_sitemap_missing_pages(
+            sitemap.id, listed
+        )
+
+    async def read_sitemap(visit: SitemapVisit) -> WebsiteSitemap:
+        async with get_db_session() as session:
+            sitemaps_repo: WebsiteSitemapRepository = WebsiteSitemapRepository(session)
+            sitemap: WebsiteSitemap | None = await sitemaps_repo.read_by_url(
+                website.id, visit.url
+            )
+            if sitemap is None:
+                sitemap = await sitemaps_repo.create(
+                    WebsiteSitemapCreate(
+                        url=visit.url, website_id=website.id, parent_id=visit.parent_id
+                    )
+                )
+        unchanged: bool = (
+            sitemap.synced_at is not None
+            and visit.lastmod is not None
+            and same_sitemap_date(sitemap.lastmod, visit.lastmod)
+        )
+        if not unchanged:
+            async with client.fetch(
+                visit.url, sitemap.etag, sitemap.last_modified
+            ) as response:
+                unchanged = response.not_modified
+                if not unchanged:
+                    await read_entries(visit, sitemap, response)
+                    async with get_db_session() as session:
+                        sitemap = await WebsiteSitemapRepository(session).record_read(
+                            sitemap,
+                            is_index=response.is_index,
+                            etag=response.etag,
+                            last_modified=response.last_modified,
+                            lastmod=visit.lastmod,
+                            parent_id=visit.parent_id,
+                            synced_at=get_date(),
+                        )
+                    progress.sitemaps += 1
+        if unchanged:
+            progress.unchanged_sitemaps += 1
+            if sitemap.is_index and visit.depth < max_depth:
+                async with get_db_session() as session:
+                    children = await WebsiteSitemapRepository(session).read_children(
+                        sitemap.id
+                    )
+                pending.extend(
+                    SitemapVisit(child.url, visit.depth + 1, sitemap.id, child.lastmod)
+                    for child in children
+                )
+        return sitemap
+
+    while pending:
+        visit: SitemapVisit = pending.popleft()
+        if visit.url in visited_urls:
+            continue
+        visited_urls.add(visit.url)
+        try:
+            sitemap: WebsiteSitemap = await read_sitemap(visit)
+            visited_ids.add(sitemap.id)
+        except (httpx.HTTPError, SitemapError) as e:
+            if visit.depth == 0:
+                raise
+            progress.failed_sitemaps += 1
+            logger.warning("Error Reading Sitemap %s: %s" % (visit.url, e))
+    if progress.failed_sitemaps == 0:
+        async with get_db_session(unit_of_work=True) as session:
+            sitemaps_repo: WebsiteSitemapRepository = WebsiteSitemapRepository(session)
+            pages_repo: WebsitePageRepository = WebsitePageRepository(session)
+            stale: list[UUID] = [
+                sitemap.id
+                for sitemap in await sitemaps_repo.read_by_website(website.id)
+                if sitemap.id not in visited_ids
+            ]
+            if stale:
+                progress.removed += await pages_repo.detach_sitemaps(stale)
+                await sitemaps_repo.delete_many(stale)
+            progress.removed += await pages_repo.deactivate_without_sitemap(
+                website.id, started_at
+            )
+    progress.status = JobStatus.succeeded
+    logger.info(
+        "Synced the sitemap of Website[{}]: {} added, {} updated, {} removed".format(
+            progress.website_id, progress.added, progress.updated, progress.removed
+        )
+    )
+    return progress
@@ -2,10 +2,17 @@ from typing import Annotated, Any
 from uuid import UUID
 
 from fastapi import Depends
+from sqlalchemy.orm import joinedload
 
 from app.entities.api.dependencies import AsyncDatabaseSession
 from app.entities.api.errors import EntityNotFound
+from app.entities.auth.dependencies import (
+    PermissionController,
+    get_permission_controller,
+)
+from app.entities.organization_website.crud import user_website_access
 from app.entities.website_page.crud import WebsitePage, WebsitePageRepository
+from app.services.permission import RoleAdmin, RoleManager
 from app.utilities import parse_id
 
 
@@ -22,4 +29,25 @@ async def get_website_page_or_404(
     return website_page
 
 
+async def get_accessible_website_page_or_404(
+    page_id: Any,
+    permissions: PermissionController = Depends(get_permission_controller),
+) -> WebsitePage:
+    """Parses uuid/int and fetches website page by id, with its website, if the
+    current user can access the website of the page."""
+    parsed_id: UUID = parse_id(page_id)
+    website_page_repo: WebsitePageRepository = WebsitePageRepository(
+        session=permissions.db
+    )
+    website_page: WebsitePage = await permissions.read_if_accessible(
+        repository=website_page_repo,
+        entry_id=parsed_id,
+        access=user_website_access(WebsitePage.website_id, permissions.current_user.id),
+        entity_info="WebsitePage {}".format(parsed_id),
+        privileges=[RoleAdmin, RoleManager],
+        options=[joinedload(WebsitePage.website)],
+    )
+    return website_page
+
+
 FetchWebPageOr404 = Annotated[WebsitePage, Depends(get_website_page_or_404)]
@@ -2,12 +2,22 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pydantic import UUID4
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy_utils import UUIDType
 
 from app.db.base_class import Base
 from app.db.constants import DB_STR_TINYTEXT_MAXLEN_STORED, DB_STR_URLPATH_MAXLEN_INPUT
+from app.entities.tracking_link.utilities import hash_url
 from app.services.permission import (
     AccessCreate,
     AccessDelete,
@@ -29,7 +39,11 @@ if TYPE_CHECKING:  # pragma: no cover
 
 class WebsitePage(Base):
     __tablename__: str = "website_page"
-    __table_args__: dict = {"mysql_engine": "InnoDB"}
+    __table_args__: tuple = (
+        UniqueConstraint("website_id", "url_hash"),
+        Index("ix_website_page_created_at_id", "created_at", "id"),
+        {"mysql_engine": "InnoDB"},
+    )
     __mapper_args__: dict = {"always_refresh": True}
     id: Mapped[UUID4] = mapped_column(
         UUIDType(binary=False),
@@ -44,6 +58,10 @@ class WebsitePage(Base):
         nullable=False,
         default="/",
     )
+    # the url is too long for a unique index, pages are unique by its hash,
+    # pages written before the column existed have none until
+    # `cli.py db backfill-page-url-hash` ran, nulls do not collide
+    url_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     status: Mapped[int] = mapped_column(Integer, nullable=False, default=200)
     priority: Mapped[float] = mapped_column(Float, nullable=False, default=0.5)
     last_modified: Mapped[datetime] = mapped_column(
@@ -53,12 +71,21 @@ class WebsitePage(Base):
         String(DB_STR_TINYTEXT_MAXLEN_STORED), nullable=True
     )
     is_active: Mapped[bool] = mapped_column(Boolean(), nullable=False, default=True)
+    # pages a sitemap listed, only these are deactivated by a sitemap sync
+    from_sitemap: Mapped[bool] = mapped_column(Boolean(), nullable=False, default=False)
 
     # relationships
     website_id: Mapped[UUID4] = mapped_column(
         UUIDType(binary=False), ForeignKey("website.id"), index=True, nullable=False
     )
     website: Mapped["Website"] = relationship("Website", back_populates="pages")
+    # the sitemap that listed the page when it was last synced
+    sitemap_id: Mapped[UUID4 | None] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("website_sitemap.id", ondelete="SET NULL"),
+        index=True,
+        nullable=True,
+    )
     keywordcorpus: Mapped[list["WebsiteKeywordCorpus"]] = relationship(
         "WebsiteKeywordCorpus", back_populates="page", cascade="all, delete-orphan"
     )
@@ -66,6 +93,13 @@ class WebsitePage(Base):
         "WebsitePageSpeedInsights", back_populates="page", cascade="all, delete-orphan"
     )
 
+    # validators
+    @validates("url")
+    def validate_url(self, key: str, value: str) -> str:
+        """Keep the url hash in sync with the url."""
+        self.url_hash = hash_url(value)
+        return value
+
     def __acl__(
         self,
     ) -> list[tuple[AclAction, AclPrivilege, AclPermission]]:  # pragma: no cover
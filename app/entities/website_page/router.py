@@ -1,4 +1,4 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends
 from sqlalchemy import Select
 
 from app.api.get_query import CommonWebsitePageQueryParams, GetWebsitePageQueryParams
@@ -14,7 +14,7 @@ from app.entities.auth.dependencies import (
 from app.entities.website.crud import WebsiteRepository
 from app.entities.website.model import Website
 from app.entities.website_page.crud import WebsitePageRepository
-from app.entities.website_page.dependencies import get_website_page_or_404
+from app.entities.website_page.dependencies import get_accessible_website_page_or_404
 from app.entities.website_page.model import WebsitePage
 from app.entities.website_page.schemas import (
     WebsitePageCreate,
@@ -31,6 +31,7 @@ from app.services.permission import (
     RoleUser,
 )
 from app.tasks.background import bg_task_website_page_pagespeedinsights_fetch
+from app.tasks.queue import enqueue_job
 
 router: APIRouter = APIRouter()
 
@@ -88,7 +89,12 @@ async def website_page_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=WebsitePage.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleUser: WebsitePageRead,
         },
@@ -167,14 +173,16 @@ async def website_page_create(
     name="website_pages:read",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_page_or_404),
+        Depends(get_accessible_website_page_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
     response_model=WebsitePageRead,
 )
 async def website_page_read(
-    website_page: WebsitePage = Permission(AccessRead, get_website_page_or_404),
+    website_page: WebsitePage = Permission(
+        AccessRead, get_accessible_website_page_or_404
+    ),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> WebsitePageRead:
     """Retrieve a single website page by id.
@@ -192,11 +200,6 @@ async def website_page_read(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=website_page.website_id,
-    )
-
     response_out: WebsitePageRead = permissions.get_resource_response(
         resource=website_page,
         responses={
@@ -211,7 +214,7 @@ async def website_page_read(
     name="website_pages:update",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_page_or_404),
+        Depends(get_accessible_website_page_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
@@ -219,7 +222,9 @@ async def website_page_read(
 )
 async def website_page_update(
     website_page_in: WebsitePageUpdate,
-    website_page: WebsitePage = Permission(AccessUpdate, get_website_page_or_404),
+    website_page: WebsitePage = Permission(
+        AccessUpdate, get_accessible_website_page_or_404
+    ),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> WebsitePageRead:
     """Update a website page by id.
@@ -237,11 +242,6 @@ async def website_page_update(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=website_page.website_id,
-    )
-
     web_pages_repo: WebsitePageRepository = WebsitePageRepository(
         session=permissions.db
     )
@@ -298,14 +298,16 @@ async def website_page_update(
     name="website_pages:delete",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_page_or_404),
+        Depends(get_accessible_website_page_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
     response_model=None,
 )
 async def website_page_delete(
-    website_page: WebsitePage = Permission(AccessDelete, get_website_page_or_404),
+    website_page: WebsitePage = Permission(
+        AccessDelete, get_accessible_website_page_or_404
+    ),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> None:
     """Delete a website page by id.
@@ -323,10 +325,6 @@ async def website_page_delete(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=website_page.website_id,
-    )
     web_pages_repo: WebsitePageRepository = WebsitePageRepository(
         session=permissions.db
     )
@@ -339,15 +337,16 @@ async def website_page_delete(
     name="website_pages:process_website_page_speed_insights",
     dependencies=[
         Depends(get_async_db),
-        Depends(get_website_page_or_404),
+        Depends(get_accessible_website_page_or_404),
         Depends(get_current_user),
         Depends(get_permission_controller),
     ],
     response_model=WebsitePageRead,
 )
 async def website_page_process_website_page_speed_insights(
-    bg_tasks: BackgroundTasks,
-    website_page: WebsitePage = Permission(AccessUpdate, get_website_page_or_404),
+    website_page: WebsitePage = Permission(
+        AccessUpdate, get_accessible_website_page_or_404
+    ),
     permissions: PermissionController = Depends(get_permission_controller),
 ) -> WebsitePageRead:
     """A webhook to initiate processing a website page's page speed insights.
@@ -366,31 +365,25 @@ async def website_page_process_website_page_speed_insights(
 
     """
 
-    await permissions.verify_user_can_access(
-        privileges=[RoleAdmin, RoleManager],
-        website_id=website_page.website_id,
-    )
-    # check website page is assigned to a website
-    website_repo: WebsiteRepository = WebsiteRepository(session=permissions.db)
-    a_website: Website | None = await website_repo.read(website_page.website_id)
+    # check website page is assigned to a website, loaded with the website page
+    a_website: Website | None = website_page.website
     if a_website is None:
         raise EntityNotFound(
             entity_info="Website id = {}".format(website_page.website_id),
         )
     fetch_page = a_website.get_link() + website_page.url
-    # Send the task to the background.
-    bg_tasks.add_task(
-        bg_task_website_page_pagespeedinsights_fetch,
-        website_id=str(a_website.id),
-        page_id=str(website_page.id),
-        fetch_url=fetch_page,
-        device=PSIDevice.mobile,
-    )
-    bg_tasks.add_task(
-        bg_task_website_page_pagespeedinsights_fetch,
-        website_id=str(a_website.id),
-        page_id=str(website_page.id),
-        fetch_url=fetch_page,
-        device=PSIDevice.desktop,
-    )
+    # Queue a job per device, a page and device already queued is not queued again.
+    for device in (PSIDevice.mobile, PSIDevice.desktop):
+        await enqueue_job(
+            bg_task_website_page_pagespeedinsights_fetch,
+            payload={
+                "website_id": str(a_website.id),
+                "page_id": str(website_page.id),
+                "fetch_url": fetch_page,
+                "device": device.value,
+            },
+            idempotency_key=f"page-psi:{website_page.id}:{device.value}",
+            user_id=permissions.current_user.id,
+            session=permissions.db,
+        )
     return WebsitePageRead.model_validate(website_page)
@@ -7,6 +7,7 @@ from pydantic import UUID4, BaseModel, field_validator
 
 from app.core.schema import BaseSchema, BaseSchemaRead
 from app.db.validators import validate_url_optional, validate_url_required
+from app.entities.core_job.schemas import JobStatus
 
 
 @unique
@@ -80,6 +81,18 @@ class WebsitePageUpdate(BaseSchema):
     _validate_url = field_validator("url", mode="before")(validate_url_optional)
 
 
+class WebsitePageSitemapUpsert(BaseSchema):
+    url: str
+    url_hash: str
+    priority: Union[float, Decimal]
+    last_modified: datetime | None = None
+    change_frequency: SitemapPageChangeFrequency | None = None
+    is_active: bool = True
+    from_sitemap: bool = True
+    website_id: UUID4
+    sitemap_id: UUID4 | None = None
+
+
 class WebsitePageRead(WebsitePageBase, BaseSchemaRead):
     id: UUID4
 
@@ -93,3 +106,23 @@ class WebsitePagePSIProcessing(BaseModel):
 class WebsitePageKWCProcessing(BaseModel):
     page: WebsitePageRead
     kwc_task_id: UUID4 | str | Any | None
+
+
+class WebsiteSitemapSync(BaseModel):
+    sitemap_url: str | None = None
+
+
+class WebsiteSitemapSyncProgress(BaseModel):
+    website_id: UUID4
+    sitemap_url: str
+    job_id: UUID4 | None = None
+    status: JobStatus = JobStatus.running
+    sitemaps: int = 0
+    unchanged_sitemaps: int = 0
+    failed_sitemaps: int = 0
+    pages: int = 0
+    skipped: int = 0
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
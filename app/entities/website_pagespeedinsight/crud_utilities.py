@@ -1,8 +1,15 @@
+import asyncio
+from uuid import UUID
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.logger import logger
+from app.core.pagespeed import PageSpeedInsightsClient, psi_client
 from app.db.session import get_db_session
 from app.entities.api.errors import EntityNotFound
+from app.entities.core_job.model import Job
+from app.entities.core_job.schemas import JobStatus
 from app.entities.website.crud import WebsiteRepository
 from app.entities.website.model import Website
 from app.entities.website_page.crud import WebsitePageRepository
@@ -11,9 +18,14 @@ from app.entities.website_pagespeedinsight.crud import (
     WebsitePageSpeedInsightsRepository,
 )
 from app.entities.website_pagespeedinsight.schemas import (
+    PageSpeedInsightsDevice,
+    PSIBatchStatus,
+    PSIDevice,
     WebsitePageSpeedInsightsBase,
+    WebsitePageSpeedInsightsBatchProgress,
     WebsitePageSpeedInsightsCreate,
 )
+from app.entities.website_pagespeedinsight.utilities import fetch_pagespeedinsights
 from app.utilities import parse_id
 
 
@@ -22,48 +34,183 @@ async def create_website_pagespeedinsights(
     page_id: str,
     insights: WebsitePageSpeedInsightsBase,
 ) -> None:
-    try:
-        website_uuid = parse_id(website_id)
-        page_uuid = parse_id(page_id)
-        session: AsyncSession
-        website: Website | None
-        website_page: WebsitePage | None
-        # check if website exists
-        async with get_db_session() as session:
-            websites_repo: WebsiteRepository = WebsiteRepository(session)
-            website = await websites_repo.read(
-                entry_id=website_uuid,
+    website_uuid = parse_id(website_id)
+    page_uuid = parse_id(page_id)
+    session: AsyncSession
+    website: Website | None
+    website_page: WebsitePage | None
+    # check if website exists
+    async with get_db_session() as session:
+        websites_repo: WebsiteRepository = WebsiteRepository(session)
+        website = await websites_repo.read(
+            entry_id=website_uuid,
+        )
+    if website is None:
+        raise EntityNotFound(entity_info=f"Website {website_id}")
+    # check if page exists
+    async with get_db_session() as session:
+        pages_repo: WebsitePageRepository = WebsitePageRepository(session)
+        website_page = await pages_repo.read(
+            entry_id=page_uuid,
+        )
+    if website_page is None:
+        raise EntityNotFound(entity_info=f"WebsitePage {page_id}")
+    # create website page speed insights
+    async with get_db_session() as session:
+        psi_repo: WebsitePageSpeedInsightsRepository = (
+            WebsitePageSpeedInsightsRepository(session)
+        )
+        website_page_psi = await psi_repo.create(
+            schema=WebsitePageSpeedInsightsCreate(
+                strategy=insights.strategy,
+                score_grade=insights.score_grade,
+                grade_data=insights.grade_data,
+                page_id=website_page.id,
+                website_id=website.id,
             )
-        if website is None:
-            raise EntityNotFound(entity_info=f"Website {website_id}")
-        # check if page exists
-        async with get_db_session() as session:
-            pages_repo: WebsitePageRepository = WebsitePageRepository(session)
-            website_page = await pages_repo.read(
-                entry_id=page_uuid,
-            )
-        if website_page is None:
-            raise EntityNotFound(entity_info=f"WebsitePage {page_id}")
-        # create website page speed insights
-        async with get_db_session() as session:
-            psi_repo: WebsitePageSpeedInsightsRepository = (
-                WebsitePageSpeedInsightsRepository(session)
+        )
+        logger.info(
+            "Created Website Page Speed Insights for Website[{}] and Page[{}]".format(
+                website_page_psi.website_id, website_page_psi.page_id
             )
-            website_page_psi = await psi_repo.create(
-                schema=WebsitePageSpeedInsightsCreate(
-                    strategy=insights.strategy,
-                    score_grade=insights.score_grade,
-                    grade_data=insights.grade_data,
-                    page_id=website_page.id,
-                    website_id=website.id,
-                )
-            )
-            logger.info(
-                "Created Website Page Speed Insights for Website[{}] and Page[{}]".format(
-                    website_page_psi.website_id, website_page_psi.page_id
+        )
+
+
+# the status of a website page speed insights batch by the status of its job
+PSI_BATCH_JOB_STATUS: dict[str, PSIBatchStatus] = {
+    JobStatus.queued.value: PSIBatchStatus.queued,
+    JobStatus.running.value: PSIBatchStatus.running,
+    JobStatus.succeeded.value: PSIBatchStatus.finished,
+    JobStatus.failed.value: PSIBatchStatus.failed,
+}
+
+
+def website_pagespeedinsights_batch_key(website_id: UUID) -> str:
+    """The idempotency key of the page speed insights batch job of a website."""
+    return f"website-psi:{website_id}"
+
+
+def website_pagespeedinsights_batch_progress(
+    job: Job,
+) -> WebsitePageSpeedInsightsBatchProgress:
+    """The progress of a batch job, its last reported counters and its status."""
+    values: dict = {**job.payload, **(job.result or {})}
+    values["job_id"] = job.id
+    values["status"] = PSI_BATCH_JOB_STATUS[job.status]
+    return WebsitePageSpeedInsightsBatchProgress.model_validate(values)
+
+
+async def run_website_pagespeedinsights_batch(
+    progress: WebsitePageSpeedInsightsBatchProgress,
+    workers: int | None = None,
+    write_size: int | None = None,
+    client: PageSpeedInsightsClient = psi_client,
+) -> WebsitePageSpeedInsightsBatchProgress:
+    """Fetch page speed insights for every active page of a website.
+
+    The active pages are read a keyset chunk at a time, each chunk in its own
+    short session, into a bounded queue that `workers` tasks drain, the fetched insights are created `write_size` at a
+    time. The counters of `progress` are updated as the batch runs.
+
+    When the pages can not be queued the workers are stopped, the insights
+    already fetched are written and the error is raised, so the job fails or
+    is retried.
+    """
+    workers = workers or settings.cloud.psi_batch_workers
+    write_size = write_size or settings.cloud.psi_batch_write_size
+    queue: asyncio.Queue[tuple[UUID, str, PSIDevice] | None] = asyncio.Queue(
+        maxsize=workers * 2
+    )
+    results: list[WebsitePageSpeedInsightsCreate] = []
+    write_lock: asyncio.Lock = asyncio.Lock()
+
+    async def write_results(force: bool = False) -> None:
+        async with write_lock:
+            if not results or (len(results) < write_size and not force):
+                return
+            batch = results[:]
+            results.clear()
+            try:
+                async with get_db_session() as session:
+                    psi_repo: WebsitePageSpeedInsightsRepository = (
+                        WebsitePageSpeedInsightsRepository(session)
+                    )
+                    await psi_repo.create_many(batch)
+                progress.saved += len(batch)
+            except Exception as e:  # pragma: no cover
+                logger.warning("Error Saving Website Page Speed Insights: %s" % e)
+                progress.failed += len(batch)
+
+    async def fetch_worker() -> None:
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            page_id, fetch_url, device = job
+            insights: WebsitePageSpeedInsightsBase | None = None
+            try:
+                insights = await fetch_pagespeedinsights(
+                    fetch_url, PageSpeedInsightsDevice(device=device), client
                 )
+                if insights is not None:
+                    results.append(
+                        WebsitePageSpeedInsightsCreate(
+                            **insights.model_dump(),
+                            page_id=page_id,
+                            website_id=progress.website_id,
+                        )
+                    )
+            except Exception as e:  # pragma: no cover
+                logger.warning("Error Fetching Page Speed Insights: %s" % e)
+                insights = None
+            if insights is None:
+                progress.failed += 1
+                continue
+            progress.fetched += 1
+            await write_results()
+
+    tasks: list[asyncio.Task] = [
+        asyncio.create_task(fetch_worker()) for _ in range(workers)
+    ]
+    try:
+        async with get_db_session() as session:
+            website: Website | None = await WebsiteRepository(session).read(
+                entry_id=progress.website_id
             )
-    except Exception as e:
-        logger.warning("Error Creating or Updating Website Page Speed Insights: %s" % e)
+        if website is None:
+            raise EntityNotFound(entity_info=f"Website {progress.website_id}")
+        link: str = website.get_link()
+        chunk_size: int = settings.db.bulk_chunk_size
+        after_id: UUID | None = None
+        while True:
+            # no connection is held while the queue waits on the workers
+            async with get_db_session() as session:
+                pages: list[tuple[UUID, str]] = await WebsitePageRepository(
+                    session
+                ).read_active_urls(progress.website_id, after_id, chunk_size)
+            for page_id, url in pages:
+                progress.pages += 1
+                for device in progress.devices:
+                    await queue.put((page_id, link + url, device))
+                    progress.queued += 1
+            if len(pages) < chunk_size:
+                break
+            after_id = pages[-1][0]
+    except BaseException as e:
+        logger.warning("Error Queueing Website Page Speed Insights: %s" % e)
+        # the workers stop after their current page, the queued pages are dropped
+        while not queue.empty():
+            queue.get_nowait()
+        raise
     finally:
-        return None
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+        await write_results(force=True)
+    progress.status = PSIBatchStatus.finished
+    logger.info(
+        "Finished Website Page Speed Insights for Website[{}]: {}".format(
+            progress.website_id, progress
+        )
+    )
+    return progress
@@ -97,7 +97,12 @@ async def website_page_speed_insights_list(
     ] = await permissions.get_paginated_resource_response(
         table_name=WebsitePageSpeedInsights.__tablename__,
         stmt=select_stmt,
-        page_params=PageParams(page=query.page, size=query.size),
+        page_params=PageParams(
+            page=query.page,
+            size=query.size,
+            include_total=query.include_total,
+            cursor=query.cursor,
+        ),
         responses={
             RoleAdmin: WebsitePageSpeedInsightsRead,
             RoleManager: WebsitePageSpeedInsightsRead,
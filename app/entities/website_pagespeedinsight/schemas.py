@@ -15,6 +15,13 @@ class PSIDevice(str, Enum):
     mobile = "mobile"
 
 
+class PSIBatchStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    finished = "finished"
+    failed = "failed"
+
+
 class PageSpeedInsightsDevice(BaseModel):
     device: PSIDevice
 
@@ -56,3 +63,15 @@ class WebsitePageSpeedInsightsUpdate(BaseSchema):
 class WebsitePageSpeedInsightsRead(WebsitePageSpeedInsightsBase, BaseSchemaRead):
     page_id: UUID4
     website_id: UUID4
+
+
+class WebsitePageSpeedInsightsBatchProgress(BaseModel):
+    website_id: UUID4
+    devices: list[PSIDevice]
+    job_id: UUID4 | None = None
+    status: PSIBatchStatus = PSIBatchStatus.running
+    pages: int = 0
+    queued: int = 0
+    fetched: int = 0
+    failed: int = 0
+    saved: int = 0
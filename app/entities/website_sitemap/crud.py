@@ -0,0 +1,73 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select as sql_select
+
+from app.core.crud import BaseRepository
+from app.entities.tracking_link.utilities import hash_url
+from app.entities.website_sitemap.model import WebsiteSitemap
+from app.entities.website_sitemap.schemas import (
+    WebsiteSitemapCreate,
+    WebsiteSitemapRead,
+    WebsiteSitemapUpdate,
+)
+
+
+class WebsiteSitemapRepository(
+    BaseRepository[
+        WebsiteSitemapCreate, WebsiteSitemapRead, WebsiteSitemapUpdate, WebsiteSitemap
+    ]
+):
+    @property
+    def _table(self) -> WebsiteSitemap:
+        return WebsiteSitemap
+
+    @property
+    def _natural_key(self) -> tuple[str, ...]:
+        return ("website_id", "url_hash")
+
+    async def read_by_url(self, website_id: UUID, url: str) -> WebsiteSitemap | None:
+        return await self.exists_by_fields(
+            {"website_id": website_id, "url_hash": hash_url(url)}
+        )
+
+    async def read_by_website(self, website_id: UUID) -> Sequence[WebsiteSitemap]:
+        self._db.begin()
+        results: Any = await self._db.execute(
+            sql_select(self._table).where(self._table.website_id == website_id)
+        )
+        return results.scalars().all()
+
+    async def read_children(self, parent_id: UUID) -> Sequence[WebsiteSitemap]:
+        self._db.begin()
+        results: Any = await self._db.execute(
+            sql_select(self._table).where(self._table.parent_id == parent_id)
+        )
+        return results.scalars().all()
+
+    async def record_read(
+        self,
+        entry: WebsiteSitemap,
+        is_index: bool,
+        etag: str | None,
+        last_modified: str | None,
+        lastmod: datetime | None,
+        parent_id: UUID | None,
+        synced_at: datetime,
+    ) -> WebsiteSitemap:
+        """Store the validators of the response a sitemap was read from.
+
+        Unlike `update`, validators the server no longer sends are cleared.
+        """
+        self._db.begin()
+        entry.is_index = is_index
+        entry.etag = etag
+        entry.last_modified = last_modified
+        entry.lastmod = lastmod
+        entry.parent_id = parent_id
+        entry.synced_at = synced_at
+        self._db.add(entry)
+        await self._commit()
+        return entry
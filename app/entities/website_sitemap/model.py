@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from pydantic import UUID4
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy_utils import UUIDType
+
+from app.db.base_class import Base
+from app.db.constants import DB_STR_TINYTEXT_MAXLEN_INPUT, DB_STR_URLPATH_MAXLEN_INPUT
+from app.entities.tracking_link.utilities import hash_url
+from app.services.permission import (
+    AccessRead,
+    AclAction,
+    AclPermission,
+    AclPrivilege,
+    RoleUser,
+)
+from app.utilities.uuids import get_uuid
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.entities.website.model import Website
+
+
+class WebsiteSitemap(Base):
+    __tablename__: str = "website_sitemap"
+    __table_args__: tuple = (
+        UniqueConstraint("website_id", "url_hash"),
+        {"mysql_engine": "InnoDB"},
+    )
+    __mapper_args__: dict = {"always_refresh": True}
+    id: Mapped[UUID4] = mapped_column(
+        UUIDType(binary=False),
+        index=True,
+        unique=True,
+        primary_key=True,
+        nullable=False,
+        default=get_uuid,
+    )
+    url: Mapped[str] = mapped_column(
+        String(DB_STR_URLPATH_MAXLEN_INPUT), nullable=False
+    )
+    url_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    is_index: Mapped[bool] = mapped_column(Boolean(), nullable=False, default=False)
+    # the validators of the last response read, sent with the next request
+    etag: Mapped[str | None] = mapped_column(
+        String(DB_STR_TINYTEXT_MAXLEN_INPUT), nullable=True
+    )
+    last_modified: Mapped[str | None] = mapped_column(
+        String(DB_STR_TINYTEXT_MAXLEN_INPUT), nullable=True
+    )
+    # the lastmod of the sitemap in its index when it was last read
+    lastmod: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    synced_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    # relationships
+    website_id: Mapped[UUID4] = mapped_column(
+        UUIDType(binary=False), ForeignKey("website.id"), index=True, nullable=False
+    )
+    website: Mapped["Website"] = relationship("Website", back_populates="sitemaps")
+    parent_id: Mapped[UUID4 | None] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("website_sitemap.id", ondelete="SET NULL"),
+        index=True,
+        nullable=True,
+    )
+
+    # validators
+    @validates("url")
+    def validate_url(self, key: str, value: str) -> str:
+        """Keep the url hash in sync with the url."""
+        self.url_hash = hash_url(value)
+        return value
+
+    def __acl__(
+        self,
+    ) -> list[tuple[AclAction, AclPrivilege, AclPermission]]:  # pragma: no cover
+        return [
+            # read
+            (AclAction.allow, RoleUser, AccessRead),
+        ]
+
+    def __repr__(self) -> str:  # pragma: no cover
+        repr_str: str = f"Sitemap({self.id}, Site[{self.website_id}], {self.url})"
+        return repr_str
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from pydantic import UUID4
+
+from app.core.schema import BaseSchema, BaseSchemaRead
+
+
+class WebsiteSitemapBase(BaseSchema):
+    url: str
+    is_index: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+    lastmod: datetime | None = None
+    synced_at: datetime | None = None
+    website_id: UUID4
+    parent_id: UUID4 | None = None
+
+
+class WebsiteSitemapCreate(WebsiteSitemapBase):
+    pass
+
+
+class WebsiteSitemapUpdate(BaseSchema):
+    is_index: bool | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    lastmod: datetime | None = None
+    synced_at: datetime | None = None
+    parent_id: UUID4 | None = None
+
+
+class WebsiteSitemapRead(WebsiteSitemapBase, BaseSchemaRead):
+    id: UUID4
+    url_hash: str
@@ -3,12 +3,20 @@ from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI
 from sentry_sdk import Client
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.api.exceptions import configure_exceptions
 from app.api.middleware import configure_middleware
 from app.config import ApiModes, settings
+from app.core.ipinfo import ipinfo_handler
+from app.core.logger import logger
+from app.core.pagespeed import psi_client
+from app.core.sitemap import sitemap_client
 from app.core.templates import static_files
+from app.db.pool import get_pool_stats, warm_up_pool
+from app.db.session import async_engine, replica_engines
 from app.services.csrf import CsrfProtect, CsrfSettings
+from app.services.encryption import shutdown_cipher_executor
 from app.services.sentry import configure_sentry_monitoring
 
 if settings.api.mode != ApiModes.test.value:  # pragma: no cover
@@ -21,7 +29,18 @@ async def application_lifespan(app: FastAPI) -> AsyncGenerator:  # pragma: no co
     def get_csrf_config() -> CsrfSettings:
         return CsrfSettings()
 
+    engines: list[AsyncEngine] = [async_engine, *replica_engines]
+    for engine in engines:
+        opened: int = await warm_up_pool(engine, settings.db.pool_warmup)
+        logger.info("Opened {} database connections".format(opened))
     yield
+    for engine in engines:
+        logger.info("Database pool: {}".format(get_pool_stats(engine)))
+        await engine.dispose()
+    shutdown_cipher_executor()
+    await psi_client.aclose()
+    await sitemap_client.aclose()
+    await ipinfo_handler.deinit()
 
 
 def configure_routers(app: FastAPI) -> None:
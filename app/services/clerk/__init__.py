@@ -1,13 +1,16 @@
 from .controller import ClerkAuth, ClerkHTTPBearer
 from .errors import ClerkUnauthenticatedException, ClerkUnauthorizedException
 from .exceptions import configure_clerk_authorization_exceptions
-from .schemas import ClerkUser
+from .schemas import ClerkUser, ClerkVerifiedToken
 from .settings import ClerkSettings, clerk_settings, get_clerk_settings
 
 clerk_controller = ClerkAuth(
     secret_key=clerk_settings.secret_key,
     issuer=clerk_settings.issuer,
     pem_public_key=clerk_settings.pem_public_key,
+    user_cache_ttl=clerk_settings.user_cache_ttl,
+    user_cache_maxsize=clerk_settings.user_cache_maxsize,
+    token_cache_maxsize=clerk_settings.token_cache_maxsize,
 )
 
 __all__: list[str] = [
@@ -17,6 +20,7 @@ __all__: list[str] = [
     "ClerkUnauthorizedException",
     "configure_clerk_authorization_exceptions",
     "ClerkUser",
+    "ClerkVerifiedToken",
     "ClerkSettings",
     "clerk_settings",
     "get_clerk_settings",
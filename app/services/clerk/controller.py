@@ -1,18 +1,22 @@
 import json
 import logging
-from typing import Type
+import time
+from hashlib import sha256
+from typing import Any, Type
 
 import jwt
 from clerk_backend_api import Clerk
 from clerk_backend_api.models.user import User
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jwt.algorithms import RSAAlgorithm
 from pydantic import ValidationError
 
 from app.config import ApiModes, settings
+from app.core.cache import MonitoredTLRUCache, MonitoredTTLCache, SingleFlight
 
 from .errors import ClerkUnauthenticatedException, ClerkUnauthorizedException
-from .schemas import ClerkUser
+from .schemas import ClerkUser, ClerkVerifiedToken
 
 logger = logging.getLogger("clerk_auth")
 
@@ -30,20 +34,93 @@ class ClerkAuth:
         pem_public_key: str,
         auto_error: bool = True,
         user_model: Type[ClerkUser] = ClerkUser,
+        user_cache_ttl: int = 300,
+        user_cache_maxsize: int = 10000,
+        token_cache_maxsize: int = 10000,
     ):
         self.secret_key = secret_key
         self.issuer = issuer
         public_key = json.loads(pem_public_key)
         self.pem_public_key = public_key["public_key"]
         self.algorithms = ["RS256"]
+        # parse the pem once, jwt.decode would re-parse a pem string every call
+        self.public_key: Any = RSAAlgorithm(RSAAlgorithm.SHA256).prepare_key(
+            self.pem_public_key
+        )
 
         self.auto_error = auto_error
         self.auth_user_model = user_model
 
+        # one long-lived clerk client, verified user ids are cached for a ttl
+        self._clerk: Clerk | None = None
+        self.user_cache: MonitoredTTLCache[str, bool] = MonitoredTTLCache(
+            maxsize=user_cache_maxsize, ttl=user_cache_ttl
+        )
+        self._user_lookups: SingleFlight[str, bool] = SingleFlight()
+
+        # verified token claims are cached by token digest until the token expires
+        self.token_cache: MonitoredTLRUCache[str, ClerkVerifiedToken] = (
+            MonitoredTLRUCache(
+                maxsize=token_cache_maxsize,
+                ttu=lambda key, value, now: value.exp,
+                timer=time.time,
+            )
+        )
+
         # self.implicit_scheme = HTTPAuthorizationCredentials(
         #     scheme_name="ClerkHTTPBearer",
         # )
 
+    @property
+    def clerk(self) -> Clerk:
+        if self._clerk is None:  # pragma: no cover
+            self._clerk = Clerk(bearer_auth=self.secret_key)
+        return self._clerk
+
+    async def fetch_user_exists(self, user_id: str) -> bool:  # pragma: no cover
+        users: list[User] | None = await self.clerk.users.list_async(user_id=[user_id])
+        return users is not None and len(users) > 0
+
+    async def verify_user_exists(self, user_id: str) -> bool:
+        """Check the user exists in Clerk, caching verified user ids for a ttl.
+
+        Concurrent lookups for the same user id share one request to Clerk.
+        """
+        if self.user_cache.lookup(user_id):
+            return True
+        user_exists: bool = await self._user_lookups.do(
+            user_id, lambda: self.fetch_user_exists(user_id)
+        )
+        if user_exists:
+            self.user_cache[user_id] = True
+        return user_exists
+
+    def decode_token(self, token: str) -> ClerkVerifiedToken:
+        """Verify the token signature and claims, returning the token user.
+
+        Verified tokens are cached by their digest until the token `exp`, so a
+        repeated token skips the RSA signature verification.
+        """
+        token_digest: str = sha256(token.encode("utf-8")).hexdigest()
+        verified: ClerkVerifiedToken | None = self.token_cache.lookup(token_digest)
+        if verified is not None:
+            return verified
+        token_data: dict = jwt.decode(
+            token,
+            self.public_key,
+            algorithms=self.algorithms,
+            issuer=self.issuer,
+            options={"require": ["sub"]},
+        )
+        verified = ClerkVerifiedToken(
+            sub=token_data["sub"],
+            exp=token_data.get("exp", None),
+            user=self.auth_user_model(**token_data),
+        )
+        if verified.exp is not None:
+            self.token_cache[token_digest] = verified
+        return verified
+
     async def get_user(
         self,
         creds: HTTPAuthorizationCredentials | None = Depends(
@@ -58,23 +135,12 @@ class ClerkAuth:
             else:
                 return None
         token = creds.credentials
-        token_data: dict = {}
         try:
-            token_data = jwt.decode(
-                token,
-                self.pem_public_key,
-                algorithms=["RS256"],
-                issuer=self.issuer,
-            )
-            user_id = token_data.get("sub", None)
-            if user_id is None:  # pragma: no cover
-                raise Exception("user_id not in token payload")
+            verified: ClerkVerifiedToken = self.decode_token(token)
             if settings.api.mode != ApiModes.test.value:  # pragma: no cover
-                clerk = Clerk(bearer_auth=self.secret_key)
-                users: list[User] | None = clerk.users.list(user_id=[user_id])
-                if len(users) == 0:
+                if not await self.verify_user_exists(verified.sub):
                     raise Exception("User not found")
-            return self.auth_user_model(**token_data)
+            return verified.user
         except ValidationError as e:  # pragma: no cover
             logger.error(f'Handled exception parsing ClerkUser: "{e}"', exc_info=True)
             if self.auto_error:
@@ -13,3 +13,9 @@ class ClerkUser(BaseModel):
     is_verified: bool | None = Field(False)
     created_at: datetime | None = Field(None)
     updated_at: datetime | None = Field(None)
+
+
+class ClerkVerifiedToken(BaseModel):
+    sub: str
+    exp: float | None = None
+    user: ClerkUser
@@ -12,6 +12,9 @@ class ClerkSettings(BaseSettings):
     issuer: str = environ.get("CLERK_ISSUER", "")
     pem_public_key: str = environ.get("CLERK_PEM_PUBLIC_KEY", "")
     default_picture: str = "https://www.gravatar.com/avatar/?d=identicon"
+    user_cache_ttl: int = int(environ.get("CLERK_USER_CACHE_TTL", 300))
+    user_cache_maxsize: int = int(environ.get("CLERK_USER_CACHE_MAXSIZE", 10000))
+    token_cache_maxsize: int = int(environ.get("CLERK_TOKEN_CACHE_MAXSIZE", 10000))
 
     first_admin: str = environ.get("CLERK_FIRST_ADMIN", "")
     first_admin_auth_id: str = environ.get("CLERK_FIRST_ADMIN_CLERK_ID", "")
@@ -1,4 +1,11 @@
-from .cipher import SecureMessage
+from .batch import (
+    decrypt_and_verify_many,
+    get_cipher_executor,
+    shutdown_cipher_executor,
+    sign_and_encrypt_many,
+)
+from .blind_index import blind_index
+from .cipher import SecureMessage, get_secure_message
 from .errors import (
     CipherError,
     DecryptionError,
@@ -6,20 +13,47 @@ from .errors import (
     SignatureVerificationError,
 )
 from .exceptions import configure_encryption_exceptions
-from .keys import load_api_keys
-from .schemas import EncryptedMessage, PlainMessage
+from .keys import (
+    derive_aes_key,
+    derive_blind_index_key,
+    derive_mac_key,
+    load_api_keys,
+)
+from .schemas import (
+    CipherMode,
+    EncryptedMessage,
+    EncryptedMessageBatch,
+    MessageBatchItem,
+    MessageBatchResult,
+    PlainMessage,
+    PlainMessageBatch,
+)
 from .settings import EncryptionSettings, encryption_settings, get_encryption_settings
 
 __all__: list[str] = [
     "load_api_keys",
+    "derive_aes_key",
+    "derive_mac_key",
+    "derive_blind_index_key",
+    "blind_index",
     "SecureMessage",
+    "get_secure_message",
     "configure_encryption_exceptions",
     "CipherError",
     "SignatureVerificationError",
     "EncryptionError",
     "DecryptionError",
+    "CipherMode",
     "EncryptedMessage",
+    "EncryptedMessageBatch",
+    "MessageBatchItem",
+    "MessageBatchResult",
     "PlainMessage",
+    "PlainMessageBatch",
+    "get_cipher_executor",
+    "shutdown_cipher_executor",
+    "sign_and_encrypt_many",
+    "decrypt_and_verify_many",
     "EncryptionSettings",
     "get_encryption_settings",
     "encryption_settings",
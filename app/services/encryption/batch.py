@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TypeVar
+
+from .cipher import SecureMessage
+from .errors import CipherError
+from .schemas import MessageBatchItem
+from .settings import encryption_settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_cipher_executor() -> ThreadPoolExecutor:
+    """The bounded thread pool that signs and verifies batches of messages.
+
+    The RSA modular exponentiation of pycryptodome runs in C without holding the
+    GIL, so the threads sign in parallel and keep the event loop free.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=encryption_settings.encryption_batch_workers,
+                    thread_name_prefix="cipher",
+                )
+    return _executor
+
+
+def shutdown_cipher_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def _run_batch(
+    func: Callable[[T], object], values: list[T]
+) -> list[MessageBatchItem]:
+    loop = asyncio.get_running_loop()
+    executor = get_cipher_executor()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, partial(func, value)) for value in values),
+        return_exceptions=True,
+    )
+    items: list[MessageBatchItem] = []
+    for result in results:
+        if isinstance(result, CipherError):
+            items.append(MessageBatchItem(error=result.message))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            items.append(MessageBatchItem(message=str(result)))
+    return items
+
+
+async def sign_and_encrypt_many(
+    secure: SecureMessage, values: list[str]
+) -> list[MessageBatchItem]:
+    """Sign and encrypt each value in the cipher pool, in the order given."""
+    return await _run_batch(secure.sign_and_encrypt, values)
+
+
+async def decrypt_and_verify_many(
+    secure: SecureMessage, ciphertexts: list[str]
+) -> list[MessageBatchItem]:
+    """Decrypt and verify each ciphertext in the cipher pool, in the order given.
+
+    A ciphertext that does not decrypt or verify is reported on its own item,
+    the other items of the batch still decrypt.
+    """
+    return await _run_batch(
+        partial(secure.decrypt_and_verify, data_type=str), ciphertexts
+    )
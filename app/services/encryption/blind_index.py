@@ -0,0 +1,17 @@
+import hashlib
+import hmac
+
+from .keys import derive_blind_index_key
+from .settings import encryption_settings
+
+
+def blind_index(value: str, key: str | None = None) -> str:
+    """Keyed HMAC-SHA256 digest of a value, used to look up encrypted columns.
+
+    The hex digest is fixed width and deterministic for the same key, so it can
+    be stored in a unique index without exposing the plaintext value.
+    """
+    index_key: bytes = derive_blind_index_key(
+        key or encryption_settings.blind_index_key or encryption_settings.encryption_key
+    )
+    return hmac.new(index_key, value.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -1,29 +1,80 @@
+import hashlib
+import hmac
 import logging
+import threading
 from base64 import urlsafe_b64decode, urlsafe_b64encode
 
 from Crypto.Cipher import AES
 from Crypto.Cipher._mode_cbc import CbcMode
 from Crypto.Hash import SHA256
-from Crypto.Protocol.KDF import PBKDF2
 from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
 from Crypto.Signature import PKCS1_v1_5
 from Crypto.Util.Padding import pad, unpad
 
 from .errors import DecryptionError, EncryptionError, SignatureVerificationError
-from .keys import load_api_keys
+from .keys import derive_aes_key, derive_mac_key, load_api_keys
+from .schemas import CipherMode
 
 logger = logging.getLogger("SecureMessage")
 
+# envelope version bytes of the authenticated symmetric modes
+GCM_VERSION: bytes = b"\x01"
+HMAC_VERSION: bytes = b"\x02"
+NONCE_SIZE: int = 12
+GCM_TAG_SIZE: int = 16
+HMAC_SIZE: int = 32
+
 
 class SecureMessage:
-    def __init__(self, pass_key: str, salt: str) -> None:
+    """Sign values with the API RSA key and encrypt them with AES.
+
+    Values that only need integrity can skip the RSA signature with the
+    `aes_gcm` or `aes_hmac` mode, which seal the value in a smaller envelope
+    starting with a version byte. `decrypt_and_verify` detects the mode.
+
+    The derived AES key and the parsed RSA keys are cached per process, see
+    `get_secure_message` for the shared instance. After `rotate_key` values
+    are encrypted with the new key while messages encrypted with up to
+    `max_previous_keys` earlier keys still decrypt.
+    """
+
+    def __init__(
+        self,
+        pass_key: str,
+        salt: str,
+        max_previous_keys: int = 1,
+        mode: CipherMode = CipherMode.rsa_signed,
+    ) -> None:
         self.block_size: int = AES.block_size
-        self.aes_key: bytes = PBKDF2(pass_key, salt.encode("utf-8"), dkLen=32)
+        self.mode: CipherMode = mode
+        self.max_previous_keys: int = max_previous_keys
+        # the current aes key first, swapped as a whole when the key rotates
+        self.aes_keys: tuple[bytes, ...] = (derive_aes_key(pass_key, salt),)
         self.public_key: RSA.RsaKey
         self.private_key: RSA.RsaKey
         self.public_key, self.private_key = load_api_keys()
         self.salt = salt
+        self._lock = threading.Lock()
+
+    @property
+    def aes_key(self) -> bytes:
+        return self.aes_keys[0]
+
+    def rotate_key(self, pass_key: str, salt: str) -> bool:
+        """Encrypt with the key derived from a new pass key and salt.
+
+        Returns `False` when the key is already the current key.
+        """
+        aes_key = derive_aes_key(pass_key, salt)
+        if aes_key == self.aes_key:
+            return False
+        with self._lock:
+            previous = [k for k in self.aes_keys if k != aes_key]
+            self.aes_keys = (aes_key, *previous[: self.max_previous_keys])
+            self.public_key, self.private_key = load_api_keys()
+            self.salt = salt
+        return True
 
     def _serialize_value(self, value: bool | str | int) -> bytes:
         if isinstance(value, bool):
@@ -47,9 +98,20 @@ class SecureMessage:
         else:
             raise TypeError("Unsupported data type for decryption")
 
-    def sign_and_encrypt(self, value: bool | str | int) -> str:
+    def sign_and_encrypt(
+        self, value: bool | str | int, mode: CipherMode | None = None
+    ) -> str:
         try:
             serialized_value = self._serialize_value(value)
+            mode = mode or self.mode
+            if mode == CipherMode.aes_gcm:
+                return urlsafe_b64encode(self._seal_gcm(serialized_value)).decode(
+                    "utf-8"
+                )
+            if mode == CipherMode.aes_hmac:
+                return urlsafe_b64encode(self._seal_hmac(serialized_value)).decode(
+                    "utf-8"
+                )
             # Sign the value
             signer = PKCS1_v1_5.new(self.private_key)
             digest = SHA256.new()
@@ -70,24 +132,120 @@ class SecureMessage:
     def decrypt_and_verify(
         self, ciphertext: str, data_type: type[bool] | type[str] | type[int]
     ) -> object:
+        """Decrypt a value encrypted in any of the cipher modes.
+
+        Envelopes starting with a known version byte are opened with the
+        matching mode, anything else is decrypted as an RSA signed message.
+        """
         try:
-            # Decode the ciphertext and extract the IV
+            # Decode the ciphertext and open the envelope of its mode
             decoded = urlsafe_b64decode(ciphertext)
-            iv, deciphertext = decoded[:16], decoded[16:]
+            serialized_value = self._open_envelope(decoded)
+            if serialized_value is None:
+                serialized_value = self._decrypt_signed(decoded)
+            return self._deserialize_value(serialized_value, data_type)
+        except SignatureVerificationError as e:
+            raise SignatureVerificationError(message=e.message)
+        except Exception as e:
+            logger.exception(e)
+            raise DecryptionError()
+
+    def _decrypt_signed(self, decoded: bytes) -> bytes:
+        iv, deciphertext = decoded[:16], decoded[16:]
+        aes_keys = self.aes_keys
+        for i, aes_key in enumerate(aes_keys):
             # Decrypt the value and the signature
-            cipher: CbcMode = AES.new(self.aes_key, AES.MODE_CBC, iv=iv)
-            plaintext = unpad(cipher.decrypt(deciphertext), self.block_size)
+            cipher: CbcMode = AES.new(aes_key, AES.MODE_CBC, iv=iv)
+            try:
+                plaintext = unpad(cipher.decrypt(deciphertext), self.block_size)
+            except ValueError:
+                if i + 1 < len(aes_keys):
+                    continue  # encrypted with a previous key
+                raise
             serialized_value, signature = plaintext[:-256], plaintext[-256:]
             # Verify the signature
             verifier = PKCS1_v1_5.new(self.public_key)
             digest = SHA256.new()
             digest.update(serialized_value)
             if verifier.verify(digest, signature):
-                return self._deserialize_value(serialized_value, data_type)
-            else:
-                raise SignatureVerificationError()
-        except SignatureVerificationError as e:
-            raise SignatureVerificationError(message=e.message)
-        except Exception as e:
-            logger.exception(e)
-            raise DecryptionError()
+                return serialized_value
+        raise SignatureVerificationError()
+
+    def _seal_gcm(self, serialized_value: bytes) -> bytes:
+        nonce = get_random_bytes(NONCE_SIZE)
+        cipher = AES.new(self.aes_key, AES.MODE_GCM, nonce=nonce)
+        cipher.update(GCM_VERSION)
+        ciphertext, tag = cipher.encrypt_and_digest(serialized_value)
+        return GCM_VERSION + nonce + ciphertext + tag
+
+    def _open_gcm(self, aes_key: bytes, envelope: bytes) -> bytes | None:
+        if len(envelope) < 1 + NONCE_SIZE + GCM_TAG_SIZE:
+            return None
+        nonce = envelope[1 : 1 + NONCE_SIZE]
+        ciphertext, tag = (
+            envelope[1 + NONCE_SIZE : -GCM_TAG_SIZE],
+            envelope[-GCM_TAG_SIZE:],
+        )
+        cipher = AES.new(aes_key, AES.MODE_GCM, nonce=nonce)
+        cipher.update(GCM_VERSION)
+        try:
+            return cipher.decrypt_and_verify(ciphertext, tag)
+        except ValueError:
+            return None
+
+    def _seal_hmac(self, serialized_value: bytes) -> bytes:
+        nonce = get_random_bytes(NONCE_SIZE)
+        cipher = AES.new(self.aes_key, AES.MODE_CTR, nonce=nonce)
+        body = HMAC_VERSION + nonce + cipher.encrypt(serialized_value)
+        mac = hmac.new(derive_mac_key(self.aes_key), body, hashlib.sha256).digest()
+        return body + mac
+
+    def _open_hmac(self, aes_key: bytes, envelope: bytes) -> bytes | None:
+        if len(envelope) < 1 + NONCE_SIZE + HMAC_SIZE:
+            return None
+        body, mac = envelope[:-HMAC_SIZE], envelope[-HMAC_SIZE:]
+        expected = hmac.new(derive_mac_key(aes_key), body, hashlib.sha256).digest()
+        if not hmac.compare_digest(mac, expected):
+            return None
+        nonce = body[1 : 1 + NONCE_SIZE]
+        cipher = AES.new(aes_key, AES.MODE_CTR, nonce=nonce)
+        return cipher.decrypt(body[1 + NONCE_SIZE :])
+
+    def _open_envelope(self, decoded: bytes) -> bytes | None:
+        """The value of an authenticated envelope, or `None` for other messages.
+
+        A signed message whose random IV happens to start with a version byte
+        fails authentication and is decrypted as a signed message.
+        """
+        version = decoded[:1]
+        if version == GCM_VERSION:
+            opener = self._open_gcm
+        elif version == HMAC_VERSION:
+            opener = self._open_hmac
+        else:
+            return None
+        for aes_key in self.aes_keys:
+            serialized_value = opener(aes_key, decoded)
+            if serialized_value is not None:
+                return serialized_value
+        return None
+
+
+_secure_message: SecureMessage | None = None
+_secure_message_lock = threading.Lock()
+
+
+def get_secure_message(pass_key: str, salt: str) -> SecureMessage:
+    """The process wide `SecureMessage`, created on first use.
+
+    Passing a different pass key or salt than the current one rotates the key
+    of the shared instance.
+    """
+    global _secure_message
+    if _secure_message is None:
+        with _secure_message_lock:
+            if _secure_message is None:
+                _secure_message = SecureMessage(pass_key, salt)
+                return _secure_message
+    _secure_message.rotate_key(pass_key, salt)
+    return _secure_message
@@ -1,15 +1,73 @@
+import hashlib
+import hmac
 import json
+import threading
+from functools import lru_cache
 
+from Crypto.Protocol.KDF import PBKDF2
 from Crypto.PublicKey import RSA
 
 from .settings import encryption_settings
 
+# parsed rsa key pairs keyed by their json encoded pem keys
+_api_keys: dict[tuple[str, str], tuple[RSA.RsaKey, RSA.RsaKey]] = {}
+_api_keys_lock = threading.Lock()
+
+# pbkdf2 derived aes keys keyed by (pass_key, salt)
+_aes_keys: dict[tuple[str, str], bytes] = {}
+_aes_keys_lock = threading.Lock()
+
 
 def load_api_keys() -> tuple[RSA.RsaKey, RSA.RsaKey]:
-    rsa_public_key = json.loads(encryption_settings.rsa_public_key, strict=False)
-    rsa_private_key = json.loads(encryption_settings.rsa_private_key, strict=False)
+    """The public and private RSA keys of the API.
+
+    The keys are parsed once per distinct pair of configured keys, rotating
+    the keys in the settings loads the new pair on the next call.
+    """
+    pem_keys = (encryption_settings.rsa_public_key, encryption_settings.rsa_private_key)
+    keys = _api_keys.get(pem_keys)
+    if keys is None:
+        with _api_keys_lock:
+            keys = _api_keys.get(pem_keys)
+            if keys is None:
+                rsa_public_key = json.loads(pem_keys[0], strict=False)
+                rsa_private_key = json.loads(pem_keys[1], strict=False)
+                keys = (
+                    RSA.import_key(rsa_public_key["public_key"]),
+                    RSA.import_key(rsa_private_key["private_key"]),
+                )
+                _api_keys[pem_keys] = keys
+    return keys
+
+
+def derive_aes_key(pass_key: str, salt: str) -> bytes:
+    """The 256 bit AES key derived from the pass key with PBKDF2.
+
+    The derivation is deliberately slow, so the key is derived once per
+    (pass_key, salt) and cached for the lifetime of the process.
+    """
+    key_id = (pass_key, salt)
+    aes_key = _aes_keys.get(key_id)
+    if aes_key is None:
+        with _aes_keys_lock:
+            aes_key = _aes_keys.get(key_id)
+            if aes_key is None:
+                aes_key = PBKDF2(pass_key, salt.encode("utf-8"), dkLen=32)
+                _aes_keys[key_id] = aes_key
+    return aes_key
+
+
+@lru_cache(maxsize=8)
+def derive_mac_key(aes_key: bytes) -> bytes:
+    """A separate HMAC-SHA256 key for the encrypt then MAC cipher mode."""
+    return hmac.new(aes_key, b"SecureMessage HMAC-SHA256", hashlib.sha256).digest()
+
 
-    public_key = RSA.import_key(rsa_public_key["public_key"])
-    private_key = RSA.import_key(rsa_private_key["private_key"])
+@lru_cache(maxsize=8)
+def derive_blind_index_key(pass_key: str) -> bytes:
+    """A separate HMAC-SHA256 key for blind indexes.
 
-    return public_key, private_key
+    The blind index key is derived from `API_BLIND_INDEX_KEY`, or from the
+    encryption key when it is not set, so the key itself is never reused.
+    """
+    return hmac.new(pass_key.encode("utf-8"), b"blind-index", hashlib.sha256).digest()
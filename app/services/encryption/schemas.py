@@ -1,7 +1,28 @@
+from enum import Enum
+
 from pydantic import BaseModel, field_validator
 
 from app.db.constants import DB_STR_DESC_MAXLEN_INPUT, DB_STR_URLPATH_MAXLEN_INPUT
 
+from .settings import encryption_settings
+
+
+class CipherMode(str, Enum):
+    rsa_signed = "rsa_signed"
+    aes_gcm = "aes_gcm"
+    aes_hmac = "aes_hmac"
+
+
+def check_batch_size(value: list) -> list:
+    if not value:
+        raise ValueError("messages cannot be empty")
+    if len(value) > encryption_settings.encryption_batch_max_items:
+        raise ValueError(
+            "messages may not contain more than "
+            f"{encryption_settings.encryption_batch_max_items} items"
+        )
+    return value
+
 
 class PlainMessage(BaseModel):
     message: str
@@ -29,3 +50,28 @@ class EncryptedMessage(BaseModel):
                 f"message may not contain more than {DB_STR_DESC_MAXLEN_INPUT} characters"
             )
         return value
+
+
+class PlainMessageBatch(BaseModel):
+    messages: list[PlainMessage]
+
+    @field_validator("messages")
+    def check_messages(cls, value: list[PlainMessage]) -> list[PlainMessage]:
+        return check_batch_size(value)
+
+
+class EncryptedMessageBatch(BaseModel):
+    messages: list[EncryptedMessage]
+
+    @field_validator("messages")
+    def check_messages(cls, value: list[EncryptedMessage]) -> list[EncryptedMessage]:
+        return check_batch_size(value)
+
+
+class MessageBatchItem(BaseModel):
+    message: str | None = None
+    error: str | None = None
+
+
+class MessageBatchResult(BaseModel):
+    messages: list[MessageBatchItem]
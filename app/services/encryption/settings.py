@@ -17,6 +17,11 @@ class EncryptionSettings(BaseSettings):
         "API_ENCRYPTION_KEY",
         "hNaZZH07R5yxXsbE1mEVPERNOJZwyb/O+jlhqonG2I0=",
     )
+    encryption_batch_max_items: int = int(
+        environ.get("API_ENCRYPTION_BATCH_MAX_ITEMS", 100)
+    )
+    encryption_batch_workers: int = int(environ.get("API_ENCRYPTION_BATCH_WORKERS", 4))
+    blind_index_key: str = environ.get("API_BLIND_INDEX_KEY", "")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,24 +1,27 @@
 from app.core.logger import logger
 from app.entities.core_ipaddress.crud_utilities import (
-    assign_ip_address_to_user,
-    create_or_update_ipaddress,
-    get_ipaddress_from_db,
+    ipaddress_details_lookup,
+    upsert_user_ipaddress,
 )
-from app.entities.core_ipaddress.model import Ipaddress
 from app.entities.core_ipaddress.schemas import IpinfoResponse
-from app.entities.core_ipaddress.utilities import get_ipinfo_details
+from app.entities.website_page.crud_utilities import sync_website_sitemap
+from app.entities.website_page.schemas import WebsiteSitemapSyncProgress
 from app.entities.website_pagespeedinsight.crud_utilities import (
     create_website_pagespeedinsights,
+    run_website_pagespeedinsights_batch,
 )
 from app.entities.website_pagespeedinsight.schemas import (
     PageSpeedInsightsDevice,
     PSIDevice,
     WebsitePageSpeedInsightsBase,
+    WebsitePageSpeedInsightsBatchProgress,
 )
 from app.entities.website_pagespeedinsight.utilities import fetch_pagespeedinsights
+from app.tasks.queue import JobContext, current_job, job_handler, report_job_progress
 from app.utilities import parse_id
 
 
+@job_handler
 async def bg_task_request_to_delete_user(user_id: str) -> None:
     # TODO: Send email to user to confirm deletion
     # TODO: flag user as pending delete.
@@ -27,6 +30,7 @@ async def bg_task_request_to_delete_user(user_id: str) -> None:
     )  # pragma: no cover
 
 
+@job_handler
 async def bg_task_request_to_delete_organization(
     user_id: str, organization_id: str
 ) -> None:
@@ -37,29 +41,30 @@ async def bg_task_request_to_delete_organization(
     )  # pragma: no cover
 
 
+@job_handler
 async def bg_task_track_user_ipinfo(ip_address: str, user_id: str) -> None:
     """A background task to track the IP Address of a user.
 
     This function will:
 
-        1. check if the ip_address is valid
-        2. check if the ip_address is already in the database
-        3. if it is not, then fetch the details from ipinfo.io
-    """
-    try:
-        user_uuid = parse_id(user_id)
-        ip_in_db: Ipaddress | None = await get_ipaddress_from_db(ip_address)
-        if ip_in_db is None:
-            ip_details: IpinfoResponse = get_ipinfo_details(ip_address)
-            ip_in_db = await create_or_update_ipaddress(ip_address, ip_details)
+        1. look up the details of the ip_address, from the cache, the database
+           or ipinfo.io, concurrent lookups of one address share one request
+        2. upsert the ip_address and assign it to the user in one transaction
 
-        if ip_in_db is not None:
-            await assign_ip_address_to_user(ipaddress=ip_in_db, user_id=user_uuid)
-    except Exception as e:  # pragma: no cover
-        logger.warning(f"Error fetching IP Details: {ip_address}")
-        logger.warning(e)
+    A failed lookup raises, so the job is retried, retries look the address up
+    again instead of answering from the failed lookups.
+    """
+    user_uuid = parse_id(user_id)
+    context: JobContext | None = current_job.get()
+    ip_details: IpinfoResponse | None = await ipaddress_details_lookup.lookup(
+        ip_address, retry_failed=context is not None and context.attempt > 1
+    )
+    if ip_details is None:
+        raise LookupError(f"No IP Details found for {ip_address}")
+    await upsert_user_ipaddress(ip_address, user_uuid, ip_details)
 
 
+@job_handler
 async def bg_task_website_page_pagespeedinsights_fetch(
     website_id: str,
     page_id: str,
@@ -69,24 +74,45 @@ async def bg_task_website_page_pagespeedinsights_fetch(
     logger.info(
         f"Fetching PageSpeedInsights for website {website_id}, page {page_id}, URL[{fetch_url}]"
     )
-    is_created: bool = False
-    insights: WebsitePageSpeedInsightsBase | None = fetch_pagespeedinsights(
+    insights: WebsitePageSpeedInsightsBase | None = await fetch_pagespeedinsights(
         fetch_url=fetch_url,
         device=PageSpeedInsightsDevice(device=device),
     )
-    if insights is not None:
-        await create_website_pagespeedinsights(
-            website_id=website_id,
-            page_id=page_id,
-            insights=insights,
-        )
-        is_created = True
-    if is_created:
-        logger.info(
-            f"Successfully fetched PageSpeedInsights for website {website_id}, page {page_id}, URL[{fetch_url}]"
-        )
-    else:  # pragma: no cover
-        logger.warning(
-            f"Failed to fetch PageSpeedInsights for website {website_id}, page {page_id}, URL[{fetch_url}]"
-        )
+    if insights is None:
+        raise LookupError(f"Failed to fetch PageSpeedInsights for URL[{fetch_url}]")
+    await create_website_pagespeedinsights(
+        website_id=website_id,
+        page_id=page_id,
+        insights=insights,
+    )
+    logger.info(
+        f"Successfully fetched PageSpeedInsights for website {website_id}, page {page_id}, URL[{fetch_url}]"
+    )
     return None
+
+
+@job_handler
+async def bg_task_website_pagespeedinsights_batch(
+    website_id: str,
+    devices: list[PSIDevice],
+) -> dict:
+    logger.info(f"Fetching PageSpeedInsights for all pages of website {website_id}")
+    progress: WebsitePageSpeedInsightsBatchProgress = (
+        WebsitePageSpeedInsightsBatchProgress(
+            website_id=parse_id(website_id), devices=devices
+        )
+    )
+    report_job_progress(lambda: progress.model_dump(mode="json"))
+    await run_website_pagespeedinsights_batch(progress)
+    return progress.model_dump(mode="json")
+
+
+@job_handler
+async def bg_task_website_sitemap_sync(website_id: str, sitemap_url: str) -> dict:
+    logger.info(f"Syncing the pages of website {website_id} with {sitemap_url}")
+    progress: WebsiteSitemapSyncProgress = WebsiteSitemapSyncProgress(
+        website_id=parse_id(website_id), sitemap_url=sitemap_url
+    )
+    report_job_progress(lambda: progress.model_dump(mode="json"))
+    await sync_website_sitemap(progress)
+    return progress.model_dump(mode="json")
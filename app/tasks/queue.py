@@ -0,0 +1,83 @@
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import UUID4
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.logger import logger
+from app.db.session import get_db_session
+from app.entities.core_job.crud import JobRepository
+from app.entities.core_job.model import Job
+from app.entities.core_job.schemas import JobCreate
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+# the handlers a worker can run, keyed by the job name
+job_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(func: JobHandler) -> JobHandler:
+    """Register a coroutine function as the handler of the jobs named after it."""
+    job_handlers[func.__name__] = func
+    return func
+
+
+@dataclass
+class JobContext:
+    job_id: UUID4
+    attempt: int
+    progress: Callable[[], Any] | None = None
+
+
+# the job the current task is running, set by the worker
+current_job: ContextVar[JobContext | None] = ContextVar("current_job", default=None)
+
+
+def report_job_progress(progress: Callable[[], Any]) -> None:
+    """Persist `progress()` as the result of the running job on every heartbeat.
+
+    Does nothing when the handler is not running as a job.
+    """
+    context: JobContext | None = current_job.get()
+    if context is not None:
+        context.progress = progress
+
+
+async def enqueue_job(
+    handler: JobHandler,
+    payload: dict[str, Any],
+    idempotency_key: str | None = None,
+    user_id: UUID4 | None = None,
+    max_attempts: int | None = None,
+    session: AsyncSession | None = None,
+) -> tuple[Job, bool]:
+    """Queue a job to run `handler(**payload)` on a worker for `user_id`.
+
+    The payload must be JSON serializable. A job is only queued once while a
+    job with the same `idempotency_key` is queued or running, the active job is
+    returned instead. Returns the job and whether it was queued by this call.
+
+    Routes pass their request `session`, the job then commits with the writes
+    of the request and no worker runs it before they are visible. Without a
+    session the job is committed in a session of its own.
+    """
+    if handler.__name__ not in job_handlers:  # pragma: no cover
+        raise ValueError(f"{handler.__name__} is not a registered job handler")
+    schema: JobCreate = JobCreate(
+        name=handler.__name__,
+        payload=payload,
+        idempotency_key=idempotency_key,
+        max_attempts=max_attempts or settings.api.job_max_attempts,
+        user_id=user_id,
+    )
+    if session is not None:
+        job, is_new = await JobRepository(session).enqueue(schema)
+    else:
+        async with get_db_session() as own_session:
+            job, is_new = await JobRepository(own_session).enqueue(schema)
+    if is_new:
+        logger.info(f"Queued Job[{job.id}] {job.name}")
+    return job, is_new
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import socket
+from typing import Any
+
+from app.config import settings
+from app.core.logger import logger
+from app.db.session import get_db_session
+from app.entities.core_job.crud import JobRepository
+from app.entities.core_job.model import Job
+from app.tasks.queue import JobContext, JobHandler, current_job, job_handlers
+from app.utilities import get_uuid
+
+
+class JobWorker:
+    """Runs the queued jobs of the job table, at most `concurrency` at a time.
+
+    A claimed job is leased for `lease_seconds` and the lease is renewed by a
+    heartbeat every third of it, a job whose worker stopped heartbeating is
+    claimed again once its lease expires. A failed job is retried with
+    exponential backoff until it used its attempts.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        lease_seconds: float | None = None,
+        poll_interval: float | None = None,
+        retry_backoff: float | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        self.concurrency: int = concurrency or settings.api.job_worker_concurrency
+        self.lease_seconds: float = lease_seconds or settings.api.job_lease_seconds
+        self.poll_interval: float = poll_interval or settings.api.job_poll_interval
+        self.retry_backoff: float = (
+            retry_backoff
+            if retry_backoff is not None
+            else settings.api.job_retry_backoff
+        )
+        self.worker_id: str = (
+            worker_id
+            or f"{socket.gethostname()}:{os.getpid()}:{get_uuid().hex[:8]}"[:64]
+        )
+        self._running: set[asyncio.Task] = set()
+        self._stopping: asyncio.Event = asyncio.Event()
+
+    async def claim(self, limit: int) -> list[Job]:
+        async with get_db_session() as session:
+            return await JobRepository(session).claim(
+                self.worker_id, limit, self.lease_seconds
+            )
+
+    async def _heartbeat(self, context: JobContext) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            result: Any | None = context.progress() if context.progress else None
+            async with get_db_session() as session:
+                leased: bool = await JobRepository(session).heartbeat(
+                    context.job_id, self.worker_id, self.lease_seconds, result
+                )
+            if not leased:  # pragma: no cover
+                logger.warning(f"Job[{context.job_id}] lease lost by {self.worker_id}")
+                return
+
+    async def execute(self, job: Job) -> None:
+        """Run a claimed job and record its outcome."""
+        context: JobContext = JobContext(job_id=job.id, attempt=job.attempts)
+        token = current_job.set(context)
+        heartbeat: asyncio.Task = asyncio.create_task(self._heartbeat(context))
+        result: Any | None = None
+        error: str | None = None
+        try:
+            handler: JobHandler | None = job_handlers.get(job.name)
+            if handler is None:
+                raise LookupError(f"No job handler named {job.name}")
+            if job.attempts > job.max_attempts:
+                raise TimeoutError("Job lease expired on its last attempt")
+            logger.info(f"Running Job[{job.id}] {job.name} attempt {job.attempts}")
+            result = await handler(**job.payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            heartbeat.cancel()
+            current_job.reset(token)
+        if result is None and context.progress is not None:
+            result = context.progress()
+        async with get_db_session() as session:
+            jobs_repo: JobRepository = JobRepository(session)
+            if error is None:
+                await jobs_repo.complete(job.id, self.worker_id, result)
+                logger.info(f"Finished Job[{job.id}] {job.name}")
+            else:
+                await jobs_repo.fail(
+                    job,
+                    self.worker_id,
+                    error,
+                    retry_delay=self.retry_backoff * 2 ** (job.attempts - 1),
+                    result=result,
+                )
+                logger.warning(f"Failed Job[{job.id}] {job.name}: {error}")
+
+    async def run_once(self) -> int:
+        """Claim and run a round of jobs, returns the number of jobs run."""
+        jobs: list[Job] = await self.claim(self.concurrency)
+        await asyncio.gather(*(self.execute(job) for job in jobs))
+        return len(jobs)
+
+    async def drain(self) -> int:
+        """Run jobs until none are due, returns the number of jobs run."""
+        total: int = 0
+        while (count := await self.run_once()) > 0:
+            total += count
+        return total
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Poll for jobs until stopped, then wait for the running jobs."""
+        logger.info(
+            f"Job worker {self.worker_id} started, concurrency {self.concurrency}"
+        )
+        while not self._stopping.is_set():
+            free: int = self.concurrency - len(self._running)
+            jobs: list[Job] = []
+            if free > 0:
+                try:
+                    jobs = await self.claim(free)
+                except Exception as e:  # pragma: no cover
+                    logger.warning(f"Error claiming jobs: {e}")
+            for job in jobs:
+                task: asyncio.Task = asyncio.create_task(self.execute(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            if len(jobs) == 0 or len(jobs) == free:
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info(f"Job worker {self.worker_id} stopped")
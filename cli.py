@@ -2,10 +2,12 @@ from typer import Typer
 
 import app.cli.db as db
 import app.cli.secure as secure
+import app.cli.worker as worker
 
 app = Typer()
 app.add_typer(db.app, name="db", help="Database operations")
 app.add_typer(secure.app, name="secure", help="Security operations")
+app.add_typer(worker.app, name="worker", help="Job queue worker")
 
 
 if __name__ == "__main__":
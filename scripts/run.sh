@@ -10,6 +10,10 @@ python -m alembic upgrade head
 # Create initial data in DB
 python cli.py db add-initial-data
 
+# start the job worker as its own process, stop it when the server exits
+python cli.py worker run &
+WORKER_PID=$!
+trap 'kill -TERM $WORKER_PID 2>/dev/null; wait $WORKER_PID' EXIT
 # start the server
 fastapi run app/main.py --port 8888
 # python start.py
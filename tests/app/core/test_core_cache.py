@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import CacheStats, MonitoredTTLCache, SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+def test_monitored_ttl_cache_counts_hits_and_misses() -> None:
+    cache: MonitoredTTLCache[str, bool] = MonitoredTTLCache(maxsize=10, ttl=60)
+    assert cache.lookup("a") is None
+    cache["a"] = True
+    assert cache.lookup("a") is True
+    assert cache.lookup("a") is True
+    stats: CacheStats = cache.stats()
+    assert stats.hits == 2
+    assert stats.misses == 1
+    assert stats.size == 1
+    assert stats.maxsize == 10
+
+
+def test_monitored_ttl_cache_counts_evictions() -> None:
+    clock = [0.0]
+    cache: MonitoredTTLCache[str, bool] = MonitoredTTLCache(
+        maxsize=2, ttl=10, timer=lambda: clock[0]
+    )
+    cache["a"] = True
+    cache["b"] = True
+    cache["c"] = True
+    assert cache.stats().evictions == 1
+    clock[0] = 11.0
+    assert cache.lookup("c") is None
+    cache.expire()
+    assert cache.stats().evictions == 3
+
+
+async def test_single_flight_coalesces_concurrent_calls() -> None:
+    calls: list[str] = []
+    flight: SingleFlight[str, int] = SingleFlight()
+
+    async def fetch() -> int:
+        calls.append("fetch")
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+    assert results == [42] * 5
+    assert len(calls) == 1
+    assert not flight.in_flight("key")
+
+
+async def test_single_flight_propagates_errors() -> None:
+    flight: SingleFlight[str, int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not flight.in_flight("key")
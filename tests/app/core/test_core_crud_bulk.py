@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy import select as sql_select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entities.tracking_link.crud import TrackingLinkRepository
+from app.entities.tracking_link.model import TrackingLink
+from app.entities.tracking_link.schemas import TrackingLinkCreate
+from app.entities.tracking_link.utilities import hash_url
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.model import Website
+from app.entities.website.schemas import WebsiteCreate
+from tests.utils.organizations import create_random_organization
+from tests.utils.utils import random_domain
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_repository_create_many_in_chunks(db_session: AsyncSession) -> None:
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    domains = [random_domain() for _ in range(5)]
+    websites: list[Website] = await repo.create_many(
+        [WebsiteCreate(domain=domain, is_secure=True) for domain in domains],
+        chunk_size=2,
+    )
+    assert [website.domain for website in websites] == domains
+    entries = await repo.read_many([website.id for website in websites])
+    assert all(entry is not None and entry.is_secure for entry in entries)
+
+
+async def test_repository_insert_many_in_chunks(db_session: AsyncSession) -> None:
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    domains = [random_domain() for _ in range(5)]
+    inserted: int = await repo.insert_many(
+        [WebsiteCreate(domain=domain, is_secure=True) for domain in domains],
+        chunk_size=2,
+    )
+    assert inserted == 5
+    assert not any(isinstance(entry, Website) for entry in db_session.new)
+    for domain in domains:
+        website: Website | None = await repo.read_by("domain", domain)
+        assert website is not None
+        assert website.is_secure is True
+    assert await repo.insert_many([]) == 0
+
+
+async def test_repository_upsert_many_by_natural_key(db_session: AsyncSession) -> None:
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    existing: Website = (
+        await repo.create_many([WebsiteCreate(domain=random_domain(), is_secure=True)])
+    )[0]
+    new_domain: str = random_domain()
+    written: int = await repo.upsert_many(
+        [
+            WebsiteCreate(domain=existing.domain, is_secure=False),
+            WebsiteCreate(domain=new_domain, is_secure=True),
+        ],
+        chunk_size=1,
+    )
+    assert written == 2
+    await db_session.refresh(existing)
+    assert existing.is_secure is False
+    created: Website | None = await repo.read_by("domain", new_domain)
+    assert created is not None
+    assert created.is_secure is True
+    assert await repo.upsert_many([]) == 0
+
+
+async def test_repository_upsert_many_tracking_links_by_url_hash(
+    db_session: AsyncSession,
+) -> None:
+    organization = await create_random_organization(db_session)
+    repo: TrackingLinkRepository = TrackingLinkRepository(session=db_session)
+    domain: str = random_domain()
+
+    def build_link(path: str, is_active: bool) -> TrackingLinkCreate:
+        url = f"https://{domain}/{path}?utm_campaign=bulk"
+        return TrackingLinkCreate(
+            url=url,
+            url_hash=hash_url(url),
+            scheme="https",
+            domain=domain,
+            destination=f"https://{domain}/{path}",
+            url_path=f"/{path}",
+            utm_campaign="bulk",
+            is_active=is_active,
+            organization_id=organization.id,
+        )
+
+    await repo.upsert_many([build_link("a", True), build_link("b", True)])
+    await repo.upsert_many([build_link("a", False), build_link("c", True)])
+    links = (
+        await db_session.scalars(
+            sql_select(TrackingLink)
+            .where(TrackingLink.domain == domain)
+            .order_by(TrackingLink.url_path)
+        )
+    ).all()
+    assert [(link.url_path, link.is_active) for link in links] == [
+        ("/a", False),
+        ("/b", True),
+        ("/c", True),
+    ]
+
+
+async def test_repository_delete_many_in_chunks(db_session: AsyncSession) -> None:
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    websites: list[Website] = await repo.create_many(
+        [WebsiteCreate(domain=random_domain()) for _ in range(3)]
+    )
+    website_ids = [website.id for website in websites]
+    deleted: int = await repo.delete_many(website_ids, chunk_size=2)
+    assert deleted == 3
+    assert await repo.read_many(website_ids) == [None, None, None]
+
+
+async def test_repository_stream_reads_in_keyset_chunks(
+    db_session: AsyncSession,
+) -> None:
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    websites: list[Website] = await repo.create_many(
+        [WebsiteCreate(domain=random_domain()) for _ in range(5)]
+    )
+    website_ids = sorted(website.id for website in websites)
+    query = sql_select(Website).where(Website.id.in_(website_ids))
+    streamed = [website.id async for website in repo.stream(query, chunk_size=2)]
+    assert streamed == website_ids
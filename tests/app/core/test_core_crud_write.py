@@ -0,0 +1,37 @@
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.model import Website
+from app.entities.website.schemas import WebsiteCreate, WebsiteUpdate
+from tests.utils.utils import random_domain
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_repository_writes_skip_refresh_select(db_session: AsyncSession) -> None:
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    statements: list[str] = []
+
+    def track(conn, cursor, statement, *args) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement.split(" ", 1)[0])
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", track)
+    try:
+        website: Website = await repo.create(WebsiteCreate(domain=random_domain()))
+        assert website.created_at is not None
+        assert website.updated_at is not None
+        created_at = website.updated_at
+        time.sleep(0.001)
+        website = await repo.update(website, WebsiteUpdate(is_active=False))
+        assert website.is_active is False
+        assert website.updated_at > created_at
+    finally:
+        event.remove(engine, "before_cursor_execute", track)
+    assert "SELECT" not in statements
+    assert statements.count("INSERT") == 1
+    assert statements.count("UPDATE") == 1
@@ -0,0 +1,113 @@
+import unittest.mock
+from ipaddress import IPv4Address, ip_network
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.core.geoip import IpRangeIndex, build_ip_range_index, read_ip_range_rows
+from app.entities.core_ipaddress.utilities import get_ipinfo_details
+
+IP_RANGES_CSV = """network,city,region,country,postal,timezone,latitude,longitude
+8.8.8.0/24,Mountain View,California,US,94043,America/Los_Angeles,37.4056,-122.0775
+1.1.1.0/24,Brisbane,Queensland,AU,4000,Australia/Brisbane,-27.4679,153.0281
+10.0.0.0/8,,,,,,,
+2001:4860::/32,Mountain View,California,US,94043,America/Los_Angeles,37.4056,-122.0775
+2a00:1450::/29,Dublin,Leinster,IE,,Europe/Dublin,53.3498,-6.2603
+"""
+
+
+def build_test_index(tmp_path: Path) -> IpRangeIndex:
+    csv_path = tmp_path / "ip-ranges.csv"
+    csv_path.write_text(IP_RANGES_CSV)
+    index_path = str(tmp_path / "ip-ranges.idx")
+    assert build_ip_range_index(read_ip_range_rows(str(csv_path)), index_path) == 5
+    return IpRangeIndex(index_path)
+
+
+def test_ip_range_index_lookup(tmp_path: Path) -> None:
+    index = build_test_index(tmp_path)
+    try:
+        assert len(index) == 5
+        assert index.lookup("8.8.8.8")["city"] == "Mountain View"
+        assert index.lookup(IPv4Address("8.8.8.255"))["country"] == "US"
+        assert index.lookup("1.1.1.1")["city"] == "Brisbane"
+        assert index.lookup("10.20.30.40") == {}
+        assert index.lookup("8.8.9.0") is None
+        assert index.lookup("0.0.0.1") is None
+        assert index.lookup("255.255.255.255") is None
+        assert index.lookup("2001:4860:4860::8888")["city"] == "Mountain View"
+        assert index.lookup("2a00:1457:ffff::1")["city"] == "Dublin"
+        assert index.lookup("2a08::1") is None
+        assert index.lookup("::1") is None
+        # ipv4 mapped ipv6 addresses are looked up in the ipv4 ranges
+        assert index.lookup("::ffff:1.1.1.1")["city"] == "Brisbane"
+        # ranges with the same record share it
+        assert index.lookup("8.8.8.8") is index.lookup("2001:4860::1")
+    finally:
+        index.close()
+
+
+def test_ip_range_index_rejects_overlaps_and_other_files(tmp_path: Path) -> None:
+    rows = [
+        (ip_network("10.0.0.0/8")[0], ip_network("10.0.0.0/8")[-1], {}),
+        (ip_network("10.1.0.0/16")[0], ip_network("10.1.0.0/16")[-1], {}),
+    ]
+    with pytest.raises(ValueError, match="Overlapping IPv4 ranges"):
+        build_ip_range_index(rows, str(tmp_path / "overlap.idx"))
+    other_file = tmp_path / "other.idx"
+    other_file.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="not an ip range index"):
+        IpRangeIndex(str(other_file))
+
+
+@pytest.mark.anyio
+async def test_get_ipinfo_details_from_ip_range_index(tmp_path: Path) -> None:
+    build_test_index(tmp_path).close()
+    with (
+        unittest.mock.patch.object(
+            settings.cloud, "ip_range_index", str(tmp_path / "ip-ranges.idx")
+        ),
+        unittest.mock.patch(
+            "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails",
+            new_callable=unittest.mock.AsyncMock,
+        ) as mock_ipinfo_details,
+    ):
+        details = await get_ipinfo_details("8.8.8.8")
+        mock_ipinfo_details.assert_not_awaited()
+        assert str(details.address) == "8.8.8.8"
+        assert details.city == "Mountain View"
+        assert details.country == "US"
+        assert details.country_name == "United States"
+        assert details.loc == "37.4056,-122.0775"
+        assert details.latitude == "37.4056"
+        assert details.continent_code == "NA"
+        assert details.is_eu is False
+        # addresses outside of the index fall back to ipinfo.io
+        mock_ipinfo_details.side_effect = RuntimeError("ipinfo.io")
+        with pytest.raises(RuntimeError):
+            await get_ipinfo_details("9.9.9.9")
+        mock_ipinfo_details.assert_awaited_once_with("9.9.9.9")
+
+
+def test_ip_range_index_many_ranges(tmp_path: Path) -> None:
+    rows = [
+        (
+            IPv4Address(i << 16),
+            IPv4Address((i << 16) + 255),
+            {"city": f"City {i % 10}", "country": "US"},
+        )
+        for i in range(1, 1001)
+    ]
+    index_path = str(tmp_path / "many-ranges.idx")
+    assert build_ip_range_index(rows, index_path) == 1000
+    index = IpRangeIndex(index_path)
+    try:
+        assert len(index) == 1000
+        for i in (1, 500, 1000):
+            address = str(IPv4Address((i << 16) + 128))
+            assert index.lookup(address)["city"] == f"City {i % 10}"
+        assert index.lookup(str(IPv4Address((500 << 16) + 256))) is None
+        assert index.lookup(str(IPv4Address(1001 << 16))) is None
+    finally:
+        index.close()
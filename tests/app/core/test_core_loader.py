@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.loader import (
+    EntityLoader,
+    EntityLoaderStats,
+    enable_entity_loader,
+    get_entity_loader,
+)
+from app.db.session import async_session
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.model import Website
+from app.utilities import get_uuid
+from tests.utils.websites import create_random_website
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_entity_loader_batches_and_memoizes_reads(
+    db_session: AsyncSession,
+) -> None:
+    websites = [await create_random_website(db_session) for _ in range(3)]
+    missing_id = get_uuid()
+    session: AsyncSession
+    async with async_session() as session:
+        assert get_entity_loader(session) is None
+        loader: EntityLoader = enable_entity_loader(session)
+        assert enable_entity_loader(session) is loader
+        repo: WebsiteRepository = WebsiteRepository(session=session)
+        entries = await asyncio.gather(
+            *[repo.read(website.id) for website in websites],
+            repo.read(websites[0].id),
+            repo.read(missing_id),
+        )
+        assert [entry.id for entry in entries[:3]] == [w.id for w in websites]
+        assert entries[3] is entries[0]
+        assert entries[4] is None
+        assert len(loader._dispatching) == 0
+        stats: EntityLoaderStats = loader.stats()
+        assert stats.batches == 1
+        assert stats.misses == 4
+        assert stats.hits == 1
+        many = await repo.read_many([websites[2].id, missing_id, websites[1].id])
+        assert many == [entries[2], None, entries[1]]
+        stats = loader.stats()
+        assert stats.batches == 1
+        assert stats.hits == 4
+        assert stats.size == 4
+
+
+async def test_entity_loader_forgets_deleted_entries(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    session: AsyncSession
+    async with async_session() as session:
+        loader: EntityLoader = enable_entity_loader(session)
+        repo: WebsiteRepository = WebsiteRepository(session=session)
+        entry: Website | None = await repo.read(website.id)
+        assert entry is not None
+        await repo.delete(entry)
+        assert await repo.read(website.id) is None
+        assert loader.stats().batches == 2
+
+
+async def test_repository_read_many_without_loader(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    repo: WebsiteRepository = WebsiteRepository(session=db_session)
+    missing_id = get_uuid()
+    entries = await repo.read_many([missing_id, website.id])
+    assert entries[0] is None
+    assert entries[1] is not None
+    assert entries[1].id == website.id
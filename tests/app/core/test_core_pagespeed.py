@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from app.core.pagespeed import PageSpeedInsightsClient
+from tests.utils.website_pagespeedinsights import PageSpeedInsightsStub
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_psi_client_fetches_report(mock_fetch_psi: dict[str, Any]) -> None:
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        client: PageSpeedInsightsClient = stub.client()
+        try:
+            report = await client.run_pagespeed("https://getcommunity.com", "mobile")
+        finally:
+            await client.aclose()
+    assert report == mock_fetch_psi
+    assert stub.requests == [
+        {"url": "https://getcommunity.com", "strategy": "mobile", "key": "test-key"}
+    ]
+
+
+@pytest.mark.parametrize("status", [429, 503])
+async def test_psi_client_retries_with_backoff(
+    mock_fetch_psi: dict[str, Any], status: int
+) -> None:
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        stub.fail_times = 2
+        stub.fail_status = status
+        client: PageSpeedInsightsClient = stub.client(max_retries=2)
+        try:
+            report = await client.run_pagespeed("https://getcommunity.com", "desktop")
+        finally:
+            await client.aclose()
+    assert report == mock_fetch_psi
+    assert len(stub.requests) == 3
+
+
+async def test_psi_client_gives_up_after_max_retries(
+    mock_fetch_psi: dict[str, Any],
+) -> None:
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        stub.fail_times = 5
+        client: PageSpeedInsightsClient = stub.client(max_retries=1)
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.run_pagespeed("https://getcommunity.com", "desktop")
+        finally:
+            await client.aclose()
+    assert len(stub.requests) == 2
+
+
+async def test_psi_client_times_out(mock_fetch_psi: dict[str, Any]) -> None:
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        stub.delay = 1.0
+        client: PageSpeedInsightsClient = stub.client(timeout=0.1, max_retries=1)
+        try:
+            with pytest.raises(httpx.TimeoutException):
+                await client.run_pagespeed("https://getcommunity.com", "desktop")
+        finally:
+            await client.aclose()
+    assert len(stub.requests) == 2
+
+
+async def test_psi_client_limits_concurrency(mock_fetch_psi: dict[str, Any]) -> None:
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        stub.delay = 0.05
+        client: PageSpeedInsightsClient = stub.client(concurrency=2)
+        try:
+            reports = await asyncio.gather(
+                *(
+                    client.run_pagespeed(f"https://getcommunity.com/{i}", "mobile")
+                    for i in range(6)
+                )
+            )
+        finally:
+            await client.aclose()
+    assert len(reports) == 6
+    assert stub.max_in_flight == 2
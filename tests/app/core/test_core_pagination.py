@@ -0,0 +1,162 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import (
+    PageParams,
+    PageParamsFromQuery,
+    PaginatedTotalMode,
+    count_query,
+    decode_page_cursor,
+    encode_page_cursor,
+    is_unfiltered_query,
+    paginated_query,
+    paginated_total,
+)
+from app.entities.core_organization.model import Organization
+from app.entities.tracking_link.crud import TrackingLinkRepository
+from app.entities.tracking_link.model import TrackingLink
+from app.entities.tracking_link.schemas import TrackingLinkRead
+from app.utilities import get_date, get_uuid
+from tests.utils.organizations import (
+    assign_user_to_organization,
+    create_random_organization,
+)
+from tests.utils.tracking_link import create_random_tracking_link
+from tests.utils.users import create_random_user
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_pagination_count_query_filtered_with_joins(
+    db_session: AsyncSession,
+) -> None:
+    user = await create_random_user(db_session)
+    a_organization = await create_random_organization(db_session)
+    b_organization = await create_random_organization(db_session)
+    await assign_user_to_organization(db_session, user.id, a_organization.id)
+    await create_random_tracking_link(db_session, a_organization.id)
+    await create_random_tracking_link(db_session, a_organization.id)
+    await create_random_tracking_link(db_session, b_organization.id)
+    repo: TrackingLinkRepository = TrackingLinkRepository(session=db_session)
+    stmt = repo.query_list(user_id=user.id)
+    total = await db_session.scalar(count_query(stmt))
+    rows = (await db_session.execute(stmt)).scalars().all()
+    assert total == len(rows) == 2
+    total = await db_session.scalar(count_query(stmt.distinct()))
+    assert total == 2
+
+
+def test_pagination_is_unfiltered_query() -> None:
+    assert is_unfiltered_query(select(TrackingLink))
+    assert is_unfiltered_query(
+        select(TrackingLink).order_by(TrackingLink.created_at).limit(10)
+    )
+    assert not is_unfiltered_query(select(TrackingLink).where(TrackingLink.is_active))
+    assert not is_unfiltered_query(select(TrackingLink).distinct())
+    assert not is_unfiltered_query(
+        select(TrackingLink).join(
+            Organization, Organization.id == TrackingLink.organization_id
+        )
+    )
+    assert not is_unfiltered_query(select(TrackingLink).group_by(TrackingLink.id))
+
+
+async def test_pagination_total_modes(db_session: AsyncSession) -> None:
+    a_organization = await create_random_organization(db_session)
+    await create_random_tracking_link(db_session, a_organization.id)
+    repo: TrackingLinkRepository = TrackingLinkRepository(session=db_session)
+    filtered_stmt = repo.query_list(organization_id=a_organization.id)
+    total, mode = await paginated_total(
+        TrackingLink.__tablename__, db_session, filtered_stmt
+    )
+    assert total == 1
+    assert mode == PaginatedTotalMode.exact
+    total, mode = await paginated_total(
+        TrackingLink.__tablename__, db_session, filtered_stmt, include_total=False
+    )
+    assert total is None
+    assert mode == PaginatedTotalMode.none
+    # sqlite has no statistics until ANALYZE, so fall back to an exact count
+    all_stmt = repo.query_list()
+    exact_total, mode = await paginated_total(
+        TrackingLink.__tablename__, db_session, all_stmt, include_total=False
+    )
+    assert mode == PaginatedTotalMode.exact
+    assert exact_total is not None and exact_total >= 1
+
+
+async def test_pagination_paginated_query_reports_total_mode(
+    db_session: AsyncSession,
+) -> None:
+    a_organization = await create_random_organization(db_session)
+    await create_random_tracking_link(db_session, a_organization.id)
+    await create_random_tracking_link(db_session, a_organization.id)
+    repo: TrackingLinkRepository = TrackingLinkRepository(session=db_session)
+    output = await paginated_query(
+        table_name=TrackingLink.__tablename__,
+        db=db_session,
+        stmt=repo.query_list(organization_id=a_organization.id),
+        page_params=PageParams(page=1, size=1),
+        response_schema=TrackingLinkRead,
+    )
+    assert output.total == 2
+    assert output.total_mode == PaginatedTotalMode.exact
+    assert len(output.results) == 1
+
+
+def test_pagination_cursor_encode_decode() -> None:
+    created_at = get_date().replace(tzinfo=None)
+    entry_id = get_uuid()
+    cursor = encode_page_cursor(created_at, entry_id)
+    assert decode_page_cursor(cursor) == (created_at, entry_id)
+    with pytest.raises(ValueError):
+        decode_page_cursor("not-a-cursor")
+    with pytest.raises(HTTPException):
+        PageParamsFromQuery(cursor="not-a-cursor")
+
+
+async def test_pagination_paginated_query_keyset_pages(
+    db_session: AsyncSession,
+) -> None:
+    a_organization = await create_random_organization(db_session)
+    for _ in range(5):
+        await create_random_tracking_link(db_session, a_organization.id)
+    repo: TrackingLinkRepository = TrackingLinkRepository(session=db_session)
+    stmt = repo.query_list(organization_id=a_organization.id)
+    by_offset = await paginated_query(
+        table_name=TrackingLink.__tablename__,
+        db=db_session,
+        stmt=stmt,
+        page_params=PageParams(page=1, size=5),
+        response_schema=TrackingLinkRead,
+    )
+    seen_ids = []
+    cursor = None
+    while True:
+        output = await paginated_query(
+            table_name=TrackingLink.__tablename__,
+            db=db_session,
+            stmt=stmt,
+            page_params=PageParams(size=2, cursor=cursor),
+            response_schema=TrackingLinkRead,
+        )
+        if cursor is None:
+            assert output.total == 5
+        else:
+            # a cursor page does not count the rows again
+            assert output.total is None
+            assert output.total_mode == PaginatedTotalMode.none
+        seen_ids.extend([link.id for link in output.results])
+        cursor = output.next_cursor
+        if cursor is None:
+            break
+    assert seen_ids == [link.id for link in by_offset.results]
+
+
+def test_pagination_keyset_index() -> None:
+    index_columns = {
+        tuple(index.columns.keys()) for index in TrackingLink.__table__.indexes
+    }
+    assert ("created_at", "id") in index_columns
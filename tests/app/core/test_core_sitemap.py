@@ -0,0 +1,111 @@
+import gzip
+from collections.abc import Iterator
+from os import path
+
+import pytest
+
+from app.core.sitemap import (
+    SitemapError,
+    SitemapParser,
+    SitemapReference,
+    SitemapUrl,
+    parse_sitemap_date,
+)
+
+DATA_DIR: str = path.join(path.dirname(path.dirname(path.dirname(__file__))), "data")
+
+
+def read_fixture(name: str) -> bytes:
+    with open(path.join(DATA_DIR, name), "rb") as f:
+        return f.read()
+
+
+def parse_chunks(
+    parser: SitemapParser, chunks: Iterator[bytes]
+) -> list[SitemapUrl | SitemapReference]:
+    entries: list[SitemapUrl | SitemapReference] = []
+    for chunk in chunks:
+        entries.extend(parser.feed(chunk))
+    entries.extend(parser.close())
+    return entries
+
+
+def split(data: bytes, size: int) -> Iterator[bytes]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def test_parse_sitemap_date() -> None:
+    assert parse_sitemap_date("2023-12-18T20:08:54+00:00").hour == 20
+    assert parse_sitemap_date("2023-12-18T22:08:54+02:00").hour == 20
+    assert parse_sitemap_date("2023-12-18").tzinfo is not None
+    assert parse_sitemap_date("yesterday") is None
+    assert parse_sitemap_date(None) is None
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_sitemap_parser_urlset(compress: bool) -> None:
+    data: bytes = read_fixture("sitemap-urlset.xml")
+    if compress:
+        data = gzip.compress(data)
+    parser = SitemapParser()
+    entries = parse_chunks(parser, split(data, 64))
+    assert parser.kind == "urlset"
+    assert len(entries) == 25
+    assert all(isinstance(entry, SitemapUrl) for entry in entries)
+    assert entries[0].loc == "https://getcommunity.com/"
+    assert entries[0].priority == 1.0
+    assert entries[0].changefreq == "always"
+    assert entries[0].lastmod.isoformat() == "2022-04-23T05:42:07+00:00"
+    # the image locations of a url are not urls of the sitemap
+    assert not any("wp-content" in entry.loc for entry in entries)
+
+
+def test_sitemap_parser_index() -> None:
+    parser = SitemapParser()
+    entries = parse_chunks(parser, split(read_fixture("sitemap-index.xml"), 100))
+    assert parser.kind == "sitemapindex"
+    assert len(entries) == 10
+    assert entries[1] == SitemapReference(
+        loc="https://getcommunity.com/page-sitemap.xml",
+        lastmod=parse_sitemap_date("2023-12-19T19:10:18+00:00"),
+    )
+
+
+def test_sitemap_parser_rejects_invalid_documents() -> None:
+    with pytest.raises(SitemapError, match="Not a sitemap"):
+        parse_chunks(SitemapParser(), iter([read_fixture("sitemap-invalid.xml")]))
+    with pytest.raises(SitemapError, match="Invalid sitemap XML"):
+        parse_chunks(SitemapParser(), iter([b"<urlset><url><loc>/</url>"]))
+    with pytest.raises(SitemapError, match="Invalid sitemap XML"):
+        parse_chunks(SitemapParser(), iter([]))
+    data: bytes = read_fixture("sitemap-urlset.xml")
+    with pytest.raises(SitemapError, match="larger than"):
+        parse_chunks(SitemapParser(max_bytes=1000), split(data, 64))
+    with pytest.raises(SitemapError, match="larger than"):
+        parse_chunks(SitemapParser(max_bytes=1000), split(gzip.compress(data), 64))
+
+
+def generate_urlset(url_count: int) -> Iterator[bytes]:
+    yield b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for i in range(url_count):
+        yield (
+            f"<url><loc>https://example.com/page-{i}/</loc>"
+            "<lastmod>2024-01-16T20:56:57+00:00</lastmod>"
+            "<changefreq>weekly</changefreq><priority>0.5</priority></url>\n"
+        ).encode()
+    yield b"</urlset>\n"
+
+
+def test_sitemap_parser_streams_entries() -> None:
+    url_count = 2000
+    parser = SitemapParser()
+    chunks = list(generate_urlset(url_count))
+    # the entries of a chunk are yielded before the rest of the body is fed
+    fed = parser.feed(b"".join(chunks[:102]))
+    assert len(fed) >= 99
+    assert fed[0].loc == "https://example.com/page-0/"
+    entries = parse_chunks(parser, iter(chunks[102:]))
+    assert len(fed) + len(entries) == url_count
+    assert entries[-1].loc == f"https://example.com/page-{url_count - 1}/"
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import settings
+from app.db.pool import (
+    MonitoredAsyncAdaptedQueuePool,
+    PoolMetrics,
+    PoolStats,
+    get_pool_stats,
+    pool_metrics,
+    warm_up_pool,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_pool_metrics_count_slow_checkouts() -> None:
+    metrics: PoolMetrics = PoolMetrics(name="test", slow_checkout_ms=10)
+    metrics.record_checkout(2.5)
+    metrics.record_checkout(12.5)
+    stats: PoolStats = metrics.stats()
+    assert stats.checkouts == 2
+    assert stats.slow_checkouts == 1
+    assert stats.checkout_total_ms == 15.0
+    assert stats.checkout_max_ms == 12.5
+
+
+async def test_pool_warm_up_opens_pool_connections() -> None:
+    engine: AsyncEngine = create_async_engine(
+        settings.db.uri_async,
+        poolclass=MonitoredAsyncAdaptedQueuePool,
+        pool_logging_name="warm_up_test",
+        pool_size=2,
+        max_overflow=1,
+    )
+    try:
+        assert await warm_up_pool(engine, 5) == 2
+        stats: PoolStats = get_pool_stats(engine)
+        assert stats.name == "warm_up_test"
+        assert stats.size == 2
+        assert stats.checked_in == 2
+        assert stats.checked_out == 0
+        assert stats.checkouts == 2
+        async with engine.connect():
+            assert get_pool_stats(engine).checked_out == 1
+        assert get_pool_stats(engine).checkouts == 3
+    finally:
+        await engine.dispose()
+        pool_metrics.pop("warm_up_test", None)
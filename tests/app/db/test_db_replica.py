@@ -0,0 +1,127 @@
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.db.base import Base
+from app.db.session import (
+    REPLICA_KEY,
+    async_session,
+    has_written,
+    next_replica_engine,
+    read_from_primary,
+)
+from app.entities.api.dependencies import (
+    PRIMARY_UNTIL_SESSION_KEY,
+    reads_from_replica,
+)
+from app.entities.auth.dependencies import get_current_user
+from app.entities.core_user.crud import user_cache
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.schemas import WebsiteCreate
+from app.services.clerk.schemas import ClerkUser
+from app.utilities import get_uuid_str
+from tests.utils.utils import random_domain, random_email
+from tests.utils.websites import create_random_website
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="module")
+async def replica_engine(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> AsyncGenerator[AsyncEngine, None]:
+    # a second sqlite file stands in for a replica that did not replicate yet
+    replica_path: Path = tmp_path_factory.mktemp("replica") / "test_replica.db"
+    sync_engine = create_engine(f"sqlite:///{replica_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{replica_path}")
+    yield engine
+    await engine.dispose()
+    Base.metadata.drop_all(bind=sync_engine)
+    sync_engine.dispose()
+
+
+def build_request(method: str, session: dict | None = None) -> Request:
+    scope: dict = {"type": "http", "method": method, "headers": []}
+    if session is not None:
+        scope["session"] = session
+    return Request(scope)
+
+
+async def test_routing_session_reads_replica_until_it_writes(
+    db_session: AsyncSession,
+    replica_engine: AsyncEngine,
+) -> None:
+    website = await create_random_website(db_session)
+    session: AsyncSession
+    async with async_session() as session:
+        session.info[REPLICA_KEY] = replica_engine
+        repo: WebsiteRepository = WebsiteRepository(session=session)
+        assert await repo.read_by("domain", website.domain) is None
+        assert not has_written(session)
+        await repo.create(WebsiteCreate(domain=random_domain()))
+        assert has_written(session)
+        assert await repo.read_by("domain", website.domain) is not None
+
+
+async def test_session_without_replica_reads_primary(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    assert next_replica_engine() is None
+    session: AsyncSession
+    async with async_session() as session:
+        repo: WebsiteRepository = WebsiteRepository(session=session)
+        assert await repo.read_by("domain", website.domain) is not None
+
+
+async def test_read_from_primary_after_replica_miss(
+    db_session: AsyncSession,
+    replica_engine: AsyncEngine,
+) -> None:
+    website = await create_random_website(db_session)
+    session: AsyncSession
+    async with async_session() as session:
+        session.info[REPLICA_KEY] = replica_engine
+        repo: WebsiteRepository = WebsiteRepository(session=session)
+        assert await repo.read_by("domain", website.domain) is None
+        assert read_from_primary(session)
+        assert await repo.read_by("domain", website.domain) is not None
+        assert not read_from_primary(session)
+
+
+async def test_get_current_user_not_replicated_yet(
+    db_session: AsyncSession,
+    replica_engine: AsyncEngine,
+) -> None:
+    auth_user: ClerkUser = ClerkUser(
+        user_id="user_" + get_uuid_str().replace("-", ""),
+        email=random_email(),
+        is_verified=True,
+    )
+    user = await get_current_user(db_session, auth_user)
+    await db_session.commit()
+    user_cache.clear()
+    session: AsyncSession
+    async with async_session() as session:
+        session.info[REPLICA_KEY] = replica_engine
+        replica_user = await get_current_user(session, auth_user)
+        assert replica_user.id == user.id
+        assert not has_written(session)
+
+
+def test_reads_from_replica_for_safe_requests() -> None:
+    assert reads_from_replica(build_request("GET"))
+    assert reads_from_replica(build_request("HEAD", session={}))
+    assert not reads_from_replica(build_request("POST"))
+    assert not reads_from_replica(None)
+    # the client wrote within the replica lag tolerance
+    sticky = {PRIMARY_UNTIL_SESSION_KEY: time.time() + 60}
+    assert not reads_from_replica(build_request("GET", session=sticky))
+    expired = {PRIMARY_UNTIL_SESSION_KEY: time.time() - 60}
+    assert reads_from_replica(build_request("GET", session=expired))
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import after_commit, get_db_session, is_unit_of_work
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.model import Website
+from app.entities.website.schemas import WebsiteCreate
+from tests.utils.utils import random_domain
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_db_session_unit_of_work_commits_once(db_session: AsyncSession) -> None:
+    committed: list[str] = []
+    domain: str = random_domain()
+    async with get_db_session(unit_of_work=True) as session:
+        assert is_unit_of_work(session)
+        repo: WebsiteRepository = WebsiteRepository(session=session)
+        website: Website = await repo.create(WebsiteCreate(domain=domain))
+        after_commit(session, lambda: committed.append(domain))
+        # flushed, visible to the session but not yet committed
+        assert await repo.read_by("domain", domain) is website
+        assert committed == []
+        async with get_db_session() as other_session:
+            other_repo: WebsiteRepository = WebsiteRepository(session=other_session)
+            assert await other_repo.read_by("domain", domain) is None
+    assert committed == [domain]
+    assert await WebsiteRepository(db_session).read_by("domain", domain) is not None
+
+
+async def test_db_session_unit_of_work_rolls_back_on_error(
+    db_session: AsyncSession,
+) -> None:
+    committed: list[str] = []
+    domain: str = random_domain()
+    with pytest.raises(ValueError):
+        async with get_db_session(unit_of_work=True) as session:
+            repo: WebsiteRepository = WebsiteRepository(session=session)
+            await repo.create(WebsiteCreate(domain=domain))
+            after_commit(session, lambda: committed.append(domain))
+            raise ValueError("request failed")
+    assert committed == []
+    assert await WebsiteRepository(db_session).read_by("domain", domain) is None
+
+
+async def test_db_session_commits_each_write_by_default(
+    db_session: AsyncSession,
+) -> None:
+    committed: list[str] = []
+    domain: str = random_domain()
+    async with get_db_session() as session:
+        assert not is_unit_of_work(session)
+        after_commit(session, lambda: committed.append(domain))
+        assert committed == [domain]
+        await WebsiteRepository(session=session).create(WebsiteCreate(domain=domain))
+        async with get_db_session() as other_session:
+            other_repo: WebsiteRepository = WebsiteRepository(session=other_session)
+            assert await other_repo.read_by("domain", domain) is not None
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.constants import DB_STR_USER_PICTURE_DEFAULT
 from app.entities.auth.constants import ERROR_MESSAGE_UNAUTHORIZED
 from app.entities.auth.dependencies import get_current_user, get_current_user_privileges
+from app.entities.core_user.crud import UserRepository, user_cache
 from app.services.clerk.schemas import ClerkUser
 from app.services.permission import AclPrivilege, Authenticated, Everyone
 from app.utilities import get_uuid_str
@@ -58,6 +59,23 @@ async def test_get_current_user(db_session: AsyncSession, auth: MockAuth) -> Non
     assert exc_info.value.detail == ERROR_MESSAGE_UNAUTHORIZED
 
 
+async def test_get_current_user_skips_unchanged_write(
+    db_session: AsyncSession, auth: MockAuth, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user: ClerkUser = await auth.get_user()
+    await get_current_user(db_session, user)
+    assert user.auth_id in user_cache
+
+    async def fail_update(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("user update should be skipped")
+
+    monkeypatch.setattr(UserRepository, "update", fail_update)
+    hits: int = user_cache.hits
+    user_in_db = await get_current_user(db_session, user)
+    assert user_in_db.auth_id == user.auth_id
+    assert user_cache.hits == hits + 1
+
+
 async def test_get_current_user_privileges(
     db_session: AsyncSession, auth: MockAuth
 ) -> None:
@@ -1,11 +1,31 @@
+from typing import Any
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.entities.api.errors import EntityNotFound
 from app.entities.auth.dependencies import PermissionController
 from app.entities.core_organization.crud import OrganizationRepository
-from app.entities.core_user.crud import UserRepository
+from app.entities.core_user.crud import (
+    UserRepository,
+    access_graph_cache,
+    invalidate_access_graphs,
+)
 from app.entities.core_user_organization.crud import UserOrganizationRepository
-from tests.utils.users import create_core_user
+from app.entities.organization_website.crud import user_website_access
+from app.entities.website.crud import WebsiteRepository
+from app.entities.website.model import Website
+from app.services.permission import AuthPermissionException, RoleAdmin, RoleManager
+from app.utilities import get_uuid
+from tests.utils.organizations import (
+    assign_platform_to_organization,
+    assign_user_to_organization,
+    assign_website_to_organization,
+    create_random_organization,
+)
+from tests.utils.platform import create_random_platform
+from tests.utils.users import create_core_user, create_random_user
+from tests.utils.websites import create_random_website
 
 pytestmark = pytest.mark.anyio
 
@@ -19,3 +39,139 @@ async def test_init_permission_controller(db_session: AsyncSession) -> None:
     assert isinstance(perms.user_repo, UserRepository)
     assert isinstance(perms.organization_repo, OrganizationRepository)
     assert isinstance(perms.user_organization_repo, UserOrganizationRepository)
+
+
+async def test_permission_controller_access_graph(db_session: AsyncSession) -> None:
+    user_a = await create_random_user(db_session)
+    user_b = await create_random_user(db_session)
+    user_c = await create_random_user(db_session)
+    organization = await create_random_organization(db_session)
+    website = await create_random_website(db_session)
+    platform = await create_random_platform(db_session)
+    await assign_user_to_organization(db_session, user_a.id, organization.id)
+    await assign_user_to_organization(db_session, user_b.id, organization.id)
+    await assign_website_to_organization(db_session, website.id, organization.id)
+    await assign_platform_to_organization(db_session, platform.id, organization.id)
+    perms: PermissionController = PermissionController(db_session, user_a, [])
+    assert await perms.verify_user_can_access(organization_id=organization.id)
+    assert await perms.verify_user_can_access(user_id=user_b.id)
+    assert await perms.verify_user_can_access(website_id=website.id)
+    assert await perms.verify_user_can_access(platform_id=platform.id)
+    assert user_a.id in access_graph_cache
+    with pytest.raises(AuthPermissionException):
+        await perms.verify_user_can_access(user_id=user_c.id)
+    # a new membership invalidates the cached graph
+    await assign_user_to_organization(db_session, user_c.id, organization.id)
+    assert user_a.id not in access_graph_cache
+    assert await perms.verify_user_can_access(user_id=user_c.id)
+
+
+async def test_user_repo_verify_relationship_exists(db_session: AsyncSession) -> None:
+    user_a = await create_random_user(db_session)
+    user_b = await create_random_user(db_session)
+    organization = await create_random_organization(db_session)
+    website = await create_random_website(db_session)
+    repo: UserRepository = UserRepository(db_session)
+    assert not await repo.verify_relationship(current_user_id=user_a.id)
+    assert not await repo.verify_relationship(
+        current_user_id=user_a.id, organization_id=organization.id
+    )
+    await assign_user_to_organization(db_session, user_a.id, organization.id)
+    await assign_user_to_organization(db_session, user_b.id, organization.id)
+    assert await repo.verify_relationship(
+        current_user_id=user_a.id, organization_id=organization.id
+    )
+    assert await repo.verify_relationship(current_user_id=user_a.id, user_id=user_b.id)
+    assert not await repo.verify_relationship(
+        current_user_id=user_a.id, website_id=website.id
+    )
+    await assign_website_to_organization(db_session, website.id, organization.id)
+    assert await repo.verify_relationship(
+        current_user_id=user_a.id,
+        organization_id=organization.id,
+        website_id=website.id,
+    )
+
+
+async def test_permission_controller_read_if_accessible(
+    db_session: AsyncSession,
+) -> None:
+    user_a = await create_random_user(db_session)
+    organization = await create_random_organization(db_session)
+    website = await create_random_website(db_session)
+    other_website = await create_random_website(db_session)
+    await assign_user_to_organization(db_session, user_a.id, organization.id)
+    await assign_website_to_organization(db_session, website.id, organization.id)
+    perms: PermissionController = PermissionController(db_session, user_a, [])
+    website_repo: WebsiteRepository = WebsiteRepository(db_session)
+    a_website: Website = await perms.read_if_accessible(
+        repository=website_repo,
+        entry_id=website.id,
+        access=user_website_access(Website.id, user_a.id),
+        entity_info="Website {}".format(website.id),
+    )
+    assert a_website.id == website.id
+    with pytest.raises(AuthPermissionException) as exc_info:
+        await perms.read_if_accessible(
+            repository=website_repo,
+            entry_id=other_website.id,
+            access=user_website_access(Website.id, user_a.id),
+            entity_info="Website {}".format(other_website.id),
+        )
+    assert exc_info.value.status_code == 405
+    with pytest.raises(EntityNotFound):
+        await perms.read_if_accessible(
+            repository=website_repo,
+            entry_id=get_uuid(),
+            access=user_website_access(Website.id, user_a.id),
+            entity_info="Website",
+        )
+    manager_perms: PermissionController = PermissionController(
+        db_session, user_a, [RoleManager]
+    )
+    b_website: Website = await manager_perms.read_if_accessible(
+        repository=website_repo,
+        entry_id=other_website.id,
+        access=user_website_access(Website.id, user_a.id),
+        entity_info="Website {}".format(other_website.id),
+        privileges=[RoleAdmin, RoleManager],
+    )
+    assert b_website.id == other_website.id
+
+
+async def test_permission_controller_access_graph_organization_delete(
+    db_session: AsyncSession,
+) -> None:
+    user_a = await create_random_user(db_session)
+    organization = await create_random_organization(db_session)
+    website = await create_random_website(db_session)
+    await assign_user_to_organization(db_session, user_a.id, organization.id)
+    await assign_website_to_organization(db_session, website.id, organization.id)
+    perms: PermissionController = PermissionController(db_session, user_a, [])
+    assert await perms.verify_user_can_access(website_id=website.id)
+    assert user_a.id in access_graph_cache
+    # deleting the organization revokes the memberships it cascades to
+    await OrganizationRepository(db_session).delete_many([organization.id])
+    assert user_a.id not in access_graph_cache
+
+
+async def test_user_repo_read_access_graph_not_cached_across_invalidation(
+    db_session: AsyncSession,
+) -> None:
+    user_a = await create_random_user(db_session)
+    users_repo: UserRepository = UserRepository(db_session)
+    real_execute = db_session.execute
+
+    async def execute_during_membership_change(*args: Any, **kwargs: Any) -> Any:
+        result = await real_execute(*args, **kwargs)
+        invalidate_access_graphs()
+        return result
+
+    db_session.execute = execute_during_membership_change  # type: ignore[method-assign]
+    try:
+        await users_repo.read_access_graph(user_a.id)
+    finally:
+        db_session.execute = real_execute  # type: ignore[method-assign]
+    assert user_a.id not in access_graph_cache
+    await users_repo.read_access_graph(user_a.id)
+    assert user_a.id in access_graph_cache
@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.entities.core_ipaddress.crud_utilities import assign_ip_address_to_user
+from app.entities.core_ipaddress.schemas import IpinfoResponse
+from app.entities.core_ipaddress.utilities import IpaddressDetailsLookup
 from app.entities.core_user_ipaddress.crud import UserIpaddressRepository
 from app.entities.core_user_ipaddress.model import UserIpaddress
 from tests.utils.ipaddress import create_random_ipaddress
@@ -52,3 +56,47 @@ async def test_assign_ip_address_to_user_repeat_ip(
         }
     )
     assert user_ip_address is not None
+
+
+async def test_ipaddress_details_lookup_coalesces_and_caches() -> None:
+    ip_address = random_ipaddress()
+    calls: list[str] = []
+
+    async def fetch(ip: str) -> IpinfoResponse | None:
+        calls.append(ip)
+        await asyncio.sleep(0.01)
+        return IpinfoResponse.model_validate(
+            {**dict.fromkeys(IpinfoResponse.model_fields), "address": ip}
+        )
+
+    lookup = IpaddressDetailsLookup(fetch=fetch, maxsize=10, ttl=60)
+    results = await asyncio.gather(*(lookup.lookup(ip_address) for _ in range(50)))
+    assert calls == [ip_address]
+    assert all(result is results[0] for result in results)
+    assert await lookup.lookup(ip_address) is results[0]
+    assert calls == [ip_address]
+    assert lookup.cache.stats().hits == 1
+
+
+async def test_ipaddress_details_lookup_caches_failures() -> None:
+    ip_address = random_ipaddress()
+    calls: list[str] = []
+
+    async def fetch(ip: str) -> IpinfoResponse | None:
+        calls.append(ip)
+        raise TimeoutError("ipinfo.io timed out")
+
+    lookup = IpaddressDetailsLookup(fetch=fetch, negative_ttl=0.05)
+    with pytest.raises(TimeoutError):
+        await lookup.lookup(ip_address)
+    assert await lookup.lookup(ip_address) is None
+    assert calls == [ip_address]
+    # a retry looks the address up again
+    with pytest.raises(TimeoutError):
+        await lookup.lookup(ip_address, retry_failed=True)
+    assert calls == [ip_address, ip_address]
+    # the failure is retried once it expires
+    await asyncio.sleep(0.06)
+    with pytest.raises(TimeoutError):
+        await lookup.lookup(ip_address)
+    assert calls == [ip_address, ip_address, ip_address]
@@ -0,0 +1,92 @@
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entities.tracking_link.crud import TrackingLinkRepository
+from app.entities.tracking_link.crud_utilities import (
+    import_tracking_links,
+    iter_import_lines,
+)
+from app.entities.tracking_link.errors import TrackingLinkImportHeaderInvalid
+from app.entities.tracking_link.schemas import TrackingLinkImportFormat
+from app.entities.tracking_link.utilities import hash_url
+from tests.utils.organizations import create_random_organization
+from tests.utils.tracking_link import (
+    create_random_tracking_link,
+    create_random_tracking_link_url,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def stream_body(body: bytes, size: int = 7) -> AsyncIterator[bytes]:
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+async def test_iter_import_lines() -> None:
+    body: str = "\ufeffurl\r\nb\n\n" + "c" * 20 + "\nd"
+    lines = [line async for line in iter_import_lines(stream_body(body.encode()), 10)]
+    assert lines == ["url", "b", "", None, "d"]
+
+
+async def test_import_tracking_links_csv(db_session: AsyncSession) -> None:
+    organization = await create_random_organization(db_session)
+    existing = await create_random_tracking_link(db_session, organization.id)
+    urls: list[str] = [await create_random_tracking_link_url() for _ in range(5)]
+    rows: list[str] = ["url,is_active", f"{urls[0]},false"]
+    rows.extend(urls[1:])
+    rows.extend([urls[2], existing.url, "", ",true", '"' + "a" * 9000 + '"'])
+    links_repo = TrackingLinkRepository(db_session)
+    result = await import_tracking_links(
+        links_repo,
+        stream_body("\n".join(rows).encode(), size=64),
+        TrackingLinkImportFormat.CSV,
+        organization_id=organization.id,
+        chunk_size=2,
+    )
+    assert result.rows == 9
+    assert result.created == 5
+    assert result.duplicates == 2
+    assert result.failed == 2
+    assert [error.row for error in result.errors] == [10, 11]
+    for url in urls:
+        link = await links_repo.exists_by_fields({"url_hash": hash_url(url)})
+        assert link is not None
+        assert link.organization_id == organization.id
+        assert link.is_active is (url != urls[0])
+        assert link.utm_campaign is not None
+
+
+async def test_import_tracking_links_ndjson(db_session: AsyncSession) -> None:
+    url: str = await create_random_tracking_link_url()
+    rows: list[str] = [
+        json.dumps({"url": url}),
+        json.dumps({"url": url, "is_active": False}),
+        "[1, 2]",
+        "{",
+    ]
+    result = await import_tracking_links(
+        TrackingLinkRepository(db_session),
+        stream_body("\n".join(rows).encode()),
+        TrackingLinkImportFormat.NDJSON,
+    )
+    assert result.rows == 4
+    assert result.created == 1
+    assert result.duplicates == 1
+    assert result.failed == 2
+    assert result.errors[0].error == "Row is not a JSON object"
+    assert result.errors[1].error.startswith("Invalid JSON")
+
+
+async def test_import_tracking_links_csv_header_invalid(
+    db_session: AsyncSession,
+) -> None:
+    with pytest.raises(TrackingLinkImportHeaderInvalid):
+        await import_tracking_links(
+            TrackingLinkRepository(db_session),
+            stream_body(b"link\nhttps://example.com/"),
+            TrackingLinkImportFormat.CSV,
+        )
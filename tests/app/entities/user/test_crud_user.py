@@ -1,10 +1,13 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.entities.core_user.crud import UserRepository
+from app.entities.core_user.crud import UserRepository, user_cache
 from app.entities.core_user.model import User
+from app.entities.core_user.schemas import UserUpdateAsAdmin, UserUpdatePrivileges
 from app.services.clerk.settings import clerk_settings
-from tests.utils.users import create_core_user
+from app.services.encryption import blind_index
+from app.services.permission import AclPrivilege
+from tests.utils.users import create_core_user, create_random_user
 
 pytestmark = pytest.mark.anyio
 
@@ -23,3 +26,63 @@ async def test_user_get_privileges(db_session: AsyncSession) -> None:
     privileges = user_employee.privileges()
 
     assert "user:{}".format(user_employee.id) in privileges
+
+
+async def test_user_read_by_auth_id_cached(db_session: AsyncSession) -> None:
+    user: User = await create_random_user(db_session)
+    user_repo: UserRepository = UserRepository(db_session)
+    user_cache.pop(user.auth_id, None)
+    hits: int = user_cache.hits
+    user_read: User | None = await user_repo.read_by_auth_id(user.auth_id)
+    assert user_read is not None
+    assert user.auth_id in user_cache
+    user_cached: User | None = await user_repo.read_by_auth_id(user.auth_id)
+    assert user_cache.hits == hits + 1
+    assert user_cached is not None
+    assert user_cached.id == user.id
+    assert user_cached.scopes == user.scopes
+
+
+async def test_user_cache_invalidated_on_write(db_session: AsyncSession) -> None:
+    user: User = await create_random_user(db_session)
+    user_repo: UserRepository = UserRepository(db_session)
+    await user_repo.read_by_auth_id(user.auth_id)
+    assert user.auth_id in user_cache
+    await user_repo.update(entry=user, schema=UserUpdateAsAdmin(is_active=False))
+    assert user.auth_id not in user_cache
+    await user_repo.read_by_auth_id(user.auth_id)
+    test_priv = AclPrivilege("test:cache")
+    user = await user_repo.add_privileges(
+        entry=user, schema=UserUpdatePrivileges(scopes=[test_priv])
+    )
+    assert user.auth_id not in user_cache
+    user_read: User | None = await user_repo.read_by_auth_id(user.auth_id)
+    assert user_read is not None
+    assert test_priv in user_read.scopes
+    await user_repo.remove_privileges(
+        entry=user, schema=UserUpdatePrivileges(scopes=[test_priv])
+    )
+    assert user.auth_id not in user_cache
+
+
+async def test_user_auth_id_hash_maintained(db_session: AsyncSession) -> None:
+    user: User = await create_random_user(db_session)
+    assert user.auth_id_hash == blind_index(user.auth_id)
+    user_repo: UserRepository = UserRepository(db_session)
+    user_read: User | None = await user_repo.read_by("auth_id", user.auth_id)
+    assert user_read is not None
+    assert user_read.id == user.id
+
+
+async def test_user_backfill_auth_id_hash(db_session: AsyncSession) -> None:
+    user: User = await create_random_user(db_session)
+    user.auth_id_hash = None
+    await db_session.commit()
+    user_repo: UserRepository = UserRepository(db_session)
+    user_read: User | None = await user_repo.read_by("auth_id", user.auth_id)
+    assert user_read is not None
+    assert user_read.id == user.id
+    count: int = await user_repo.backfill_auth_id_hash(batch_size=2)
+    assert count >= 1
+    await db_session.refresh(user)
+    assert user.auth_id_hash == blind_index(user.auth_id)
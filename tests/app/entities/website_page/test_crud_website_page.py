@@ -1,8 +1,12 @@
 import pytest
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.entities.tracking_link.utilities import hash_url
 from app.entities.website_page.crud import WebsitePageRepository
 from app.entities.website_page.model import WebsitePage
+from tests.utils.website_pages import create_random_website_page
+from tests.utils.websites import create_random_website
 
 pytestmark = pytest.mark.anyio
 
@@ -10,3 +14,35 @@ pytestmark = pytest.mark.anyio
 async def test_website_page_repo_table(db_session: AsyncSession) -> None:
     repo: WebsitePageRepository = WebsitePageRepository(session=db_session)
     assert repo._table is WebsitePage
+
+
+async def test_website_page_backfill_url_hash(db_session: AsyncSession) -> None:
+    website = await create_random_website(db_session)
+    page = await create_random_website_page(db_session, website.id)
+    other_page = await create_random_website_page(db_session, website.id)
+    # pages without a hash do not collide in the unique constraint
+    await db_session.execute(
+        update(WebsitePage)
+        .where(WebsitePage.id.in_([page.id, other_page.id]))
+        .values(url_hash=None)
+    )
+    await db_session.commit()
+    repo: WebsitePageRepository = WebsitePageRepository(session=db_session)
+    count: int = await repo.backfill_url_hash(batch_size=2)
+    assert count >= 2
+    for page_id in (page.id, other_page.id):
+        entry: WebsitePage | None = await repo.read(page_id)
+        assert entry is not None
+        assert entry.url_hash == hash_url(entry.url)
+
+
+async def test_website_page_read_active_urls(db_session: AsyncSession) -> None:
+    website = await create_random_website(db_session)
+    pages = [await create_random_website_page(db_session, website.id) for _ in range(3)]
+    await create_random_website_page(db_session, website.id, is_active=False)
+    repo: WebsitePageRepository = WebsitePageRepository(session=db_session)
+    first = await repo.read_active_urls(website.id, limit=2)
+    rest = await repo.read_active_urls(website.id, after_id=first[-1][0], limit=2)
+    assert len(first) == 2
+    assert len(rest) == 1
+    assert sorted(first + rest) == sorted((page.id, page.url) for page in pages)
@@ -0,0 +1,370 @@
+from datetime import timedelta
+
+import httpx
+import pytest
+from pydantic import UUID4
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.sitemap import SitemapError, SitemapRedirectError
+from app.entities.website_page.crud import WebsitePageRepository
+from app.entities.website_page.crud_utilities import (
+    sitemap_url_path,
+    sync_website_sitemap,
+)
+from app.entities.website_page.model import WebsitePage
+from app.entities.website_page.schemas import WebsiteSitemapSyncProgress
+from app.utilities.dates_and_time import get_date
+from tests.utils.website_pages import create_random_website_page
+from tests.utils.website_sitemaps import SitemapStub
+from tests.utils.websites import create_random_website
+
+pytestmark = pytest.mark.anyio
+
+SITEMAP_ROUTES: dict[str, str] = {
+    "/sitemap.xml": "sitemap-index.xml",
+    "/page-sitemap.xml": "sitemap-urlset.xml",
+    "/branch-sitemap.xml": "sitemap-page.xml",
+    "/invalid-sitemap.xml": "sitemap-invalid.xml",
+}
+
+
+async def backdate_page(db_session: AsyncSession, page_id: UUID4) -> None:
+    await db_session.execute(
+        update(WebsitePage)
+        .where(WebsitePage.id == page_id)
+        .values(updated_at=get_date() - timedelta(days=1))
+    )
+    await db_session.commit()
+
+
+async def read_pages(
+    db_session: AsyncSession, website_id: UUID4
+) -> dict[str, WebsitePage]:
+    pages_repo = WebsitePageRepository(db_session)
+    results = await db_session.execute(pages_repo.query_list(website_id=website_id))
+    return {page.url: page for page in results.scalars().all()}
+
+
+def test_sitemap_url_path() -> None:
+    assert sitemap_url_path("https://example.com", "example.com") == "/"
+    assert sitemap_url_path("https://Example.com/a/?b=1", "example.com") == "/a/?b=1"
+    assert sitemap_url_path("https://other.com/a/", "example.com") is None
+    assert sitemap_url_path("ftp://example.com/a/", "example.com") is None
+    assert sitemap_url_path("https://example.com/" + "a" * 2048, "example.com") is None
+
+
+async def test_sync_website_sitemap_index(db_session: AsyncSession) -> None:
+    website = await create_random_website(db_session)
+    await create_random_website_page(db_session, website.id, path="/contact/")
+    old_page = await create_random_website_page(db_session, website.id)
+    await backdate_page(db_session, old_page.id)
+    async with SitemapStub(SITEMAP_ROUTES) as stub:
+        client = stub.client()
+        progress = WebsiteSitemapSyncProgress(
+            website_id=website.id, sitemap_url=f"{stub.url}/sitemap.xml"
+        )
+        try:
+            await sync_website_sitemap(progress, client=client, chunk_size=10)
+        finally:
+            await client.aclose()
+    assert progress.sitemaps == 3
+    # the index lists 8 more sitemaps the stub does not serve
+    assert progress.failed_sitemaps == 8
+    assert progress.pages == 27
+    assert progress.skipped == 0
+    assert progress.added == 26
+    assert progress.updated == 1
+    # pages are only removed when every sitemap was read
+    assert progress.removed == 0
+    assert stub.requests[0] == "/sitemap.xml"
+    assert len(stub.requests) == 11
+    pages = await read_pages(db_session, website.id)
+    assert len(pages) == 28
+    assert pages[old_page.url].is_active
+    assert pages["/"].priority == 1.0
+    assert pages["/"].change_frequency == "always"
+    assert pages["/"].last_modified.year == 2022
+    assert pages["/branch/gc-marketing/"].priority == 0.7
+    assert pages["/branch/gc-marketing/"].change_frequency == "weekly"
+
+
+async def test_sync_website_sitemap_deactivates_missing_pages(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    old_page = await create_random_website_page(db_session, website.id)
+    user_page = await create_random_website_page(db_session, website.id)
+    inactive_page = await create_random_website_page(
+        db_session, website.id, path="/policies/", is_active=False
+    )
+    # a page of a sitemap that was since deleted
+    await db_session.execute(
+        update(WebsitePage)
+        .where(WebsitePage.id == old_page.id)
+        .values(from_sitemap=True)
+    )
+    await db_session.commit()
+    await backdate_page(db_session, old_page.id)
+    await backdate_page(db_session, user_page.id)
+    await backdate_page(db_session, inactive_page.id)
+    async with SitemapStub(SITEMAP_ROUTES) as stub:
+        client = stub.client()
+        try:
+            progress = await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=f"{stub.url}/page-sitemap.xml"
+                ),
+                client=client,
+                chunk_size=10,
+            )
+            assert progress.sitemaps == 1
+            assert progress.pages == 25
+            assert progress.added == 24
+            assert progress.updated == 1
+            assert progress.removed == 1
+            pages = await read_pages(db_session, website.id)
+            assert len(pages) == 27
+            assert not pages[old_page.url].is_active
+            # no sitemap listed the page a user created, it stays active
+            assert pages[user_page.url].is_active
+            assert not pages[user_page.url].from_sitemap
+            assert pages["/policies/"].is_active
+            assert pages["/policies/"].from_sitemap
+            assert pages["/policies/"].id == inactive_page.id
+            # a second sync finds the sitemap unchanged
+            progress = await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=f"{stub.url}/page-sitemap.xml"
+                ),
+                client=client,
+            )
+            assert progress.unchanged_sitemaps == 1
+            assert progress.pages == 0
+            assert progress.added == 0
+            assert progress.updated == 0
+            assert progress.removed == 0
+            assert stub.statuses == [200, 304]
+        finally:
+            await client.aclose()
+
+
+async def test_sync_website_sitemap_updates_changed_pages(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    async with SitemapStub(SITEMAP_ROUTES) as stub:
+        client = stub.client()
+        sitemap_url: str = f"{stub.url}/page-sitemap.xml"
+        try:
+            await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=sitemap_url
+                ),
+                client=client,
+                chunk_size=10,
+            )
+            priorities: dict[str, float] = {
+                url: page.priority
+                for url, page in (await read_pages(db_session, website.id)).items()
+            }
+            content: str = stub.content["/page-sitemap.xml"].decode()
+            assert f"<loc><![CDATA[{stub.url}/policies/]]></loc>" in content
+            # one page changes its priority and one page moves to a new url
+            content = content.replace(
+                "<priority><![CDATA[0.7]]></priority>",
+                "<priority><![CDATA[0.3]]></priority>",
+                1,
+            )
+            content = content.replace(
+                f"<loc><![CDATA[{stub.url}/policies/]]>",
+                f"<loc><![CDATA[{stub.url}/policies/moved/]]>",
+            )
+            stub.content["/page-sitemap.xml"] = content.encode()
+            progress = await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=sitemap_url
+                ),
+                client=client,
+                chunk_size=10,
+            )
+        finally:
+            await client.aclose()
+    assert stub.statuses == [200, 200]
+    assert progress.sitemaps == 1
+    assert progress.added == 1
+    assert progress.updated == 1
+    assert progress.unchanged == 23
+    assert progress.removed == 1
+    pages = await read_pages(db_session, website.id)
+    assert not pages["/policies/"].is_active
+    assert pages["/policies/moved/"].is_active
+    changed = [
+        url
+        for url, page in pages.items()
+        if url in priorities and page.priority != priorities[url]
+    ]
+    assert len(changed) == 1
+    assert pages[changed[0]].priority == 0.3
+
+
+async def test_sync_website_sitemap_skips_unchanged_sitemaps(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    routes: dict[str, str] = {
+        path: name
+        for path, name in SITEMAP_ROUTES.items()
+        if path != "/invalid-sitemap.xml"
+    }
+    async with SitemapStub(routes) as stub:
+        # only the sitemaps the stub serves are listed by the index
+        index: str = stub.content["/sitemap.xml"].decode()
+        head, _, rest = index.partition("<sitemap>")
+        entries: list[str] = [
+            "<sitemap>" + entry
+            for entry in rest.split("<sitemap>")
+            if "/page-sitemap.xml" in entry or "/branch-sitemap.xml" in entry
+        ]
+        tail: str = "</sitemapindex>"
+        stub.content["/sitemap.xml"] = (head + "".join(entries) + tail).encode()
+        client = stub.client()
+        sitemap_url: str = f"{stub.url}/sitemap.xml"
+        try:
+            progress = await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=sitemap_url
+                ),
+                client=client,
+            )
+            assert progress.sitemaps == 3
+            assert progress.failed_sitemaps == 0
+            assert progress.added == 27
+            # the index is unchanged, its sitemaps are not requested again
+            stub.requests.clear()
+            progress = await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=sitemap_url
+                ),
+                client=client,
+            )
+            assert stub.requests == ["/sitemap.xml"]
+            assert progress.sitemaps == 0
+            assert progress.unchanged_sitemaps == 3
+            assert progress.pages == 0
+            assert progress.removed == 0
+            # the index drops the branch sitemap and bumps the page sitemap
+            stub.requests.clear()
+            entries = [
+                entry.replace("2023-12-19T19:10:18", "2024-02-01T00:00:00")
+                for entry in entries
+                if "/branch-sitemap.xml" not in entry
+            ]
+            stub.content["/sitemap.xml"] = (head + "".join(entries) + tail).encode()
+            progress = await sync_website_sitemap(
+                WebsiteSitemapSyncProgress(
+                    website_id=website.id, sitemap_url=sitemap_url
+                ),
+                client=client,
+            )
+        finally:
+            await client.aclose()
+    # the page sitemap is requested again and answers 304
+    assert stub.requests == ["/sitemap.xml", "/page-sitemap.xml"]
+    assert progress.sitemaps == 1
+    assert progress.unchanged_sitemaps == 1
+    # the pages of the branch sitemap only are deactivated
+    assert progress.removed == 2
+    pages = await read_pages(db_session, website.id)
+    assert sum(page.is_active for page in pages.values()) == 25
+    assert not pages["/branch/gc-marketing/"].is_active
+
+
+async def test_sync_website_sitemap_skips_other_hosts(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    async with SitemapStub(SITEMAP_ROUTES) as stub:
+        client = stub.client()
+        # the urls of the sitemap are on 127.0.0.1, not on localhost
+        progress = WebsiteSitemapSyncProgress(
+            website_id=website.id,
+            sitemap_url=stub.url.replace("127.0.0.1", "localhost") + "/sitemap.xml",
+        )
+        try:
+            await sync_website_sitemap(progress, client=client)
+        finally:
+            await client.aclose()
+    assert progress.sitemaps == 1
+    assert progress.failed_sitemaps == 0
+    assert progress.pages == 0
+    assert len(stub.requests) == 1
+    assert await read_pages(db_session, website.id) == {}
+
+
+async def test_sync_website_sitemap_redirects(db_session: AsyncSession) -> None:
+    website = await create_random_website(db_session)
+    async with SitemapStub(SITEMAP_ROUTES) as stub:
+        stub.redirects = {
+            "/old-sitemap.xml": "/page-sitemap.xml",
+            "/moved-sitemap.xml": stub.url.replace("127.0.0.1", "localhost")
+            + "/page-sitemap.xml",
+            "/loop-sitemap.xml": "/loop-sitemap.xml",
+        }
+        client = stub.client(max_redirects=2)
+        try:
+            progress = WebsiteSitemapSyncProgress(
+                website_id=website.id, sitemap_url=f"{stub.url}/old-sitemap.xml"
+            )
+            await sync_website_sitemap(progress, client=client)
+            assert progress.sitemaps == 1
+            assert progress.added > 0
+            assert stub.requests == ["/old-sitemap.xml", "/page-sitemap.xml"]
+            # a redirect to another host is not followed
+            stub.requests.clear()
+            with pytest.raises(SitemapRedirectError):
+                await sync_website_sitemap(
+                    WebsiteSitemapSyncProgress(
+                        website_id=website.id,
+                        sitemap_url=f"{stub.url}/moved-sitemap.xml",
+                    ),
+                    client=client,
+                )
+            assert stub.requests == ["/moved-sitemap.xml"]
+            stub.requests.clear()
+            with pytest.raises(httpx.TooManyRedirects):
+                await sync_website_sitemap(
+                    WebsiteSitemapSyncProgress(
+                        website_id=website.id,
+                        sitemap_url=f"{stub.url}/loop-sitemap.xml",
+                    ),
+                    client=client,
+                )
+            assert stub.requests == ["/loop-sitemap.xml"] * 3
+        finally:
+            await client.aclose()
+
+
+async def test_sync_website_sitemap_invalid(db_session: AsyncSession) -> None:
+    website = await create_random_website(db_session)
+    async with SitemapStub(SITEMAP_ROUTES) as stub:
+        client = stub.client()
+        try:
+            with pytest.raises(SitemapError):
+                await sync_website_sitemap(
+                    WebsiteSitemapSyncProgress(
+                        website_id=website.id,
+                        sitemap_url=f"{stub.url}/invalid-sitemap.xml",
+                    ),
+                    client=client,
+                )
+            with pytest.raises(httpx.HTTPStatusError):
+                await sync_website_sitemap(
+                    WebsiteSitemapSyncProgress(
+                        website_id=website.id,
+                        sitemap_url=f"{stub.url}/missing-sitemap.xml",
+                    ),
+                    client=client,
+                )
+        finally:
+            await client.aclose()
@@ -0,0 +1,12 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entities.website_sitemap.crud import WebsiteSitemapRepository
+from app.entities.website_sitemap.model import WebsiteSitemap
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_website_sitemap_repo_table(db_session: AsyncSession) -> None:
+    repo: WebsiteSitemapRepository = WebsiteSitemapRepository(session=db_session)
+    assert repo._table is WebsiteSitemap
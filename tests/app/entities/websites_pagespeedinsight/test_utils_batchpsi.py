@@ -0,0 +1,83 @@
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.entities.api.errors import EntityNotFound
+from app.entities.website_pagespeedinsight.crud import (
+    WebsitePageSpeedInsightsRepository,
+)
+from app.entities.website_pagespeedinsight.crud_utilities import (
+    run_website_pagespeedinsights_batch,
+)
+from app.entities.website_pagespeedinsight.schemas import (
+    PSIBatchStatus,
+    PSIDevice,
+    WebsitePageSpeedInsightsBatchProgress,
+)
+from app.utilities import get_uuid
+from tests.utils.website_pages import create_random_website_page
+from tests.utils.website_pagespeedinsights import PageSpeedInsightsStub
+from tests.utils.websites import create_random_website
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_run_website_pagespeedinsights_batch(
+    db_session: AsyncSession,
+    mock_fetch_psi: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # the pages are read in keyset chunks of 2
+    monkeypatch.setattr(settings.db, "bulk_chunk_size", 2)
+    website = await create_random_website(db_session)
+    for _ in range(5):
+        await create_random_website_page(db_session, website.id)
+    await create_random_website_page(db_session, website.id, is_active=False)
+    devices = [PSIDevice.mobile, PSIDevice.desktop]
+    progress = WebsitePageSpeedInsightsBatchProgress(
+        website_id=website.id, devices=devices
+    )
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        stub.delay = 0.01
+        client = stub.client()
+        try:
+            await run_website_pagespeedinsights_batch(
+                progress, workers=2, write_size=3, client=client
+            )
+        finally:
+            await client.aclose()
+    assert progress.status == PSIBatchStatus.finished
+    assert progress.pages == 5
+    assert progress.queued == 10
+    assert progress.fetched == 10
+    assert progress.saved == 10
+    assert progress.failed == 0
+    assert stub.max_in_flight <= 2
+    assert len(stub.requests) == 10
+    psi_repo = WebsitePageSpeedInsightsRepository(db_session)
+    saved = (
+        await db_session.execute(psi_repo.query_list(website_id=website.id))
+    ).scalars()
+    assert sorted(psi.strategy for psi in saved) == ["desktop"] * 5 + ["mobile"] * 5
+
+
+async def test_run_website_pagespeedinsights_batch_website_not_found(
+    mock_fetch_psi: dict[str, Any],
+) -> None:
+    progress = WebsitePageSpeedInsightsBatchProgress(
+        website_id=get_uuid(), devices=[PSIDevice.mobile]
+    )
+    async with PageSpeedInsightsStub(mock_fetch_psi) as stub:
+        client = stub.client()
+        try:
+            with pytest.raises(EntityNotFound):
+                await run_website_pagespeedinsights_batch(
+                    progress, workers=2, client=client
+                )
+        finally:
+            await client.aclose()
+    assert progress.status != PSIBatchStatus.finished
+    assert progress.queued == 0
+    assert len(stub.requests) == 0
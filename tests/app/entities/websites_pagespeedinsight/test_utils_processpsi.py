@@ -1,6 +1,7 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.entities.api.errors import EntityNotFound
 from app.entities.website_pagespeedinsight.crud_utilities import (
     create_website_pagespeedinsights,
 )
@@ -37,12 +38,12 @@ async def test_create_website_pagespeedinsights_website_not_found(
     psi_base: WebsitePageSpeedInsightsBase = generate_psi_base(
         device_strategy=d_strategy
     )
-    response = await create_website_pagespeedinsights(  # type: ignore
-        website_id=str(website_id),
-        page_id=str(website_page.id),
-        insights=psi_base,
-    )
-    assert response is None
+    with pytest.raises(EntityNotFound):
+        await create_website_pagespeedinsights(
+            website_id=str(website_id),
+            page_id=str(website_page.id),
+            insights=psi_base,
+        )
 
 
 @pytest.mark.anyio
@@ -55,9 +56,9 @@ async def test_create_website_pagespeedinsights_website_page_not_found(
     psi_base: WebsitePageSpeedInsightsBase = generate_psi_base(
         device_strategy=d_strategy
     )
-    response = await create_website_pagespeedinsights(  # type: ignore
-        website_id=str(website.id),
-        page_id=str(website_page_id),
-        insights=psi_base,
-    )
-    assert response is None
+    with pytest.raises(EntityNotFound):
+        await create_website_pagespeedinsights(
+            website_id=str(website.id),
+            page_id=str(website_page_id),
+            insights=psi_base,
+        )
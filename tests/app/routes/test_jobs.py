@@ -0,0 +1,98 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entities.api.constants import ERROR_MESSAGE_ENTITY_NOT_FOUND
+from app.services.permission.constants import (
+    ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS,
+)
+from app.tasks.background import bg_task_request_to_delete_user
+from app.tasks.queue import enqueue_job
+from app.utilities.uuids import get_uuid_str
+from tests.constants.schema import ClientAuthorizedUser
+from tests.utils.users import get_user_by_auth_id
+
+pytestmark = pytest.mark.anyio
+
+
+class TestReadJob:
+    async def test_read_job_as_admin_user(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+        employee_user: ClientAuthorizedUser,
+    ) -> None:
+        user = await get_user_by_auth_id(db_session, employee_user.auth_id)
+        job, _ = await enqueue_job(
+            bg_task_request_to_delete_user,
+            payload={"user_id": str(user.id)},
+            user_id=user.id,
+        )
+        response: Response = await client.get(
+            f"jobs/{job.id}",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["id"] == str(job.id)
+        assert data["name"] == "bg_task_request_to_delete_user"
+        assert data["status"] == "queued"
+        assert data["attempts"] == 0
+        assert data["user_id"] == str(user.id)
+
+    async def test_read_job_as_employee_user_own_job(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        employee_user: ClientAuthorizedUser,
+    ) -> None:
+        user = await get_user_by_auth_id(db_session, employee_user.auth_id)
+        job, _ = await enqueue_job(
+            bg_task_request_to_delete_user,
+            payload={"user_id": str(user.id)},
+            user_id=user.id,
+        )
+        response: Response = await client.get(
+            f"jobs/{job.id}",
+            headers=employee_user.token_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["id"] == str(job.id)
+
+    async def test_read_job_as_employee_user_other_user_job(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+        employee_user: ClientAuthorizedUser,
+    ) -> None:
+        user = await get_user_by_auth_id(db_session, admin_user.auth_id)
+        job, _ = await enqueue_job(
+            bg_task_request_to_delete_user,
+            payload={"user_id": str(user.id)},
+            user_id=user.id,
+        )
+        response: Response = await client.get(
+            f"jobs/{job.id}",
+            headers=employee_user.token_headers,
+        )
+        assert response.status_code == 405
+        data: dict[str, Any] = response.json()
+        assert ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS in data["detail"]
+
+    async def test_read_job_as_admin_user_not_found(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        response: Response = await client.get(
+            f"jobs/{get_uuid_str()}",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 404
+        data: dict[str, Any] = response.json()
+        assert ERROR_MESSAGE_ENTITY_NOT_FOUND in data["detail"]
@@ -7,7 +7,9 @@ from itsdangerous import URLSafeTimedSerializer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.entities.auth.constants import ERROR_MESSAGE_UNVERIFIED_ACCESS_DENIED
+from app.entities.security.dependencies import get_secure_message_encryption
 from app.services.csrf import csrf_settings
+from app.services.encryption import SecureMessage, get_encryption_settings
 from app.services.encryption.schemas import EncryptedMessage, PlainMessage
 from app.utilities import get_uuid_str
 from tests.constants.schema import ClientAuthorizedUser
@@ -29,6 +31,13 @@ async def perform_status_test(
         assert entry["detail"] == error_msg
 
 
+def test_secure_message_dependency_shares_one_instance() -> None:
+    # the keys are derived and parsed once, not on every request
+    settings = get_encryption_settings()
+    secure_message: SecureMessage = get_secure_message_encryption(settings)
+    assert get_secure_message_encryption(settings) is secure_message
+
+
 class TestPublicSecureRoutes:
     # ENCRYPTION
     async def test_encrypt_decrypt_message_as_admin(
@@ -57,6 +66,35 @@ class TestPublicSecureRoutes:
         assert 200 <= response_2.status_code < 300
         assert decrypted_message.message == input_message.message
 
+    async def test_encrypt_decrypt_messages_as_admin(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        messages = [random_lower_string() for _ in range(5)]
+        response: Response = await client.post(
+            "/encrypt/messages",
+            headers=admin_user.token_headers,
+            json={"messages": [{"message": m} for m in messages]},
+        )
+        assert response.status_code == 200
+        encrypted: list[dict[str, Any]] = response.json()["messages"]
+        assert len(encrypted) == len(messages)
+        assert all(item["error"] is None for item in encrypted)
+        encrypted.insert(2, {"message": random_lower_string()})
+        response_2: Response = await client.post(
+            "/decrypt/messages",
+            headers=admin_user.token_headers,
+            json={"messages": [{"message": e["message"]} for e in encrypted]},
+        )
+        assert response_2.status_code == 200
+        decrypted: list[dict[str, Any]] = response_2.json()["messages"]
+        assert decrypted[2]["message"] is None
+        assert decrypted[2]["error"] == "error decrypting message"
+        del decrypted[2]
+        assert [item["message"] for item in decrypted] == messages
+
     # AUTHORIZED STATUS
     async def test_public_status_as_admin_user(
         self, admin_user: ClientAuthorizedUser, client: AsyncClient
@@ -7,6 +7,7 @@ from app.entities.api.constants import ERROR_MESSAGE_ENTITY_EXISTS
 from app.entities.core_organization.constants import (
     ERROR_MESSAGE_ORGANIZATION_NOT_FOUND,
 )
+from app.entities.tracking_link.constants import ERROR_MESSAGE_IMPORT_FORMAT_INVALID
 from app.services.permission.constants import (
     ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS,
 )
@@ -738,6 +739,59 @@ class TestCreateTrackingLinks:
         assert ERROR_MESSAGE_ORGANIZATION_NOT_FOUND == data["detail"]
 
 
+class TestImportTrackingLinks:
+    async def test_import_tracking_links_as_admin_user(
+        self, client, db_session, admin_user
+    ) -> None:
+        a_organization = await create_random_organization(db_session)
+        a_link = await create_random_tracking_link(db_session, a_organization.id)
+        a_url = await create_random_tracking_link_url()
+        response: Response = await client.post(
+            "utmlinks/import",
+            params={"organization_id": str(a_organization.id)},
+            headers={**admin_user.token_headers, "Content-Type": "text/csv"},
+            content="\n".join(["url", a_url, a_link.url, a_url, ""]),
+        )
+        data: dict[str, Any] = response.json()
+        assert response.status_code == 200
+        assert data["rows"] == 3
+        assert data["created"] == 1
+        assert data["duplicates"] == 2
+        assert data["errors"] == []
+        response = await client.get(
+            "utmlinks/",
+            params={"organization_id": str(a_organization.id)},
+            headers=admin_user.token_headers,
+        )
+        assert response.json()["total"] == 2
+
+    async def test_import_tracking_links_as_client_a_user_not_assoc_org(
+        self, client, db_session, client_a_user
+    ) -> None:
+        a_organization = await create_random_organization(db_session)
+        response: Response = await client.post(
+            "utmlinks/import",
+            params={"organization_id": str(a_organization.id)},
+            headers={**client_a_user.token_headers, "Content-Type": "text/csv"},
+            content="url\n",
+        )
+        assert response.status_code == 405
+        assert (
+            response.json()["detail"] == ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS
+        )
+
+    async def test_import_tracking_links_as_admin_user_format_invalid(
+        self, client, db_session, admin_user
+    ) -> None:
+        response: Response = await client.post(
+            "utmlinks/import",
+            headers={**admin_user.token_headers, "Content-Type": "application/xml"},
+            content="<url/>",
+        )
+        assert response.status_code == 415
+        assert response.json()["detail"] == ERROR_MESSAGE_IMPORT_FORMAT_INVALID
+
+
 class TestReadTrackingLinks:
     # AUTHORIZED CLIENTS
     async def test_delete_tracking_link_as_admin_user(
@@ -11,7 +11,10 @@ from app.entities.api.constants import (
     ERROR_MESSAGE_ENTITY_NOT_FOUND,
 )
 from app.entities.auth.constants import ERROR_MESSAGE_UNVERIFIED_ACCESS_DENIED
-from app.entities.website.constants import ERROR_MESSAGE_DOMAIN_INVALID
+from app.entities.website.constants import (
+    ERROR_MESSAGE_DOMAIN_INVALID,
+    ERROR_MESSAGE_SITEMAP_URL_INVALID,
+)
 from app.services.permission.constants import (
     ERROR_MESSAGE_INSUFFICIENT_PERMISSIONS_ACCESS,
 )
@@ -711,3 +714,137 @@ class TestDeleteWebsite:
         data: dict[str, Any] = response.json()
         assert response.status_code == 404
         assert ERROR_MESSAGE_ENTITY_NOT_FOUND in data["detail"]
+
+    # PAGE SPEED INSIGHTS BATCH
+    async def test_process_website_page_speed_insights_as_admin_user(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        website = await create_random_website(db_session)
+        response: Response = await client.post(
+            f"websites/{website.id}/process-psi",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["website_id"] == str(website.id)
+        assert data["devices"] == ["mobile", "desktop"]
+        assert data["status"] == "queued"
+        job_id = data["job_id"]
+        # the queued batch is not queued again
+        response = await client.post(
+            f"websites/{website.id}/process-psi",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["job_id"] == job_id
+        response = await client.get(
+            f"websites/{website.id}/process-psi",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["job_id"] == job_id
+        assert data["status"] == "queued"
+        assert data["pages"] == 0
+        response = await client.get(
+            f"jobs/{job_id}",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "bg_task_website_pagespeedinsights_batch"
+        assert data["status"] == "queued"
+        assert data["idempotency_key"] == f"website-psi:{website.id}"
+
+    async def test_read_website_page_speed_insights_progress_not_found(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        website = await create_random_website(db_session)
+        response: Response = await client.get(
+            f"websites/{website.id}/process-psi",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 404
+        data: dict[str, Any] = response.json()
+        assert ERROR_MESSAGE_ENTITY_NOT_FOUND in data["detail"]
+
+    # SITEMAP SYNC
+    async def test_sync_website_sitemap_as_admin_user(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        website = await create_random_website(db_session, is_secure=True)
+        response: Response = await client.post(
+            f"websites/{website.id}/sync-sitemap",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["website_id"] == str(website.id)
+        assert data["sitemap_url"] == f"https://{website.domain}/sitemap.xml"
+        assert data["status"] == "queued"
+        job_id = data["job_id"]
+        # the queued sync is not queued again
+        response = await client.post(
+            f"websites/{website.id}/sync-sitemap",
+            headers=admin_user.token_headers,
+            json={"sitemap_url": f"https://www.{website.domain}/sitemap-index.xml"},
+        )
+        assert response.status_code == 200
+        assert response.json()["job_id"] == job_id
+        response = await client.get(
+            f"websites/{website.id}/sync-sitemap",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["job_id"] == job_id
+        assert data["status"] == "queued"
+        assert data["added"] == 0
+        response = await client.get(
+            f"jobs/{job_id}",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "bg_task_website_sitemap_sync"
+        assert data["idempotency_key"] == f"website-sitemap:{website.id}"
+
+    async def test_sync_website_sitemap_of_another_domain(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        website = await create_random_website(db_session)
+        response: Response = await client.post(
+            f"websites/{website.id}/sync-sitemap",
+            headers=admin_user.token_headers,
+            json={"sitemap_url": "https://example.com/sitemap.xml"},
+        )
+        assert response.status_code == 422
+        data: dict[str, Any] = response.json()
+        assert data["detail"] == ERROR_MESSAGE_SITEMAP_URL_INVALID
+
+    async def test_read_website_sitemap_sync_progress_not_found(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        admin_user: ClientAuthorizedUser,
+    ) -> None:
+        website = await create_random_website(db_session)
+        response: Response = await client.get(
+            f"websites/{website.id}/sync-sitemap",
+            headers=admin_user.token_headers,
+        )
+        assert response.status_code == 404
+        data: dict[str, Any] = response.json()
+        assert ERROR_MESSAGE_ENTITY_NOT_FOUND in data["detail"]
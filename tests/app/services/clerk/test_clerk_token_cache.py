@@ -0,0 +1,48 @@
+from os import environ
+
+import jwt
+import pytest
+
+from app.services.clerk import ClerkAuth, ClerkVerifiedToken, clerk_settings
+
+
+def get_clerk_auth() -> ClerkAuth:
+    return ClerkAuth(
+        secret_key=clerk_settings.secret_key,
+        issuer=clerk_settings.issuer,
+        pem_public_key=clerk_settings.pem_public_key,
+        token_cache_maxsize=10,
+    )
+
+
+def get_test_token() -> str:
+    token = environ.get("CLERK_FIRST_ADMIN_TEST_TOKEN", None)
+    if token is None:
+        raise ValueError("admin test token is not set")
+    return token
+
+
+def test_clerk_decode_token_caches_verified_token_until_exp() -> None:
+    clerk_auth = get_clerk_auth()
+    token = get_test_token()
+    verified: ClerkVerifiedToken = clerk_auth.decode_token(token)
+    assert verified.exp is not None
+    assert verified.user.auth_id == verified.sub
+    assert clerk_auth.decode_token(token) is verified
+    stats = clerk_auth.token_cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+    clerk_auth.token_cache.expire(verified.exp - 1)
+    assert clerk_auth.token_cache.currsize == 1
+    clerk_auth.token_cache.expire(verified.exp + 1)
+    assert clerk_auth.token_cache.currsize == 0
+    assert clerk_auth.token_cache.stats().evictions == 1
+
+
+def test_clerk_decode_token_rejects_invalid_token() -> None:
+    clerk_auth = get_clerk_auth()
+    token = get_test_token()
+    with pytest.raises(jwt.InvalidTokenError):
+        clerk_auth.decode_token(token[:-4] + "AAAA")
+    assert clerk_auth.token_cache.stats().size == 0
@@ -0,0 +1,55 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.services.clerk import ClerkAuth, clerk_settings
+
+pytestmark = pytest.mark.anyio
+
+
+def get_clerk_auth() -> ClerkAuth:
+    return ClerkAuth(
+        secret_key=clerk_settings.secret_key,
+        issuer=clerk_settings.issuer,
+        pem_public_key=clerk_settings.pem_public_key,
+        user_cache_ttl=60,
+        user_cache_maxsize=10,
+    )
+
+
+async def test_clerk_verify_user_exists_caches_verified_users() -> None:
+    clerk_auth = get_clerk_auth()
+    calls: list[str] = []
+
+    async def fetch_user_exists(user_id: str) -> bool:
+        calls.append(user_id)
+        await asyncio.sleep(0.01)
+        return True
+
+    with patch.object(clerk_auth, "fetch_user_exists", fetch_user_exists):
+        results = await asyncio.gather(
+            *[clerk_auth.verify_user_exists("user_a") for _ in range(5)]
+        )
+        assert all(results)
+        assert calls == ["user_a"]
+        assert await clerk_auth.verify_user_exists("user_a")
+        assert calls == ["user_a"]
+    stats = clerk_auth.user_cache.stats()
+    assert stats.hits == 1
+    assert stats.size == 1
+
+
+async def test_clerk_verify_user_exists_does_not_cache_missing_users() -> None:
+    clerk_auth = get_clerk_auth()
+    calls: list[str] = []
+
+    async def fetch_user_exists(user_id: str) -> bool:
+        calls.append(user_id)
+        return False
+
+    with patch.object(clerk_auth, "fetch_user_exists", fetch_user_exists):
+        assert not await clerk_auth.verify_user_exists("user_b")
+        assert not await clerk_auth.verify_user_exists("user_b")
+    assert calls == ["user_b", "user_b"]
+    assert clerk_auth.user_cache.stats().size == 0
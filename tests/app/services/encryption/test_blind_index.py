@@ -0,0 +1,30 @@
+import hashlib
+import hmac
+
+from app.services.encryption import blind_index, encryption_settings
+
+
+def test_blind_index_is_deterministic_fixed_width() -> None:
+    digest = blind_index("user_abc123")
+    assert digest == blind_index("user_abc123")
+    assert len(digest) == 64
+    assert digest != blind_index("user_abc124")
+
+
+def test_blind_index_depends_on_key() -> None:
+    assert blind_index("user_abc123", key="key-one") != blind_index(
+        "user_abc123", key="key-two"
+    )
+
+
+def test_blind_index_does_not_reuse_the_encryption_key() -> None:
+    reused = hmac.new(
+        encryption_settings.encryption_key.encode("utf-8"),
+        b"user_abc123",
+        hashlib.sha256,
+    ).hexdigest()
+    assert blind_index("user_abc123") != reused
+    assert (
+        blind_index("user_abc123", key="key-one")
+        != hmac.new(b"key-one", b"user_abc123", hashlib.sha256).hexdigest()
+    )
@@ -0,0 +1,61 @@
+import pytest
+from pydantic import ValidationError
+
+from app.services.encryption import (
+    MessageBatchItem,
+    PlainMessageBatch,
+    SecureMessage,
+    decrypt_and_verify_many,
+    encryption_settings,
+    get_cipher_executor,
+    shutdown_cipher_executor,
+    sign_and_encrypt_many,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sign_and_encrypt_many_keeps_order() -> None:
+    sm = SecureMessage(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    values = [f"message {i}" for i in range(12)]
+    encrypted: list[MessageBatchItem] = await sign_and_encrypt_many(sm, values)
+    assert all(item.error is None for item in encrypted)
+    decrypted: list[MessageBatchItem] = await decrypt_and_verify_many(
+        sm, [str(item.message) for item in encrypted]
+    )
+    assert [item.message for item in decrypted] == values
+
+
+async def test_decrypt_and_verify_many_reports_item_errors() -> None:
+    sm = SecureMessage(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    encrypted = await sign_and_encrypt_many(sm, ["first", "second"])
+    decrypted = await decrypt_and_verify_many(
+        sm,
+        [str(encrypted[0].message), "bm90IGVuY3J5cHRlZA==", str(encrypted[1].message)],
+    )
+    assert decrypted[0] == MessageBatchItem(message="first")
+    assert decrypted[1].message is None
+    assert decrypted[1].error == "error decrypting message"
+    assert decrypted[2] == MessageBatchItem(message="second")
+
+
+async def test_cipher_executor_is_bounded_and_restarts() -> None:
+    executor = get_cipher_executor()
+    assert executor is get_cipher_executor()
+    assert executor._max_workers == encryption_settings.encryption_batch_workers
+    shutdown_cipher_executor()
+    assert get_cipher_executor() is not executor
+
+
+def test_message_batch_size_is_limited() -> None:
+    with pytest.raises(ValidationError):
+        PlainMessageBatch(messages=[])
+    max_items = encryption_settings.encryption_batch_max_items
+    with pytest.raises(ValidationError):
+        PlainMessageBatch(messages=[{"message": "a"}] * (max_items + 1))
+    batch = PlainMessageBatch(messages=[{"message": "a"}] * max_items)
+    assert len(batch.messages) == max_items
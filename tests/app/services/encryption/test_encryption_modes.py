@@ -0,0 +1,65 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+import pytest
+
+from app.services.encryption import (
+    CipherMode,
+    DecryptionError,
+    SecureMessage,
+    encryption_settings,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def get_secure_message(mode: CipherMode = CipherMode.rsa_signed) -> SecureMessage:
+    return SecureMessage(
+        encryption_settings.encryption_key,
+        encryption_settings.encryption_salt,
+        mode=mode,
+    )
+
+
+@pytest.mark.parametrize("mode", list(CipherMode))
+def test_cipher_modes_round_trip(mode: CipherMode) -> None:
+    sm = get_secure_message(mode)
+    for value, data_type in (("Hello, world!", str), (12345, int), (True, bool)):
+        encrypted = sm.sign_and_encrypt(value)
+        assert sm.decrypt_and_verify(encrypted, data_type) == value
+
+
+def test_decrypt_detects_the_envelope_version() -> None:
+    sm = get_secure_message()
+    message = "Hello, world!"
+    gcm = sm.sign_and_encrypt(message, mode=CipherMode.aes_gcm)
+    mac = sm.sign_and_encrypt(message, mode=CipherMode.aes_hmac)
+    signed = sm.sign_and_encrypt(message)
+    assert urlsafe_b64decode(gcm)[:1] == b"\x01"
+    assert urlsafe_b64decode(mac)[:1] == b"\x02"
+    for encrypted in (gcm, mac, signed):
+        assert sm.decrypt_and_verify(encrypted, str) == message
+
+
+@pytest.mark.parametrize("mode", [CipherMode.aes_gcm, CipherMode.aes_hmac])
+def test_tampered_envelope_does_not_decrypt(mode: CipherMode) -> None:
+    sm = get_secure_message(mode)
+    envelope = bytearray(urlsafe_b64decode(sm.sign_and_encrypt("Hello, world!")))
+    envelope[20] ^= 1
+    with pytest.raises(DecryptionError):
+        sm.decrypt_and_verify(urlsafe_b64encode(envelope).decode("utf-8"), str)
+
+
+@pytest.mark.parametrize("mode", [CipherMode.aes_gcm, CipherMode.aes_hmac])
+def test_envelope_decrypts_after_key_rotation(mode: CipherMode) -> None:
+    sm = get_secure_message(mode)
+    encrypted = sm.sign_and_encrypt("Hello, world!")
+    assert sm.rotate_key("rotated_key", "rotated_salt")
+    assert sm.decrypt_and_verify(encrypted, str) == "Hello, world!"
+
+
+def test_symmetric_envelopes_are_smaller_than_signed() -> None:
+    sm = get_secure_message()
+    message = "a" * 64
+    signed = sm.sign_and_encrypt(message)
+    for mode in (CipherMode.aes_gcm, CipherMode.aes_hmac):
+        assert len(sm.sign_and_encrypt(message, mode=mode)) < len(signed)
@@ -9,7 +9,10 @@ from app.services.encryption import (
     EncryptionError,
     SecureMessage,
     SignatureVerificationError,
+    derive_aes_key,
     encryption_settings,
+    get_secure_message,
+    load_api_keys,
 )
 from tests.utils.utils import random_boolean
 
@@ -114,3 +117,53 @@ async def test_sign_and_encryp_decryption_error() -> None:
     assert urlsafe_b64decode(encrypted.encode("utf-8")) != message.encode("utf-8")
     with pytest.raises(DecryptionError):
         sm_bad.decrypt_and_verify(encrypted, str)
+
+
+async def test_secure_message_caches_derived_and_parsed_keys() -> None:
+    sm = SecureMessage(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    sm_2 = SecureMessage(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    assert sm.aes_key is sm_2.aes_key
+    assert sm.public_key is sm_2.public_key
+    assert sm.private_key is sm_2.private_key
+    assert derive_aes_key("other_key", "other_salt") != sm.aes_key
+    assert load_api_keys() == (sm.public_key, sm.private_key)
+
+
+async def test_get_secure_message_shares_one_instance() -> None:
+    sm = get_secure_message(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    assert sm is get_secure_message(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    assert sm.aes_key == derive_aes_key(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+
+
+async def test_secure_message_rotate_key() -> None:
+    sm = SecureMessage(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    message = "Hello, world!"
+    encrypted = sm.sign_and_encrypt(message)
+    assert not sm.rotate_key(
+        encryption_settings.encryption_key, encryption_settings.encryption_salt
+    )
+    assert sm.rotate_key("rotated_key", "rotated_salt")
+    assert sm.aes_key == derive_aes_key("rotated_key", "rotated_salt")
+    assert len(sm.aes_keys) == 2
+    # messages encrypted with the previous key still decrypt
+    assert sm.decrypt_and_verify(encrypted, str) == message
+    rotated = sm.sign_and_encrypt(message)
+    assert sm.decrypt_and_verify(rotated, str) == message
+    # only max_previous_keys earlier keys are kept
+    assert sm.rotate_key("rotated_key_2", "rotated_salt")
+    assert len(sm.aes_keys) == 2
+    with pytest.raises((DecryptionError, SignatureVerificationError)):
+        sm.decrypt_and_verify(encrypted, str)
+    assert sm.decrypt_and_verify(rotated, str) == message
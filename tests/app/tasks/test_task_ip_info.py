@@ -1,3 +1,4 @@
+import asyncio
 import unittest.mock
 
 import pytest
@@ -5,11 +6,14 @@ from ipinfo.details import Details  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.entities.core_ipaddress.crud import IpaddressRepository
+from app.entities.core_ipaddress.crud_utilities import ipaddress_details_lookup
 from app.entities.core_ipaddress.model import Ipaddress
 from app.entities.core_user_ipaddress.crud import UserIpaddressRepository
 from app.entities.core_user_ipaddress.model import UserIpaddress
 from app.tasks.background import bg_task_track_user_ipinfo
-from tests.utils.users import create_core_user
+from app.tasks.queue import JobContext, current_job
+from app.utilities import get_uuid
+from tests.utils.users import create_core_user, create_random_user
 from tests.utils.utils import random_ipaddress
 
 pytestmark = pytest.mark.anyio
@@ -42,8 +46,10 @@ async def test_worker_task_fetch_ipinfo(
 ) -> None:
     user_a = await create_core_user(db_session, "admin")
     ip_address = "8.8.8.8"
+    ipaddress_details_lookup.clear()
     with unittest.mock.patch(
-        "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails"
+        "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails",
+        new_callable=unittest.mock.AsyncMock,
     ) as mock_ipinfo_details:
         mock_details = Details(
             details=dict(
@@ -77,7 +83,8 @@ async def test_worker_task_fetch_ipinfo_random_ipaddress(
     user_a = await create_core_user(db_session, "admin")
     ip_address = random_ipaddress()
     with unittest.mock.patch(
-        "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails"
+        "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails",
+        new_callable=unittest.mock.AsyncMock,
     ) as mock_ipinfo_details:
         mock_details = Details(
             details=dict(
@@ -103,3 +110,77 @@ async def test_worker_task_fetch_ipinfo_random_ipaddress(
             }
         )
         assert user_ip_in_db is not None
+
+
+async def test_worker_task_fetch_ipinfo_burst_single_lookup(
+    db_session: AsyncSession,
+) -> None:
+    users = [await create_random_user(db_session) for _ in range(3)]
+    ip_address = random_ipaddress()
+    with unittest.mock.patch(
+        "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails",
+        new_callable=unittest.mock.AsyncMock,
+    ) as mock_ipinfo_details:
+        mock_ipinfo_details.return_value = Details(
+            details=dict(ip=ip_address, **mock_details_dict)
+        )
+        await asyncio.gather(
+            *(
+                bg_task_track_user_ipinfo(ip_address, str(user.id))
+                for user in users * 10
+            )
+        )
+        # a later login is answered from the cache
+        await bg_task_track_user_ipinfo(ip_address, str(users[0].id))
+    mock_ipinfo_details.assert_awaited_once_with(ip_address)
+    ip_repo = IpaddressRepository(db_session)
+    ip_in_db: Ipaddress | None = await ip_repo.read_by(
+        field_name="address", field_value=ip_address
+    )
+    assert ip_in_db is not None
+    assert ip_in_db.city == mock_details_dict["city"]
+    user_ip_repo = UserIpaddressRepository(db_session)
+    for user in users:
+        user_ips = (
+            await db_session.execute(
+                user_ip_repo.query_list().where(
+                    UserIpaddress.user_id == user.id,
+                    UserIpaddress.ipaddress_id == ip_in_db.id,
+                )
+            )
+        ).all()
+        assert len(user_ips) == 1
+
+
+async def test_worker_task_fetch_ipinfo_failed_retry(
+    db_session: AsyncSession,
+) -> None:
+    user_a = await create_core_user(db_session, "admin")
+    ip_address = random_ipaddress()
+    with unittest.mock.patch(
+        "app.entities.core_ipaddress.utilities.ipinfo_handler.getDetails",
+        new_callable=unittest.mock.AsyncMock,
+    ) as mock_ipinfo_details:
+        mock_ipinfo_details.side_effect = TimeoutError("ipinfo.io timed out")
+        with pytest.raises(TimeoutError):
+            await bg_task_track_user_ipinfo(ip_address, str(user_a.id))
+        # the failed lookup is remembered
+        with pytest.raises(LookupError):
+            await bg_task_track_user_ipinfo(ip_address, str(user_a.id))
+        assert mock_ipinfo_details.await_count == 1
+        # a retry of the job looks the address up again
+        mock_ipinfo_details.side_effect = None
+        mock_ipinfo_details.return_value = Details(
+            details=dict(ip=ip_address, **mock_details_dict)
+        )
+        token = current_job.set(JobContext(job_id=get_uuid(), attempt=2))
+        try:
+            await bg_task_track_user_ipinfo(ip_address, str(user_a.id))
+        finally:
+            current_job.reset(token)
+        assert mock_ipinfo_details.await_count == 2
+    ip_repo = IpaddressRepository(db_session)
+    ip_in_db: Ipaddress | None = await ip_repo.read_by(
+        field_name="address", field_value=ip_address
+    )
+    assert ip_in_db is not None
@@ -0,0 +1,201 @@
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db_session
+from app.entities.core_job.crud import JobRepository
+from app.entities.core_job.model import Job
+from app.entities.core_job.schemas import JobStatus
+from app.tasks.queue import current_job, enqueue_job, job_handler, report_job_progress
+from app.tasks.worker import JobWorker
+from app.utilities.uuids import get_uuid_str
+
+pytestmark = pytest.mark.anyio
+
+calls: list[dict[str, Any]] = []
+
+
+@job_handler
+async def job_test_record(value: int, fail_times: int = 0) -> dict:
+    context = current_job.get()
+    assert context is not None
+    calls.append({"value": value, "attempt": context.attempt})
+    if context.attempt <= fail_times:
+        raise RuntimeError(f"attempt {context.attempt} failed")
+    return {"value": value * 2}
+
+
+@job_handler
+async def job_test_progress(steps: int) -> None:
+    progress: dict[str, int] = {"done": 0}
+    report_job_progress(lambda: dict(progress))
+    for _ in range(steps):
+        await asyncio.sleep(0.05)
+        progress["done"] += 1
+
+
+async def read_job(job: Job) -> Job:
+    async with get_db_session() as session:
+        job_in_db: Job | None = await JobRepository(session).read(job.id)
+    assert job_in_db is not None
+    return job_in_db
+
+
+async def test_enqueue_job_deduplicates_active_jobs(db_session: AsyncSession) -> None:
+    key = get_uuid_str()
+    job, is_new = await enqueue_job(job_test_record, {"value": 1}, key)
+    assert is_new
+    assert job.status == JobStatus.queued
+    assert job.active_key == key
+    same_job, is_new = await enqueue_job(job_test_record, {"value": 2}, key)
+    assert not is_new
+    assert same_job.id == job.id
+    assert same_job.payload == {"value": 1}
+    # a job without a key is always queued
+    other_job, is_new = await enqueue_job(job_test_record, {"value": 3})
+    assert is_new
+    assert other_job.active_key is None
+    await JobWorker(concurrency=2, retry_backoff=0).drain()
+
+
+async def test_enqueue_job_commits_with_the_session(db_session: AsyncSession) -> None:
+    key = get_uuid_str()
+    with pytest.raises(RuntimeError):
+        async with get_db_session(unit_of_work=True) as session:
+            await enqueue_job(job_test_record, {"value": 1}, key, session=session)
+            raise RuntimeError("the request failed")
+    # the job is rolled back with the request
+    async with get_db_session() as session:
+        assert await JobRepository(session).read_active(key) is None
+    async with get_db_session(unit_of_work=True) as session:
+        job, is_new = await enqueue_job(
+            job_test_record, {"value": 2}, key, session=session
+        )
+        assert is_new
+        # not visible to workers before the request commits
+        async with get_db_session() as other_session:
+            assert await JobRepository(other_session).read_active(key) is None
+    job = await read_job(job)
+    assert job.payload == {"value": 2}
+    await JobWorker(concurrency=2, retry_backoff=0).drain()
+
+
+async def test_enqueue_job_conflict_keeps_session_writes(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    key = get_uuid_str()
+    job, _ = await enqueue_job(job_test_record, {"value": 1}, key)
+    read_active = JobRepository.read_active
+    reads: list[str] = []
+
+    async def miss_first_read(self: JobRepository, idempotency_key: str) -> Any:
+        # the job of the key is queued by another request after this check
+        reads.append(idempotency_key)
+        if len(reads) == 1:
+            return None
+        return await read_active(self, idempotency_key)
+
+    monkeypatch.setattr(JobRepository, "read_active", miss_first_read)
+    async with get_db_session(unit_of_work=True) as session:
+        other_job, _ = await enqueue_job(job_test_record, {"value": 2}, session=session)
+        same_job, is_new = await enqueue_job(
+            job_test_record, {"value": 3}, key, session=session
+        )
+        assert not is_new
+        assert same_job.id == job.id
+    # the job queued before the conflict is still committed
+    assert (await read_job(other_job)).payload == {"value": 2}
+    monkeypatch.undo()
+    await JobWorker(concurrency=2, retry_backoff=0).drain()
+
+
+async def test_worker_runs_jobs_and_releases_key(db_session: AsyncSession) -> None:
+    key = get_uuid_str()
+    calls.clear()
+    job, _ = await enqueue_job(job_test_record, {"value": 21}, key)
+    assert await JobWorker(concurrency=2).drain() == 1
+    assert calls == [{"value": 21, "attempt": 1}]
+    job = await read_job(job)
+    assert job.status == JobStatus.succeeded
+    assert job.result == {"value": 42}
+    assert job.attempts == 1
+    assert job.active_key is None
+    assert job.idempotency_key == key
+    assert job.finished_at is not None
+    # the key is free to queue the work again
+    next_job, is_new = await enqueue_job(job_test_record, {"value": 1}, key)
+    assert is_new
+    assert next_job.id != job.id
+    async with get_db_session() as session:
+        latest: Job | None = await JobRepository(session).read_latest(key)
+    assert latest is not None and latest.id == next_job.id
+    await JobWorker().drain()
+
+
+async def test_worker_retries_failed_jobs(db_session: AsyncSession) -> None:
+    calls.clear()
+    retried, _ = await enqueue_job(job_test_record, {"value": 1, "fail_times": 1})
+    failed, _ = await enqueue_job(
+        job_test_record, {"value": 2, "fail_times": 5}, max_attempts=2
+    )
+    assert await JobWorker(retry_backoff=0).drain() == 4
+    retried = await read_job(retried)
+    assert retried.status == JobStatus.succeeded
+    assert retried.attempts == 2
+    assert retried.last_error == "RuntimeError: attempt 1 failed"
+    failed = await read_job(failed)
+    assert failed.status == JobStatus.failed
+    assert failed.attempts == 2
+    assert failed.last_error == "RuntimeError: attempt 2 failed"
+    assert failed.result is None
+
+
+async def test_worker_backs_off_failed_jobs(db_session: AsyncSession) -> None:
+    job, _ = await enqueue_job(job_test_record, {"value": 1, "fail_times": 1})
+    assert await JobWorker(retry_backoff=60).drain() == 1
+    job = await read_job(job)
+    assert job.status == JobStatus.queued
+    assert job.locked_by is None
+    # the retry is not due yet
+    assert await JobWorker(retry_backoff=60).drain() == 0
+
+
+async def test_worker_reclaims_expired_leases(db_session: AsyncSession) -> None:
+    job, _ = await enqueue_job(job_test_record, {"value": 5})
+    lost_worker = JobWorker(lease_seconds=0.05, worker_id="lost-worker")
+    claimed: list[Job] = await lost_worker.claim(1)
+    assert [j.id for j in claimed] == [job.id]
+    # the lease is held until it expires
+    assert await JobWorker().claim(1) == []
+    await asyncio.sleep(0.1)
+    assert await JobWorker(worker_id="next-worker").drain() == 1
+    job = await read_job(job)
+    assert job.status == JobStatus.succeeded
+    assert job.attempts == 2
+    # the worker that lost the lease can no longer change the job
+    async with get_db_session() as session:
+        assert not await JobRepository(session).complete(job.id, "lost-worker")
+
+
+async def test_worker_heartbeat_reports_progress(db_session: AsyncSession) -> None:
+    job, _ = await enqueue_job(job_test_progress, {"steps": 6})
+    worker = JobWorker(lease_seconds=0.15, poll_interval=0.05)
+    run: asyncio.Task = asyncio.create_task(worker.run())
+    try:
+        seen: list[Any] = []
+        for _ in range(20):
+            await asyncio.sleep(0.05)
+            job = await read_job(job)
+            seen.append(job.result)
+            if job.status == JobStatus.succeeded:
+                break
+    finally:
+        worker.stop()
+        await run
+    assert job.status == JobStatus.succeeded
+    assert job.result == {"done": 6}
+    # the lease was renewed past its first expiry
+    assert job.attempts == 1
+    assert any(r is not None and 0 < r["done"] < 6 for r in seen)
@@ -1,30 +1,59 @@
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.entities.website_pagespeedinsight.crud import (
+    WebsitePageSpeedInsightsRepository,
+)
 from app.entities.website_pagespeedinsight.schemas import (
     PageSpeedInsightsDevice,
     PSIDevice,
 )
 from app.tasks.background import bg_task_website_page_pagespeedinsights_fetch
-from app.utilities.uuids import get_uuid
+from tests.utils.website_pages import create_random_website_page
 from tests.utils.website_pagespeedinsights import generate_psi_base
+from tests.utils.websites import create_random_website
 
 
 @pytest.mark.anyio
-async def test_worker_task_website_page_pagespeedinsights_fetch() -> None:
-    website_id = get_uuid()
-    page_id = get_uuid()
+async def test_worker_task_website_page_pagespeedinsights_fetch(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    website_page = await create_random_website_page(db_session, website.id)
     psi_url = "https://getcommunity.com/"
     mock_psi_insights_base = generate_psi_base()
-    mock_fetch = Mock(return_value=mock_psi_insights_base)
+    mock_fetch = AsyncMock(return_value=mock_psi_insights_base)
     with patch("app.tasks.background.fetch_pagespeedinsights", new=mock_fetch):
         await bg_task_website_page_pagespeedinsights_fetch(
-            website_id=str(website_id),
-            page_id=str(page_id),
+            website_id=str(website.id),
+            page_id=str(website_page.id),
             fetch_url=str(psi_url),
             device=PSIDevice.desktop,
         )
-    mock_fetch.assert_called_once_with(
+    mock_fetch.assert_awaited_once_with(
         fetch_url=psi_url, device=PageSpeedInsightsDevice(device=PSIDevice.desktop)
     )
+    psi_repo = WebsitePageSpeedInsightsRepository(db_session)
+    psi_in_db = await psi_repo.read_by(
+        field_name="page_id", field_value=website_page.id
+    )
+    assert psi_in_db is not None
+
+
+@pytest.mark.anyio
+async def test_worker_task_website_page_pagespeedinsights_fetch_failed(
+    db_session: AsyncSession,
+) -> None:
+    website = await create_random_website(db_session)
+    website_page = await create_random_website_page(db_session, website.id)
+    mock_fetch = AsyncMock(return_value=None)
+    with patch("app.tasks.background.fetch_pagespeedinsights", new=mock_fetch):
+        with pytest.raises(LookupError):
+            await bg_task_website_page_pagespeedinsights_fetch(
+                website_id=str(website.id),
+                page_id=str(website_page.id),
+                fetch_url="https://getcommunity.com/",
+                device=PSIDevice.mobile,
+            )
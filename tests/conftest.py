@@ -8,11 +8,17 @@ from asgi_lifespan import LifespanManager
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 from lxml import etree
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.config import settings
 from app.db.base import Base
-from app.db.session import async_session, engine
+from app.db.session import RoutingSession, engine
+from app.entities.core_user.crud import access_graph_cache, user_cache
 from app.main import create_app
 from app.services.clerk.settings import clerk_settings
 from tests.constants.schema import ClientAuthorizedUser
@@ -31,14 +37,25 @@ def anyio_backend() -> str:
 #     Base.metadata.drop_all(bind=engine)
 
 
+# the module scoped test session keeps the driver transactions of pysqlite, its
+# reads run outside of a transaction and see the writes of the sessions under test
+test_engine: AsyncEngine = create_async_engine(url=settings.db.uri_async)
+test_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    test_engine, sync_session_class=RoutingSession, expire_on_commit=False
+)
+
+
 @pytest.fixture(scope="module")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     Base.metadata.create_all(bind=engine)
+    # cached users and memberships reference rows of the previous test module
+    user_cache.clear()
+    access_graph_cache.clear()
 
     # await create_init_data()
 
     session: AsyncSession
-    async with async_session() as session:
+    async with test_session() as session:
         yield session
         await session.flush()
         await session.rollback()
@@ -1,8 +1,12 @@
+import asyncio
 import json
+from typing import Any
 
+from aiohttp import web
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagespeed import PageSpeedInsightsClient
 from app.entities.website_pagespeedinsight.crud import (
     WebsitePageSpeedInsightsRepository,
 )
@@ -88,3 +92,61 @@ async def create_random_website_page_speed_insights(
         )
     )
     return WebsitePageSpeedInsightsRead.model_validate(web_page_psi)
+
+
+class PageSpeedInsightsStub:
+    """A local PageSpeed Insights api serving a recorded report.
+
+    The first `fail_times` requests answer with `fail_status`, every response
+    waits `delay` seconds and the most concurrent requests are counted.
+    """
+
+    def __init__(self, report: dict[str, Any]) -> None:
+        self.report: dict[str, Any] = report
+        self.fail_times: int = 0
+        self.fail_status: int = 429
+        self.delay: float = 0.0
+        self.requests: list[dict[str, str]] = []
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.url: str = ""
+        self._runner: web.AppRunner | None = None
+
+    async def handle_run_pagespeed(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                return web.Response(status=self.fail_status)
+            return web.json_response(self.report)
+        finally:
+            self.in_flight -= 1
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/runPagespeed", self.handle_run_pagespeed)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}/runPagespeed"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> "PageSpeedInsightsStub":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def client(self, **kwargs: Any) -> PageSpeedInsightsClient:
+        options: dict[str, Any] = {"api_key": "test-key", "backoff": 0.01}
+        options.update(kwargs)
+        return PageSpeedInsightsClient(api_url=self.url, **options)
@@ -0,0 +1,87 @@
+from hashlib import md5
+from os import path
+from typing import Any
+
+from aiohttp import web
+
+from app.core.sitemap import SitemapClient
+
+SITEMAP_FIXTURES_DIR: str = path.join(
+    path.dirname(path.dirname(path.abspath(__file__))), "data"
+)
+SITEMAP_FIXTURES_HOST: str = "https://getcommunity.com"
+
+
+class SitemapStub:
+    """A local web server serving the sitemap fixtures of `tests/data`.
+
+    `routes` maps a path to the name of a fixture, the urls of the fixtures on
+    getcommunity.com are rewritten to the url of the stub and the content served
+    is kept in `content`, where tests may change it. Responses carry an ETag and
+    answer 304 to a request with the same ETag in If-None-Match. Every path
+    requested is recorded in `requests` with its status in `statuses`, paths
+    without content answer 404, the paths of `redirects` answer 301 to their
+    location.
+    """
+
+    def __init__(self, routes: dict[str, str]) -> None:
+        self.routes: dict[str, str] = dict(routes)
+        self.content: dict[str, bytes] = {}
+        self.redirects: dict[str, str] = {}
+        self.requests: list[str] = []
+        self.statuses: list[int] = []
+        self.url: str = ""
+        self._runner: web.AppRunner | None = None
+
+    def read_fixture(self, name: str) -> bytes:
+        with open(path.join(SITEMAP_FIXTURES_DIR, name)) as f:
+            content: str = f.read()
+        return content.replace(SITEMAP_FIXTURES_HOST, self.url).encode()
+
+    async def handle_sitemap(self, request: web.Request) -> web.Response:
+        self.requests.append(request.path)
+        location: str | None = self.redirects.get(request.path)
+        if location is not None:
+            self.statuses.append(301)
+            return web.Response(status=301, headers={"Location": location})
+        content: bytes | None = self.content.get(request.path)
+        if content is None:
+            self.statuses.append(404)
+            return web.Response(status=404)
+        etag: str = '"%s"' % md5(content).hexdigest()
+        if request.headers.get("If-None-Match") == etag:
+            self.statuses.append(304)
+            return web.Response(status=304, headers={"ETag": etag})
+        self.statuses.append(200)
+        return web.Response(
+            body=content, content_type="application/xml", headers={"ETag": etag}
+        )
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/{name:.*}", self.handle_sitemap)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        self.content = {
+            route: self.read_fixture(name) for route, name in self.routes.items()
+        }
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> "SitemapStub":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def client(self, **kwargs: Any) -> SitemapClient:
+        options: dict[str, Any] = {"timeout": 5.0}
+        options.update(kwargs)
+        return SitemapClient(**options)